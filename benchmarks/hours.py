@@ -0,0 +1,104 @@
+"""
+Timesheet hours with `bot.hours` on stand-in timetrack pages,
+compared to evaluating the `timer` formula and summing the totals one page at a time.
+
+    python -m benchmarks.hours --rows 100000
+"""
+import math
+import time
+import argparse
+from typing import Any
+from typing import Callable
+from typing import Optional
+from datetime import date
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from datetime import tzinfo
+
+import numpy as np
+from tzlocal import get_localzone
+
+from benchmarks.standin import timetrack_pages
+from bot.hours import *
+
+# after the last stand-in entry, so running timers have the same hours on every run.
+NOW = datetime(2031, 1, 1, tzinfo=timezone.utc)
+
+
+def best_of(function: Callable[[], Any], repeat: int) -> tuple[float, Any]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def loop_totals(
+    pages: list[dict[str, Any]], by: Optional[str], tz: tzinfo
+) -> dict[Any, float]:
+    result: dict[Any, float] = {}
+    for page in pages:
+        properties = page["properties"]
+        override_start = properties["override_start"]["date"]
+        start = datetime.fromisoformat(
+            override_start["start"] if override_start else page["created_time"]
+        )
+        day = start.astimezone(tz).date()
+        key: Optional[date] = None
+        if by == "day":
+            key = day
+        elif by == "week":
+            key = day - timedelta(days=day.weekday())
+        elif by == "month":
+            key = day.replace(day=1)
+        result[key] = result.get(key, 0) + (timer_formula(page, now=NOW) or 0)
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    pages = timetrack_pages(args.rows)
+    tz = get_localzone()
+    print(f"rows={args.rows}, tz={tz}, best of {args.repeat}")
+
+    elapsed, entries = best_of(lambda: TimerEntries.from_pages(pages), args.repeat)
+    print(f"{'read pages':>24}: {elapsed * 1000:8.1f} ms")
+
+    elapsed, hours = best_of(lambda: timer_hours(entries, now=NOW), args.repeat)
+    scalar, expected = best_of(
+        lambda: [timer_formula(page, now=NOW) for page in pages], 1
+    )
+    expected = np.array([math.nan if h is None else h for h in expected])
+    assert np.array_equal(hours, expected, equal_nan=True), "timer formula differs"
+    print(
+        f"{'timer formula':>24}: {elapsed * 1000:8.1f} ms, "
+        f"per page {scalar * 1000:8.1f} ms"
+    )
+
+    for by in ("day", "week", "month", None):
+        elapsed, result = best_of(
+            lambda: totals(entries, hours, by=by, tz=tz), args.repeat
+        )
+        scalar, expected = best_of(lambda: loop_totals(pages, by, tz), 1)
+        assert result.keys() == expected.keys() and all(
+            math.isclose(result[k], expected[k]) for k in expected
+        ), f"totals by {by} differ"
+        per_category, _ = best_of(
+            lambda: totals(entries, hours, by=by, per_category=True, tz=tz),
+            args.repeat,
+        )
+        print(
+            f"{f'totals by {by}':>24}: {len(result):5} keys, "
+            f"{elapsed * 1000:8.1f} ms, per category {per_category * 1000:8.1f} ms, "
+            f"per page {scalar * 1000:8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Time to import the bot and load its plugins, as `python -m bot` does before connecting,
+from `python -X importtime`. Fails when the import takes longer than `--budget` ms,
+or when a dependency that should only be imported on first use is imported at startup.
+
+    python -m benchmarks.importtime --budget 1200
+"""
+import os
+import re
+import sys
+import argparse
+import subprocess
+from collections import defaultdict
+
+# imported on first use, or by a warmup after the bot connects (`bot.startup`).
+DEFERRED = (
+    "google.cloud.bigquery",
+    "sqlalchemy",
+    "sqlalchemy_bigquery",
+    "dateparser",
+    "jsonpath_ng",
+)
+
+# variables `bot` reads at import, set to placeholders if they aren't set.
+# nothing is sent to Discord, Notion, or BigQuery while importing.
+ENVIRON = (
+    "NOTION_TOKEN",
+    "DISCORD_TOKEN",
+    "DEFAULT_USER",
+    "GOOGLE_APPLICATION_CREDENTIALS",
+    "BQ_CACHE_TABLE_ID",
+    "BQ_TABLE_REMINDERS",
+    "BQ_TABLE_REPEATED",
+    "BQDATASET_APSCHEDULER_REMINDERS",
+    "BQDATASET_APSCHEDULER_REPEATED",
+    "NDB_JOBSTORE_CRON_ID",
+    "NDB_JOBSTORE_REMINDERS_ID",
+    "NDB_OPTIONS_ID",
+    "NDB_ROLLUP_ID",
+    "NDB_SCHEDULE_ID",
+    "NDB_TIMETRACK_ID",
+    "LINK_ROLLUP_DB",
+    "LINK_TIMESHEET",
+    "LINK_TIMESHEET_OPTIONS",
+    "WEBHOOK_URL_HELPER_BOT",
+    "WEBHOOK_URL_REMINDERS",
+)
+
+_LINE = re.compile(r"import time:\s+\d+ \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def profile(module: str) -> list[tuple[int, int, str]]:
+    """(cumulative us, depth, name) of each module imported by importing `module`."""
+    env = os.environ | {name: os.environ.get(name, "importtime") for name in ENVIRON}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        check=True,
+    )
+    return [
+        (int(m[1]), len(m[2]) // 2, m[3])
+        for m in map(_LINE.match, result.stderr.splitlines())
+        if m
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--module", default="bot.__main__")
+    parser.add_argument("--budget", type=float, default=1200, help="ms")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    # best of `--repeat`, so a pause of the machine isn't counted as a regression.
+    runs = [profile(args.module) for _ in range(args.repeat)]
+    best = min(runs, key=lambda rows: rows[-1][0])
+    total = best[-1][0] / 1000
+
+    # each top-level package, by the time of the import that first loaded it.
+    packages: dict[str, int] = defaultdict(int)
+    for cumulative, _, name in best:
+        root = name.split(".")[0]
+        packages[root] = max(packages[root], cumulative)
+    packages.pop(args.module.split(".")[0], None)
+
+    print(f"import {args.module}: {total:.0f} ms (budget {args.budget:.0f} ms)")
+    for name, cumulative in sorted(packages.items(), key=lambda p: -p[1])[: args.top]:
+        print(f"  {cumulative / 1000:7.1f} ms  {name}")
+
+    imported = {name for _, _, name in best}
+    eager = [d for d in DEFERRED if d in imported]
+    if eager:
+        print(f"imported at startup, should be deferred: {', '.join(eager)}")
+    if total > args.budget or eager:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Finding today's entries and the active timers, through a database query
+against the stand-in database compared to `notion.query.LocalQuery` on the same pages.
+
+    python -m benchmarks.local_query --rows 10000 --latency 0.3
+"""
+import time
+import argparse
+from typing import Any
+from typing import Callable
+
+import notion
+from notion.query import *
+from benchmarks.standin import StandInDatabase
+from benchmarks.standin import timetrack_pages
+from benchmarks.standin import unlimited
+
+
+def best_of(function: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--latency", type=float, default=0.3)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    pages = timetrack_pages(args.rows)
+    database = StandInDatabase(pages, latency=args.latency)
+    database.rate_limiter = unlimited()
+    day = pages[len(pages) // 2]["created_time"][:10]
+
+    queries = {
+        f"created on {day}": (
+            TimestampFilter.created_time("equals", day),
+            SortFilter([EntryTimestampSort.created_time_descending()]),
+        ),
+        "active timers": (PropertyFilter.checkbox("stop", "equals", False),),
+    }
+
+    print(f"rows={args.rows}, latency={args.latency}s, best of {args.repeat}")
+    for label, objects in queries.items():
+        local = LocalQuery(*objects)
+        # the stand-in doesn't evaluate filters, this is the time of one request.
+        remote = best_of(
+            lambda: database.query(payload=notion.build_payload(*objects)), 1
+        )
+        elapsed = best_of(lambda: local(pages), args.repeat)
+        print(
+            f"{label:>24}: {len(local(pages)):5} rows, "
+            f"request {remote * 1000:8.1f} ms, local {elapsed * 1000:8.2f} ms "
+            f"({elapsed / args.rows * 1e6:5.2f} us/row)"
+        )
+
+
+if __name__ == "__main__":
+    main()
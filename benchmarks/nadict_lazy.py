@@ -0,0 +1,140 @@
+"""
+`bot.nadict.NAdict` compared to `bot.nadict.LazyNAdict`,
+over the payloads the bot parses and the keys it reads from each.
+
+    python -m benchmarks.nadict_lazy --number 2000
+"""
+import timeit
+import argparse
+from typing import Any
+from typing import Callable
+
+from bot.nadict import NAdict
+from bot.nadict import LazyNAdict
+from benchmarks.standin import timetrack_pages
+
+
+def rollup_schema(categories: int) -> dict[str, Any]:
+    # `Database._property_schema` of the rollup table, read in `TimerStart`.
+    schema: dict[str, Any] = {
+        "name": {"id": "title", "name": "name", "type": "title", "title": {}},
+        "time_created": {
+            "id": "tc",
+            "name": "time_created",
+            "type": "date",
+            "date": {},
+        },
+    }
+    expression = []
+    for i in range(categories):
+        schema[f"timer_category{i}"] = {
+            "id": f"r{i}",
+            "name": f"timer_category{i}",
+            "type": "relation",
+            "relation": {
+                "database_id": "standin-timetrack",
+                "type": "dual_property",
+                "dual_property": {
+                    "synced_property_name": f"rollup_category{i}",
+                    "synced_property_id": f"s{i}",
+                },
+            },
+        }
+        schema[f"sum_category{i}"] = {
+            "id": f"u{i}",
+            "name": f"sum_category{i}",
+            "type": "rollup",
+            "rollup": {
+                "rollup_property_name": "timer",
+                "relation_property_name": f"timer_category{i}",
+                "rollup_property_id": "tmr1",
+                "relation_property_id": f"r{i}",
+                "function": "sum",
+            },
+        }
+        expression.append(f'prop("sum_category{i}")')
+    schema["total"] = {
+        "id": "ttl",
+        "name": "total",
+        "type": "formula",
+        "formula": {"expression": " + ".join(expression)},
+    }
+    return schema
+
+
+def block_children(blocks: int) -> dict[str, Any]:
+    # `Page.retrieve_page_content()` of a timeblock page, read in `schedule_timeblocks`.
+    text = {
+        "type": "text",
+        "text": {"content": '{"status": ["status", "scheduled"]}', "link": None},
+        "plain_text": '{"status": ["status", "scheduled"]}',
+        "href": None,
+    }
+    block = {
+        "object": "block",
+        "id": "b",
+        "type": "code",
+        "code": {"caption": [], "rich_text": [text], "language": "json"},
+        "has_children": False,
+        "archived": False,
+    }
+    return {"object": "list", "results": [block] * blocks, "has_more": False}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    page = timetrack_pages(1)[0]
+    query = {"object": "list", "results": timetrack_pages(100), "has_more": False}
+    schema = rollup_schema(20)
+    content = block_children(10)
+
+    cases: list[tuple[str, dict[str, Any], dict[str, Any], Callable[[Any], Any]]] = [
+        (
+            "page properties",
+            page["properties"],
+            {},
+            lambda d: d.name.title_0_text.content,
+        ),
+        (
+            "page properties sep='.'",
+            page["properties"],
+            {"sep": "."},
+            lambda d: (
+                d.get("override_start.date.start"),
+                d.get("timer.formula.number"),
+            ),
+        ),
+        (
+            "query results",
+            query,
+            {},
+            lambda d: d.results_0_properties.timer.formula.number,
+        ),
+        ("rollup schema", schema, {}, lambda d: d.total.formula_expression),
+        (
+            "block children",
+            content,
+            {},
+            lambda d: d.results_0_code.rich_text_0_text.content,
+        ),
+    ]
+
+    print(f"best of 5, {args.number} loops each")
+    for label, payload, kwargs, read in cases:
+        assert read(NAdict(payload, **kwargs)) == read(LazyNAdict(payload, **kwargs))
+        results = []
+        for cls in (NAdict, LazyNAdict):
+            timer = timeit.Timer(lambda: read(cls(payload, **kwargs)))
+            best = min(timer.repeat(repeat=5, number=args.number)) / args.number
+            results.append(best)
+        print(
+            f"{label:>24}: NAdict {results[0] * 1e6:9.1f} us  "
+            f"LazyNAdict {results[1] * 1e6:7.1f} us  ({results[0] / results[1]:.0f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Building the payloads for stopping a timer and for a cron sync update,
+with property value objects and `notion.build_payload` every time,
+compared to rendering a `notion.PayloadTemplate` compiled once.
+
+    python -m benchmarks.payload_template --number 100000
+"""
+import time
+import argparse
+import tracemalloc
+from typing import Any
+from typing import Callable
+from datetime import datetime
+from datetime import timezone
+
+import benchmarks.standin  # sets a token for the client.
+import notion
+import notion.properties as prop
+
+END = datetime(2023, 1, 1, 17, 30, tzinfo=timezone.utc)
+
+
+def stop_timer() -> bytes:
+    return notion.build_payload(
+        prop.Properties(
+            prop.CheckboxPropertyValue("stop", True),
+            prop.DatePropertyValue("override_end", start=END),
+        )
+    )
+
+
+STOP_TIMER = notion.PayloadTemplate(
+    prop.Properties(
+        prop.CheckboxPropertyValue("stop", True),
+        prop.DatePropertyValue("override_end", start=notion.Slot("end")),
+    )
+)
+
+
+def cron_synced() -> bytes:
+    return notion.build_payload(
+        prop.Properties(
+            prop.StatusPropertyValue("sync", {"name": "paused"}),
+            prop.DatePropertyValue("last_synced", start=END),
+            prop.CheckboxPropertyValue("pause", False),
+        )
+    )
+
+
+CRON_SYNCED = notion.PayloadTemplate(
+    prop.Properties(
+        prop.StatusPropertyValue("sync", {"name": notion.Slot("status")}),
+        prop.DatePropertyValue("last_synced", start=notion.Slot("last_synced")),
+        prop.CheckboxPropertyValue("pause", False),
+    )
+)
+
+
+def per_call(function: Callable[[], Any], number: int) -> tuple[float, int]:
+    """Seconds per call, and peak bytes allocated during a call."""
+    start = time.perf_counter()
+    for _ in range(number):
+        function()
+    elapsed = (time.perf_counter() - start) / number
+
+    peaks = [0] * 1000
+    tracemalloc.start()
+    for i in range(len(peaks)):
+        tracemalloc.reset_peak()
+        current, _ = tracemalloc.get_traced_memory()
+        function()
+        peaks[i] = tracemalloc.get_traced_memory()[1] - current
+    tracemalloc.stop()
+    return elapsed, sorted(peaks)[len(peaks) // 2]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=100_000)
+    args = parser.parse_args()
+
+    cases = {
+        "stop timer": (stop_timer, lambda: STOP_TIMER.render(end=END)),
+        "cron synced": (
+            cron_synced,
+            lambda: CRON_SYNCED.render(status="paused", last_synced=END),
+        ),
+    }
+
+    print(f"number={args.number}")
+    for label, (built, rendered) in cases.items():
+        assert built() == rendered(), f"{label} payloads differ"
+        build_time, build_bytes = per_call(built, args.number)
+        render_time, render_bytes = per_call(rendered, args.number)
+        print(
+            f"{label:>12}: build_payload {build_time * 1e6:6.2f} us {build_bytes:5} B, "
+            f"template {render_time * 1e6:6.2f} us {render_bytes:5} B "
+            f"({build_time / render_time:4.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+End-to-end scan time of a 10k row timetrack database through `Database.iter_query`,
+with and without prefetching the next cursor page.
+
+    python -m benchmarks.query_prefetch --rows 10000 --latency 0.05 --work 0.0005 --prefetch 0 1 2 4
+"""
+import time
+import argparse
+
+from notion.api.client import _NotionClient
+from notion.api.client import RateLimiter
+from benchmarks.standin import StandInDatabase
+from benchmarks.standin import timetrack_pages
+from benchmarks.standin import unlimited
+
+
+def scan(database: StandInDatabase, prefetch: int, work: float) -> tuple[int, float]:
+    rows = 0
+    start = time.perf_counter()
+    for page in database.iter_query(prefetch=prefetch):
+        rows += 1
+        if work:
+            # stands in for the caller processing each row.
+            deadline = time.perf_counter() + work
+            while time.perf_counter() < deadline:
+                pass
+    return rows, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument(
+        "--latency", type=float, default=0.05, help="seconds per request"
+    )
+    parser.add_argument("--work", type=float, default=0.0005, help="seconds per row")
+    parser.add_argument("--prefetch", type=int, nargs="+", default=[0, 1, 2, 4])
+    parser.add_argument(
+        "--rate", type=float, default=None, help="requests per second, default no limit"
+    )
+    args = parser.parse_args()
+
+    _NotionClient.rate_limiter = (
+        RateLimiter(args.rate, burst=10) if args.rate else unlimited()
+    )
+    database = StandInDatabase(timetrack_pages(args.rows), latency=args.latency)
+
+    print(f"rows={args.rows} latency={args.latency}s work={args.work * 1000}ms/row")
+    for prefetch in args.prefetch:
+        rows, elapsed = scan(database, prefetch, args.work)
+        print(f"prefetch={prefetch}: {rows} rows in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
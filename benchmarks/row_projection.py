@@ -0,0 +1,92 @@
+"""
+Reading the fields the bot uses from query results,
+through `bot.nadict.NAdict` compared to `notion.query.RowProjection`.
+
+    python -m benchmarks.row_projection --rows 10000 --repeat 5
+"""
+import time
+import argparse
+import tracemalloc
+from typing import Any
+from typing import Callable
+
+from bot.nadict import NAdict
+from notion.query import RowProjection
+from benchmarks.standin import StandInDatabase
+from benchmarks.standin import timetrack_pages
+
+
+def with_nadict(pages: list[dict[str, Any]]) -> list[tuple[Any, ...]]:
+    # same access as `autocomplete_active_timers`.
+    rows = []
+    for page in pages:
+        page = NAdict(page)
+        rows.append(
+            (
+                page.id,
+                page.properties.name.title_0_text.content,
+                page.properties.timer.formula.number,
+            )
+        )
+    return rows
+
+
+def with_projection(
+    projection: RowProjection,
+) -> Callable[[list[dict[str, Any]]], list[tuple[Any, ...]]]:
+    def run(pages: list[dict[str, Any]]) -> list[tuple[Any, ...]]:
+        rows = []
+        for page in pages:
+            row = projection(page)
+            rows.append((row.id, row.name, row.timer))
+        return rows
+
+    return run
+
+
+def measure(
+    function: Callable[[list[dict[str, Any]]], Any],
+    pages: list[dict[str, Any]],
+    repeat: int,
+) -> tuple[float, int]:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(pages)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    function(pages)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    pages = timetrack_pages(args.rows)
+    database = StandInDatabase(pages)
+    projection = RowProjection(database._property_schema, ["name", "timer"])
+
+    nadict_rows = with_nadict(pages)
+    projection_rows = with_projection(projection)(pages)
+    assert [(i, n, t) for i, n, t in nadict_rows] == projection_rows
+
+    print(f"rows={args.rows}, best of {args.repeat}")
+    for label, function in (
+        ("NAdict", with_nadict),
+        ("RowProjection", with_projection(projection)),
+    ):
+        elapsed, peak = measure(function, pages, args.repeat)
+        print(
+            f"{label:>14}: {elapsed * 1000:8.1f} ms "
+            f"({elapsed / args.rows * 1e6:6.2f} us/row), peak {peak / 1024:8.0f} KiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
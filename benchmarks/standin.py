@@ -0,0 +1,164 @@
+"""
+Local stand-in for the Notion databases used by the bot, for benchmarks.
+
+Pages are generated in the same shape the API returns for the timetrack database,
+and `StandInDatabase` serves them through `Database.query`/`Database.iter_query`
+with a simulated round trip latency, without sending any requests.
+"""
+import os
+import time
+import uuid
+import random
+from typing import Any
+from typing import Optional
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+
+import orjson
+
+os.environ.setdefault("NOTION_TOKEN", "benchmark")
+
+import notion
+from notion.api.client import RateLimiter
+
+__all__ = (
+    "CATEGORIES",
+    "timetrack_page",
+    "timetrack_pages",
+    "StandInDatabase",
+    "unlimited",
+)
+
+CATEGORIES = ["admin", "meetings", "development", "review", "support", "learning"]
+
+
+def _rich_text(content: str) -> list[dict[str, Any]]:
+    return [
+        {
+            "type": "text",
+            "text": {"content": content, "link": None},
+            "annotations": {
+                "bold": False,
+                "italic": False,
+                "strikethrough": False,
+                "underline": False,
+                "code": False,
+                "color": "default",
+            },
+            "plain_text": content,
+            "href": None,
+        }
+    ]
+
+
+def timetrack_page(i: int, *, rng: random.Random) -> dict[str, Any]:
+    start = datetime(2023, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=37 * i)
+    end = start + timedelta(minutes=rng.randint(5, 240))
+    stopped = rng.random() > 0.05
+    page_id = str(uuid.UUID(int=rng.getrandbits(128)))
+    hours = round((end - start).total_seconds() / 3600, 2) if stopped else None
+    category = rng.choice(CATEGORIES)
+    user = {"object": "user", "id": str(uuid.UUID(int=rng.getrandbits(128)))}
+
+    return {
+        "object": "page",
+        "id": page_id,
+        "created_time": start.isoformat().replace("+00:00", ".000Z"),
+        "last_edited_time": end.isoformat().replace("+00:00", ".000Z"),
+        "created_by": user,
+        "last_edited_by": user,
+        "cover": None,
+        "icon": None,
+        "parent": {"type": "database_id", "database_id": "standin-timetrack"},
+        "archived": False,
+        "properties": {
+            "stop": {"id": "%3Astp", "type": "checkbox", "checkbox": stopped},
+            "active": {
+                "id": "act%3F",
+                "type": "formula",
+                "formula": {"type": "boolean", "boolean": not stopped},
+            },
+            "override_start": {
+                "id": "ovs1",
+                "type": "date",
+                "date": {"start": start.isoformat(), "end": None, "time_zone": None},
+            },
+            "override_end": {
+                "id": "ove1",
+                "type": "date",
+                "date": (
+                    {"start": end.isoformat(), "end": None, "time_zone": None}
+                    if stopped
+                    else None
+                ),
+            },
+            "timer": {
+                "id": "tmr1",
+                "type": "formula",
+                "formula": {"type": "number", "number": hours},
+            },
+            f"rollup_{category}": {
+                "id": f"rl{category[:2]}",
+                "type": "relation",
+                "relation": [{"id": str(uuid.UUID(int=rng.getrandbits(128)))}],
+                "has_more": False,
+            },
+            "name": {
+                "id": "title",
+                "type": "title",
+                "title": _rich_text(category),
+            },
+        },
+        "url": f"https://www.notion.so/{page_id.replace('-', '')}",
+    }
+
+
+def timetrack_pages(rows: int, *, seed: int = 0) -> list[dict[str, Any]]:
+    rng = random.Random(seed)
+    return [timetrack_page(i, rng=rng) for i in range(rows)]
+
+
+class StandInDatabase(notion.Database):
+    """
+    `notion.Database` serving `pages` from memory.
+    Each query request sleeps for `latency` seconds and is serialized through orjson,
+    like a response from the API would be.
+    """
+
+    def __new__(cls, *args: Any, **kwargs: Any) -> "StandInDatabase":
+        return object.__new__(cls)
+
+    def __init__(self, pages: list[dict[str, Any]], /, *, latency: float = 0.0) -> None:
+        super().__init__(uuid.uuid4().hex, token="benchmark")
+        self.pages = pages
+        self.latency = latency
+        self.requests = 0
+        schema = {
+            name: {"id": value["id"], "name": name, "type": value["type"]}
+            for name, value in (pages[0]["properties"] if pages else {}).items()
+        }
+        self.__dict__["_property_schema"] = schema
+
+    def _post(self, url: str, /, *, payload: Optional[Any] = None) -> dict[str, Any]:
+        self.rate_limiter.acquire()
+        self.requests += 1
+        body = orjson.loads(payload) if isinstance(payload, bytes) else payload or {}
+        start = int(body.get("start_cursor") or 0)
+        end = start + int(body.get("page_size", 100))
+        if self.latency:
+            time.sleep(self.latency)
+
+        has_more = end < len(self.pages)
+        response = {
+            "object": "list",
+            "results": self.pages[start:end],
+            "next_cursor": str(end) if has_more else None,
+            "has_more": has_more,
+        }
+        return orjson.loads(orjson.dumps(response))
+
+
+def unlimited() -> RateLimiter:
+    """A rate limiter that never waits, to measure the client without Notion's limit."""
+    return RateLimiter(1e9, burst=10**9)
@@ -0,0 +1,62 @@
+"""
+Searching a `bot.typeahead.TypeaheadIndex` of generated category names,
+as the timer autocomplete does on every keystroke.
+
+    python -m benchmarks.typeahead --names 5000
+"""
+import time
+import random
+import string
+import argparse
+
+from bot.typeahead import TypeaheadIndex
+
+
+def category_names(count: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    words = [
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9)))
+        for _ in range(count)
+    ]
+    return [" ".join(rng.sample(words, rng.randint(1, 3))) for _ in range(count)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--names", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    names = category_names(args.names)
+    start = time.perf_counter()
+    index = TypeaheadIndex(names)
+    print(f"names={args.names}, built in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    rng = random.Random(1)
+    for at, name in enumerate(rng.sample(names, len(names) // 10)):
+        index.use(name, at=at)
+
+    # what's typed so far: empty, prefixes, a later word, and typos.
+    queries = [""]
+    for name in rng.choices(names, k=args.queries):
+        cut = rng.randint(1, len(name))
+        typo = name[:cut] + rng.choice(string.ascii_lowercase) + name[cut + 1 :]
+        queries += [name[:cut], name.split()[-1][:cut], typo]
+
+    elapsed = []
+    for query in queries:
+        # best of 3, so a pause of the process isn't counted as a slow search.
+        best = float("inf")
+        for _ in range(3):
+            start = time.perf_counter()
+            index.search(query)
+            best = min(best, time.perf_counter() - start)
+        elapsed.append(best)
+    elapsed.sort()
+    for label, q in (("p50", 0.5), ("p99", 0.99), ("max", 1.0)):
+        value = elapsed[min(int(q * len(elapsed)), len(elapsed) - 1)]
+        print(f"{label}: {value * 1e6:7.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+import time
 import logging
 
 import crescent
@@ -11,3 +12,6 @@ INTENTS = (
 
 bot_logger = logging.getLogger("ayvi-bot")
 bot_logger.setLevel(logging.INFO)
+
+# when the package was first imported, for the startup timings in `bot.startup`.
+imported_at = time.monotonic()
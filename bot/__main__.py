@@ -1,4 +1,5 @@
 import os
+import sys
 import dotenv
 
 import crescent
@@ -8,6 +9,7 @@ from discord_webhook import AsyncDiscordWebhook
 from requests.exceptions import Timeout
 
 from bot.schedule.scheduler import scheduler
+from bot.startup import run_warmups
 from bot import bot_logger
 from bot import INTENTS
 
@@ -20,6 +22,8 @@ client.plugins.load_folder("bot.schedule")
 client.plugins.load_folder("bot.timer")
 client.plugins.load_folder("bot.views")
 
+failed_warmups: list[str] = []
+
 
 @client.include
 @crescent.event
@@ -37,6 +41,17 @@ async def on_ready(event: hikari.StartedEvent) -> None:
         bot_logger.info(f"Discord connection timed out: {Timeout}")
 
 
+# queries and clients created once connected, instead of while loading the plugins.
+@client.include
+@crescent.event
+async def warm_up(event: hikari.StartedEvent) -> None:
+    global failed_warmups
+    failed_warmups = await run_warmups()
+    if failed_warmups:
+        # exiting with an error below, so the process is restarted.
+        await bot.close()
+
+
 @client.include
 @crescent.event
 async def terminal_event(event: hikari.ShardReadyEvent) -> None:
@@ -51,3 +66,5 @@ if __name__ == "__main__":
             name="on gcp:compute engine", type=hikari.ActivityType.PLAYING
         )
     )
+    if failed_warmups:
+        sys.exit(f"Failed to start: {', '.join(failed_warmups)}.")
@@ -0,0 +1,155 @@
+""" Commands that respond right away, and do their Notion work in a worker pool.
+
+Interactions have to be answered within 3 seconds, and a Notion call on the event loop
+blocks the gateway and every other command while it waits. A `DeferredResponse`
+acknowledges the interaction first, runs each blocking call in a bounded thread pool,
+and edits the response as the work progresses.
+
+```py
+async def callback(self, ctx: crescent.Context) -> None:
+    async with DeferredResponse(ctx, "Starting Timer..") as response:
+        page = await response.run(notion.Page.create, database, page_title=name)
+        await response.edit(f"New Timer: `{page.id}`")
+```
+
+The time from the interaction being created to the first response is recorded
+in `response_times`, and its percentiles are logged every hour.
+"""
+import os
+import asyncio
+import dotenv
+import functools
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from types import TracebackType
+from typing import Any
+from typing import Callable
+from typing import Optional
+from typing import Sequence
+from typing import TypeVar
+from datetime import datetime
+from datetime import timezone
+
+import crescent
+import hikari
+from crescent.ext import tasks
+
+from bot.utils import plugin
+from bot import bot_logger
+
+__all__: Sequence[str] = (
+    "DeferredResponse",
+    "ResponseTimes",
+    "response_times",
+    "run_blocking",
+    "log_response_times",
+)
+
+dotenv.load_dotenv()
+
+# Threads for blocking Notion calls made by commands,
+# more commands than this wait for a free thread instead of adding load on Notion.
+NOTION_COMMAND_WORKERS = int(os.getenv("NOTION_COMMAND_WORKERS", 4))
+
+_workers = ThreadPoolExecutor(
+    max_workers=NOTION_COMMAND_WORKERS, thread_name_prefix="notion-command"
+)
+
+_T = TypeVar("_T")
+
+
+class ResponseTimes:
+    """Seconds from each interaction being created to its first response, for the last `window` commands."""
+
+    def __init__(self, window: int = 1000) -> None:
+        self._seconds: deque[float] = deque(maxlen=window)
+
+    def __len__(self) -> int:
+        return len(self._seconds)
+
+    def record(self, seconds: float) -> None:
+        self._seconds.append(max(seconds, 0.0))
+
+    def percentile(self, q: float) -> Optional[float]:
+        """The `q` (0 to 1) percentile, nearest rank, None until a response is recorded."""
+        if not self._seconds:
+            return None
+        ordered = sorted(self._seconds)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+response_times = ResponseTimes()
+
+
+async def run_blocking(function: Callable[..., _T], /, *args: Any, **kwargs: Any) -> _T:
+    """Calls `function` in the worker pool, and waits for it without blocking the event loop."""
+    return await asyncio.get_running_loop().run_in_executor(
+        _workers, functools.partial(function, *args, **kwargs)
+    )
+
+
+class DeferredResponse:
+    """
+    Responds to `ctx` with `ack` when entered.
+    If the block raises, the error is added to the response before it's raised again.
+
+    ---
+    :param ctx: (required) the command's context.
+    :param ack: (required) the first response, sent before any other work.
+    :param ephemeral: (optional) whether the response is only shown to the user.
+    """
+
+    __slots__: Sequence[str] = ("ctx", "ack", "ephemeral", "content")
+
+    def __init__(
+        self, ctx: crescent.Context, ack: str, /, *, ephemeral: bool = False
+    ) -> None:
+        self.ctx = ctx
+        self.ack = ack
+        self.ephemeral = ephemeral
+        self.content = ack
+
+    async def __aenter__(self) -> "DeferredResponse":
+        await self.ctx.respond(self.ack, ephemeral=self.ephemeral)
+        created = self.ctx.interaction.created_at
+        response_times.record((datetime.now(timezone.utc) - created).total_seconds())
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        if exc is not None and not isinstance(exc, asyncio.CancelledError):
+            # keeping what was done so far, e.g. the id of a page that was created.
+            await self.edit(
+                f"{self.content}\n{self.ctx.user.mention} An error was raised: {exc}"
+            )
+
+    async def run(
+        self, function: Callable[..., _T], /, *args: Any, **kwargs: Any
+    ) -> _T:
+        """Calls `function` in the worker pool, see `run_blocking()`."""
+        return await run_blocking(function, *args, **kwargs)
+
+    async def edit(self, content: str, **kwargs: Any) -> hikari.Message:
+        """
+        Replaces the response with `content`, to show progress or the result.
+        `kwargs` are passed on to `crescent.Context.edit()`, e.g. `components`.
+        """
+        message = await self.ctx.edit(content, **kwargs)
+        self.content = content
+        return message
+
+
+@plugin.include
+@tasks.loop(hours=1)
+async def log_response_times() -> None:
+    if not response_times:
+        return
+    p50, p95 = response_times.percentile(0.5), response_times.percentile(0.95)
+    bot_logger.info(
+        f"Time to first response: p50 {p50 * 1000:.0f} ms, p95 {p95 * 1000:.0f} ms, "
+        f"over the last {len(response_times)} commands."
+    )
@@ -0,0 +1,200 @@
+""" Timesheet history exported to Parquet, streamed from the timetrack and rollup databases.
+
+Timetrack pages are read one query response at a time, converted to Arrow record batches
+with a fixed schema (`SCHEMA`), and written as they arrive,
+so memory use depends on `batch_size` and not on the size of the database.
+
+```py
+export_timesheet("timesheet.parquet")
+pyarrow.parquet.read_table("timesheet.parquet").group_by("rollup_date").aggregate(
+    [("duration", "sum")]
+)
+```
+
+Or from the command line:
+
+    python -m bot.export timesheet.parquet
+"""
+import argparse
+from typing import Any
+from typing import Iterable
+from typing import Iterator
+from typing import Mapping
+from typing import Optional
+from typing import Sequence
+from typing import Union
+from datetime import date
+from datetime import datetime
+from itertools import islice
+from os import PathLike
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+import notion
+from notion.query import SortFilter
+from notion.query import EntryTimestampSort
+from bot.hours import TimerEntries
+from bot.hours import timer_hours
+
+__all__: Sequence[str] = (
+    "SCHEMA",
+    "rollup_dates",
+    "timesheet_batches",
+    "export_timesheet",
+)
+
+SCHEMA = pa.schema(
+    [
+        pa.field("category", pa.string()),
+        pa.field("start", pa.timestamp("ms", tz="UTC")),
+        # null while the timer is running.
+        pa.field("end", pa.timestamp("ms", tz="UTC")),
+        # hours, the same as the `timer` formula.
+        pa.field("duration", pa.float64()),
+        # title of the related rollup page, null if the entry isn't related to one.
+        pa.field("rollup_date", pa.date32()),
+        pa.field("page_id", pa.string()),
+    ]
+)
+
+_OLDEST_FIRST = SortFilter([EntryTimestampSort.created_time_ascending()])
+
+
+def rollup_dates(pages: Iterable[Mapping[str, Any]], /) -> dict[str, date]:
+    """The date of each rollup page, by page id. Pages not titled with a date are skipped."""
+    dates: dict[str, date] = {}
+    for page in pages:
+        title = "".join(t["plain_text"] for t in page["properties"]["name"]["title"])
+        try:
+            dates[page["id"]] = date.fromisoformat(title)
+        except ValueError:
+            continue
+    return dates
+
+
+def _rollup_id(page: Mapping[str, Any]) -> Optional[str]:
+    # each entry relates to one rollup page, through the `rollup_{category}` column.
+    for name, value in page["properties"].items():
+        if name.startswith("rollup_") and value.get("relation"):
+            return value["relation"][0]["id"]
+    return None
+
+
+def _timestamps(ms: np.ndarray) -> pa.Array:
+    missing = np.isnan(ms)
+    return pa.array(
+        np.where(missing, 0, ms).astype(np.int64),
+        type=pa.timestamp("ms", tz="UTC"),
+        mask=missing,
+    )
+
+
+def _batch(
+    pages: Sequence[Mapping[str, Any]],
+    dates: Mapping[str, date],
+    now: Optional[datetime],
+) -> pa.RecordBatch:
+    entries = TimerEntries.from_pages(pages)
+    end = np.where(
+        np.isnan(entries.override_end),
+        np.where(entries.stop, entries.last_edited_time, np.nan),
+        entries.override_end,
+    )
+    return pa.RecordBatch.from_arrays(
+        [
+            pa.array(entries.categories[entries.category], type=pa.string()),
+            _timestamps(entries.start),
+            _timestamps(end),
+            pa.array(timer_hours(entries, now=now), from_pandas=True),
+            pa.array([dates.get(_rollup_id(p)) for p in pages], type=pa.date32()),
+            pa.array(entries.page_id, type=pa.string()),
+        ],
+        schema=SCHEMA,
+    )
+
+
+def timesheet_batches(
+    pages: Iterable[Mapping[str, Any]],
+    dates: Mapping[str, date],
+    /,
+    *,
+    batch_size: int = 1000,
+    now: Optional[datetime] = None,
+) -> Iterator[pa.RecordBatch]:
+    """
+    Converts timetrack pages to record batches of `SCHEMA`,
+    holding at most `batch_size` pages at a time.
+
+    ---
+    :param dates: (required) rollup page dates by page id, from `rollup_dates()`.
+    :param now: (optional) time used for the duration of running timers, see `bot.hours.timer_hours()`.
+    """
+    pages = iter(pages)
+    while chunk := list(islice(pages, batch_size)):
+        yield _batch(chunk, dates, now)
+
+
+def export_timesheet(
+    where: Union[str, PathLike[str], pa.NativeFile],
+    /,
+    *,
+    timetrack: Optional[str] = None,
+    rollup: Optional[str] = None,
+    batch_size: int = 1000,
+    prefetch: int = 1,
+    compression: str = "zstd",
+) -> int:
+    """
+    Writes every timetrack entry to a Parquet file, one row group per batch.
+    Returns the number of rows written.
+
+    ---
+    :param timetrack: (optional) timetrack database id, `NDB_TIMETRACK_ID` by default.
+    :param rollup: (optional) rollup database id, `NDB_ROLLUP_ID` by default.
+    :param prefetch: (optional) query responses requested ahead, see `Database.iter_query()`.
+    """
+    if timetrack is None or rollup is None:
+        from bot.notionDBids import NDB_ROLLUP_ID
+        from bot.notionDBids import NDB_TIMETRACK_ID
+
+        timetrack = timetrack or NDB_TIMETRACK_ID
+        rollup = rollup or NDB_ROLLUP_ID
+
+    # the rollup database only has one page per day, so its dates are read up front.
+    dates = rollup_dates(
+        notion.Database(rollup).iter_query(
+            payload=notion.build_payload(_OLDEST_FIRST),
+            prefetch=prefetch,
+        )
+    )
+    pages = notion.Database(timetrack).iter_query(
+        payload=notion.build_payload(_OLDEST_FIRST),
+        prefetch=prefetch,
+    )
+
+    rows = 0
+    now = datetime.now().astimezone()
+    with pq.ParquetWriter(where, SCHEMA, compression=compression) as writer:
+        for batch in timesheet_batches(pages, dates, batch_size=batch_size, now=now):
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Exports the timesheet to Parquet.")
+    parser.add_argument("path")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--compression", default="zstd")
+    args = parser.parse_args()
+
+    rows = export_timesheet(
+        args.path, batch_size=args.batch_size, compression=args.compression
+    )
+    print(f"Exported {rows} entries to {args.path}.")
+
+
+if __name__ == "__main__":
+    main()
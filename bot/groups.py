@@ -7,6 +7,7 @@ timesheet = crescent.Group("timesheet")
 options = timesheet.sub_group("options")
 reminder = crescent.Group("reminder")
 jobstores = crescent.Group("jobstores")
+journal = crescent.Group("journal")
 
 __all__: Sequence[str] = (
     "timer",
@@ -14,4 +15,5 @@ __all__: Sequence[str] = (
     "options",
     "reminder",
     "jobstores",
+    "journal",
 )
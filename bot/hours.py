@@ -0,0 +1,306 @@
+""" Timesheet hours computed locally from timetrack pages, with NumPy.
+
+`timer_hours()` gives the same result as the `timer` formula in the timetrack database,
+for every entry at once, and `totals()` sums them per day, week, or month, and/or per category,
+the same way the rollup database does, without the formula or the rollup columns.
+
+```py
+entries = TimerEntries.from_pages(timetrack_mirror.pages())
+hours = timer_hours(entries)
+totals(entries, hours, by="day")[date.today()]
+```
+
+The `timer` formula:
+    - starts at `override_start`, or the page's `created_time`.
+    - ends at `override_end`, or the page's `last_edited_time` once `stop` is checked.
+    - hours are rounded to 2 decimals (half up, like Notion's `round()`).
+    - if that's empty, 0, or negative, and the timer is still running
+      (`stop` unchecked, no `override_end`), the hours from the start until now, otherwise empty.
+
+`running_hours()` gives the same for one running timer, for live durations,
+and `timer_drift()` checks the local result against the formula read from Notion.
+"""
+import math
+from typing import Any
+from typing import Literal
+from typing import Mapping
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+from datetime import date
+from datetime import datetime
+from datetime import timezone
+from datetime import tzinfo
+
+import numpy as np
+from tzlocal import get_localzone
+
+__all__: Sequence[str] = (
+    "TimerEntries",
+    "timer_hours",
+    "timer_formula",
+    "running_hours",
+    "TimerDrift",
+    "timer_drift",
+    "totals",
+)
+
+_MS_PER_DAY = 86_400_000
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def _ms(timestamp: Optional[str]) -> float:
+    if not timestamp:
+        return math.nan
+    value = datetime.fromisoformat(timestamp)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp() * 1000
+
+
+def _date_ms(value: Optional[Mapping[str, Any]]) -> float:
+    date = value.get("date") if value else None
+    return _ms(date["start"]) if date else math.nan
+
+
+class TimerEntries(NamedTuple):
+    """
+    Timetrack pages as arrays, one element per page.
+    Timestamps are milliseconds since the epoch (float64), NaN if the property is empty.
+    `category` is the index of each page's title (the category) in `categories`.
+    """
+
+    page_id: np.ndarray
+    categories: np.ndarray
+    category: np.ndarray
+    created_time: np.ndarray
+    last_edited_time: np.ndarray
+    override_start: np.ndarray
+    override_end: np.ndarray
+    stop: np.ndarray
+
+    @classmethod
+    def from_pages(cls, pages: Sequence[Mapping[str, Any]]) -> "TimerEntries":
+        """Reads the properties used by the `timer` formula, and the category (`name`)."""
+        page_ids, category, stops = [], [], []
+        categories: dict[str, int] = {}
+        created, edited, override_start, override_end = [], [], [], []
+        for page in pages:
+            properties = page["properties"]
+            page_ids.append(page["id"])
+            title = "".join(t["plain_text"] for t in properties["name"]["title"])
+            category.append(categories.setdefault(title, len(categories)))
+            created.append(_ms(page["created_time"]))
+            edited.append(_ms(page["last_edited_time"]))
+            override_start.append(_date_ms(properties.get("override_start")))
+            override_end.append(_date_ms(properties.get("override_end")))
+            stops.append(bool(properties.get("stop", {}).get("checkbox")))
+
+        return cls(
+            np.array(page_ids, dtype=object),
+            np.array(list(categories), dtype=object),
+            np.array(category, dtype=np.int64),
+            np.array(created, dtype=np.float64),
+            np.array(edited, dtype=np.float64),
+            np.array(override_start, dtype=np.float64),
+            np.array(override_end, dtype=np.float64),
+            np.array(stops, dtype=bool),
+        )
+
+    @property
+    def start(self) -> np.ndarray:
+        return np.where(
+            np.isnan(self.override_start), self.created_time, self.override_start
+        )
+
+
+def _round_hours(ms: Any) -> Any:
+    # same order of operations as the formula, `round()` in Notion rounds half up.
+    x = 100 * ms / 1000 / 60 / 60
+    floor = np.floor(x)
+    return (floor + (x - floor >= 0.5)) / 100
+
+
+def _now_ms(now: Optional[datetime]) -> float:
+    now = now or datetime.now(timezone.utc)
+    return now.timestamp() * 1000
+
+
+def timer_hours(
+    entries: TimerEntries, /, *, now: Optional[datetime] = None
+) -> np.ndarray:
+    """
+    The `timer` formula for every entry, NaN where the formula is empty.
+
+    ---
+    :param now: (optional) time used for running timers, the current time by default.
+    """
+    start = entries.start
+    no_override_end = np.isnan(entries.override_end)
+    end = np.where(
+        no_override_end,
+        np.where(entries.stop, entries.last_edited_time, np.nan),
+        entries.override_end,
+    )
+    with np.errstate(invalid="ignore"):
+        hours = _round_hours(end - start)
+        running = ~entries.stop & no_override_end
+        return np.where(
+            hours > 0,
+            hours,
+            np.where(running, _round_hours(_now_ms(now) - start), np.nan),
+        )
+
+
+def timer_formula(
+    page: Mapping[str, Any], /, *, now: Optional[datetime] = None
+) -> Optional[float]:
+    """The `timer` formula for one page, written the same way as in Notion."""
+    properties = page["properties"]
+    override_start = _date_ms(properties.get("override_start"))
+    override_end = _date_ms(properties.get("override_end"))
+    stop = bool(properties.get("stop", {}).get("checkbox"))
+
+    start = _ms(page["created_time"]) if math.isnan(override_start) else override_start
+    if not math.isnan(override_end):
+        end = override_end
+    elif stop:
+        end = _ms(page["last_edited_time"])
+    else:
+        end = math.nan
+
+    hours = float(_round_hours(end - start))
+    # `empty()` is true for 0 in Notion, and negative durations are errors.
+    if hours > 0:
+        return hours
+    if not stop and math.isnan(override_end):
+        return float(_round_hours(_now_ms(now) - start))
+    return None
+
+
+def running_hours(start: datetime, /, *, now: Optional[datetime] = None) -> float:
+    """
+    The `timer` formula for a timer that's still running, from its start
+    (`override_start`, or the page's `created_time`), for live durations without reading the formula.
+    """
+    return float(_round_hours(_now_ms(now) - start.timestamp() * 1000))
+
+
+class TimerDrift(NamedTuple):
+    """A page where the `timer` formula read from Notion differs from `timer_formula()`."""
+
+    page_id: str
+    local: Optional[float]
+    notion: Optional[float]
+
+
+def timer_drift(
+    pages: Sequence[Mapping[str, Any]],
+    /,
+    *,
+    now: Optional[datetime] = None,
+    tolerance: float = 0.01,
+) -> list[TimerDrift]:
+    """
+    Compares the `timer` formula in each page (`properties.timer.formula.number`)
+    with `timer_formula()`, and returns the pages where they differ by more than
+    `tolerance` hours, or where only one is empty.
+
+    ---
+    :param now: (optional) when Notion evaluated the formula, for running timers.
+    :param tolerance: (optional) running timers change by 0.01 every 36 seconds,
+        so allow for the time between Notion's `now()` and `now`.
+    """
+    drifted: list[TimerDrift] = []
+    for page in pages:
+        local = timer_formula(page, now=now)
+        formula = page["properties"]["timer"]["formula"]
+        notion = formula.get("number")
+        if local is None or notion is None:
+            if local != notion:
+                drifted.append(TimerDrift(page["id"], local, notion))
+        elif abs(local - notion) > tolerance + 1e-9:
+            drifted.append(TimerDrift(page["id"], local, notion))
+    return drifted
+
+
+def _local_days(start: np.ndarray, tz: tzinfo) -> np.ndarray:
+    """Local date of each timestamp, as days since the epoch."""
+    utc_days = np.floor_divide(start, _MS_PER_DAY).astype(np.int64)
+    days, inverse = np.unique(utc_days, return_inverse=True)
+
+    def offsets(ms: np.ndarray) -> np.ndarray:
+        return np.array(
+            [
+                datetime.fromtimestamp(t / 1000, tz).utcoffset().total_seconds() * 1000
+                for t in ms
+            ],
+            dtype=np.float64,
+        )
+
+    # the utc offset only needs to be looked up per day, unless it changes during the day.
+    day_start = offsets(days * _MS_PER_DAY)
+    day_end = offsets((days + 1) * _MS_PER_DAY - 1)
+    offset = day_start[inverse]
+    changed = np.flatnonzero((day_start != day_end)[inverse])
+    offset[changed] = offsets(start[changed])
+
+    return np.floor_divide(start + offset, _MS_PER_DAY).astype(np.int64)
+
+
+def totals(
+    entries: TimerEntries,
+    hours: np.ndarray,
+    /,
+    *,
+    by: Optional[Literal["day", "week", "month"]] = "day",
+    per_category: bool = False,
+    tz: Optional[tzinfo] = None,
+) -> dict[Any, float]:
+    """
+    Sums `hours` (from `timer_hours()`) per period of the start of each entry, in local time.
+    Empty hours count as 0, like in a Notion rollup.
+
+    ---
+    :param by: (optional) `day`, `week` (starting on Monday), `month`, or None for all time.
+        keys are the date of the day, of the Monday, or of the first of the month.
+    :param per_category: (optional) keys are `(category, date)`, or only `category` if `by` is None.
+    :param tz: (optional) timezone for dates, the local timezone by default.
+    """
+    if not len(hours):
+        return {}
+
+    periods = np.zeros(len(hours), dtype=np.int64)
+    if by is not None:
+        days = _local_days(entries.start, tz or get_localzone())
+        if by == "day":
+            periods = days
+        elif by == "week":
+            # 1970-01-01 was a Thursday.
+            periods = days - (days + 3) % 7
+        elif by == "month":
+            months = days.astype("datetime64[D]").astype("datetime64[M]")
+            periods = months.astype("datetime64[D]").astype(np.int64)
+        else:
+            raise ValueError(f"`by` must be day, week, month, or None, not `{by}`.")
+
+    # one key per (category, period), summed in one pass.
+    first, span = int(periods.min()), int(periods.max() - periods.min()) + 1
+    codes = entries.category if per_category else np.zeros(len(hours), dtype=np.int64)
+    keys = codes * span + (periods - first)
+    size = (len(entries.categories) if per_category else 1) * span
+    sums = np.bincount(keys, weights=np.nan_to_num(hours), minlength=size)
+    # groups without any entry are left out, not reported as 0.
+    groups = np.flatnonzero(np.bincount(keys, minlength=size))
+
+    result: dict[Any, float] = {}
+    for key, total in zip(groups.tolist(), sums[groups].tolist()):
+        code, period = divmod(key, span)
+        day = date.fromordinal(_EPOCH_ORDINAL + first + period)
+        if per_category and by is not None:
+            result[(entries.categories[code], day)] = total
+        elif per_category:
+            result[entries.categories[code]] = total
+        else:
+            result[day if by is not None else None] = total
+    return result
@@ -0,0 +1,446 @@
+""" Bulk import of past time entries into the timetrack database, from CSV or Parquet.
+
+Rows need a `category`, `start`, and `end` (any other column is ignored),
+so a file written by `bot.export` can be imported as is. In CSV files,
+`start` and `end` are ISO 8601 timestamps, UTC if they don't include an offset.
+
+Each row becomes a stopped timer: a page titled with the category, with `override_start`,
+`override_end`, `stop`, and the relation to the rollup page of the local date of `start`,
+all sent in one create request. Missing rollup pages are created first.
+Creates are sent from a pool of threads, and share the client rate limit.
+A create that timed out is only sent again if the page isn't found in the database.
+
+With a checkpoint file, the rows already imported are saved after every chunk,
+and an interrupted import continues where it stopped when run again.
+
+    python -m bot.importer timesheet.csv --checkpoint timesheet.import.json
+"""
+import os
+import time
+import argparse
+from pathlib import Path
+from typing import Callable
+from typing import Iterator
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+from typing import TypeVar
+from typing import Union
+from datetime import date
+from datetime import datetime
+from datetime import time as dt_time
+from datetime import tzinfo
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import as_completed
+from concurrent.futures import wait
+
+import orjson
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+import requests
+from tzlocal import get_localzone
+
+import notion
+from notion.query import PropertyFilter
+from notion.query import CompoundFilter
+from notion.properties import *
+from notion.exceptions.errors import _NotionErrors
+from notion.exceptions.errors import NotionRateLimited
+from notion.exceptions.errors import NotionConflictError
+from notion.exceptions.errors import NotionInternalServerError
+from notion.exceptions.errors import NotionServiceUnavailable
+from bot import bot_logger
+
+__all__: Sequence[str] = (
+    "COLUMNS",
+    "ImportRow",
+    "ImportResult",
+    "ImportCheckpoint",
+    "read_entries",
+    "import_timesheet",
+)
+
+COLUMNS: Sequence[str] = ("category", "start", "end")
+
+_TIMESTAMP = pa.timestamp("ms", tz="UTC")
+
+_T = TypeVar("_T")
+
+# errors after which the same create is sent again, Notion didn't save the page.
+_NOT_SAVED_ERRORS = (
+    NotionRateLimited,
+    NotionConflictError,
+    NotionInternalServerError,
+    NotionServiceUnavailable,
+    # the connection was never made, so the request wasn't sent.
+    requests.ConnectTimeout,
+)
+# errors after which the page may have been saved, e.g. a timeout reading the response.
+# creates aren't idempotent, so the page is looked for before it's sent again.
+_MAYBE_SAVED_ERRORS = (requests.RequestException,)
+# anything else means the row is bad.
+
+
+class ImportRow(NamedTuple):
+    # position of the row in the file, from 0.
+    index: int
+    category: str
+    start: datetime
+    end: datetime
+
+
+class ImportResult(NamedTuple):
+    created: int
+    # rows imported by a previous run, from the checkpoint.
+    skipped: int
+    # (row index, reason) of rows that failed validation, or that Notion rejected.
+    failed: list[tuple[int, str]]
+
+
+class ImportCheckpoint:
+    """
+    Rows already imported, and the rollup page id for each date, saved to a JSON file.
+
+    Rows can complete out of order, so the checkpoint is every row before `offset`,
+    plus the rows after it in `done`.
+    Without a path, nothing is saved and an import can't be resumed.
+
+    ---
+    :param path: (optional) JSON file, loaded if it exists.
+    :param source: (required) the file being imported,
+        a checkpoint can't be used to resume the import of a different file.
+
+    :raises `ValueError`: if the checkpoint was saved for a different file.
+    """
+
+    def __init__(
+        self, path: Optional[Union[str, os.PathLike[str]]], /, *, source: str
+    ) -> None:
+        self.path = path
+        self.source = source
+        self.offset = 0
+        self.done: set[int] = set()
+        self.rollups: dict[str, str] = {}
+
+        if path is not None and os.path.exists(path):
+            with open(path, "rb") as f:
+                saved = orjson.loads(f.read())
+            if saved["source"] != source:
+                raise ValueError(
+                    f"Checkpoint `{path}` is for `{saved['source']}`, not `{source}`."
+                )
+            self.offset = saved["offset"]
+            self.done = set(saved["done"])
+            self.rollups = saved["rollups"]
+
+    def __contains__(self, index: int) -> bool:
+        return index < self.offset or index in self.done
+
+    def add(self, index: int) -> None:
+        self.done.add(index)
+        while self.offset in self.done:
+            self.done.remove(self.offset)
+            self.offset += 1
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        state = {
+            "source": self.source,
+            "offset": self.offset,
+            "done": sorted(self.done),
+            "rollups": self.rollups,
+        }
+        # written to a temporary file first, so an interrupted save keeps the last checkpoint.
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "wb") as f:
+            f.write(orjson.dumps(state))
+        os.replace(temporary, self.path)
+
+
+def read_entries(
+    path: Union[str, os.PathLike[str]], /, *, chunk_size: int = 1000
+) -> Iterator[pa.RecordBatch]:
+    """
+    Streams the `COLUMNS` of a CSV or Parquet file (by extension) in record batches,
+    with `start` and `end` as UTC timestamps.
+    Parquet batches have `chunk_size` rows, CSV batches are read in blocks of about as many rows.
+
+    :raises `ValueError`: if the extension isn't `.csv` or `.parquet`.
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix == ".parquet":
+        for batch in pq.ParquetFile(path).iter_batches(
+            batch_size=chunk_size, columns=list(COLUMNS)
+        ):
+            yield pa.RecordBatch.from_arrays(
+                [
+                    batch.column("category").cast(pa.string()),
+                    batch.column("start").cast(_TIMESTAMP),
+                    batch.column("end").cast(_TIMESTAMP),
+                ],
+                names=list(COLUMNS),
+            )
+    elif suffix == ".csv":
+        yield from pa_csv.open_csv(
+            path,
+            # roughly 100 bytes per row.
+            read_options=pa_csv.ReadOptions(block_size=chunk_size * 100),
+            convert_options=pa_csv.ConvertOptions(
+                include_columns=list(COLUMNS),
+                column_types={
+                    "category": pa.string(),
+                    "start": _TIMESTAMP,
+                    "end": _TIMESTAMP,
+                },
+            ),
+        )
+    else:
+        raise ValueError(f"Can only import `.csv` or `.parquet` files, not `{path}`.")
+
+
+def _rows(
+    batch: pa.RecordBatch, offset: int
+) -> Iterator[Union[ImportRow, tuple[int, str]]]:
+    categories, starts, ends = (batch.column(c).to_pylist() for c in COLUMNS)
+    for i, (category, start, end) in enumerate(zip(categories, starts, ends), offset):
+        if not category or not category.strip():
+            yield i, "missing category"
+        elif start is None or end is None:
+            yield i, "missing start or end"
+        elif end <= start:
+            yield i, "end is not after start"
+        else:
+            yield ImportRow(i, category.strip(), start, end)
+
+
+class _Importer:
+    def __init__(
+        self,
+        timetrack: notion.Database,
+        rollup: notion.Database,
+        checkpoint: ImportCheckpoint,
+        tz: tzinfo,
+        retries: int,
+    ) -> None:
+        self.timetrack = timetrack
+        self.rollup = rollup
+        self.checkpoint = checkpoint
+        self.tz = tz
+        self.retries = retries
+
+    def validate(self, row: ImportRow) -> Optional[str]:
+        # the relation column for a category is added by `/timer start` the first time it's used.
+        if f"rollup_{row.category}" not in self.timetrack._property_schema:
+            return f"no `rollup_{row.category}` column in the timetrack database"
+        return None
+
+    def day(self, row: ImportRow) -> date:
+        return row.start.astimezone(self.tz).date()
+
+    def resolve_rollups(self, days: set[date]) -> None:
+        """Finds or creates the rollup page for each date, one at a time so none are duplicated."""
+        for day in sorted(days):
+            if str(day) in self.checkpoint.rollups:
+                continue
+            page_id = self._find_rollup(day)
+            if page_id is None:
+                # same as `daily_rollup_page`, which creates these each day at midnight.
+                created = datetime.combine(day, dt_time(0, 10), tzinfo=self.tz)
+                page_id = self._create(
+                    lambda: notion.Page.create(
+                        self.rollup,
+                        page_title=f"{day}",
+                        properties=Properties(
+                            DatePropertyValue("time_created", start=created)
+                        ),
+                    ).id,
+                    find=lambda: self._find_rollup(day),
+                )
+            self.checkpoint.rollups[str(day)] = page_id
+
+    def _find_rollup(self, day: date) -> Optional[str]:
+        page = next(
+            self.rollup.iter_query(
+                payload=notion.build_payload(
+                    PropertyFilter.text("name", "title", "equals", day)
+                ),
+                limit=1,
+                cache=False,
+            ),
+            None,
+        )
+        return page["id"] if page else None
+
+    def _find_entry(self, row: ImportRow) -> Optional[str]:
+        page = next(
+            self.timetrack.iter_query(
+                payload=notion.build_payload(
+                    CompoundFilter()._and(
+                        PropertyFilter.text("name", "title", "equals", row.category),
+                        PropertyFilter.date(
+                            "override_start",
+                            "date",
+                            "equals",
+                            row.start.astimezone(self.tz).isoformat(),
+                        ),
+                    )
+                ),
+                limit=1,
+                cache=False,
+            ),
+            None,
+        )
+        return page["id"] if page else None
+
+    def create(self, row: ImportRow) -> None:
+        rollup_id = self.checkpoint.rollups[str(self.day(row))]
+        properties = Properties(
+            DatePropertyValue("override_start", start=row.start.astimezone(self.tz)),
+            DatePropertyValue("override_end", start=row.end.astimezone(self.tz)),
+            CheckboxPropertyValue("stop", True),
+            RelationPropertyValue(f"rollup_{row.category}", [NotionUUID(rollup_id)]),
+        )
+        self._create(
+            lambda: notion.Page.create(
+                self.timetrack, page_title=row.category, properties=properties
+            ).id,
+            find=lambda: self._find_entry(row),
+        )
+
+    def _create(
+        self, create: Callable[[], _T], /, *, find: Callable[[], Optional[_T]]
+    ) -> _T:
+        """
+        Sends `create`, and sends it again after an error where Notion didn't save the page.
+        After an error where it may have, `find` looks for the page first,
+        and it's only sent again if it's not found.
+        """
+        for attempt in range(self.retries):
+            try:
+                return create()
+            except _NOT_SAVED_ERRORS:
+                time.sleep(2**attempt)
+            except _MAYBE_SAVED_ERRORS:
+                # waiting first, the page may not be returned by a query right away.
+                time.sleep(2**attempt)
+                found = find()
+                if found is not None:
+                    return found
+        return create()
+
+
+def import_timesheet(
+    path: Union[str, os.PathLike[str]],
+    /,
+    *,
+    timetrack: Optional[str] = None,
+    rollup: Optional[str] = None,
+    checkpoint: Optional[Union[str, os.PathLike[str]]] = None,
+    chunk_size: int = 1000,
+    workers: int = 3,
+    retries: int = 3,
+    tz: Optional[tzinfo] = None,
+) -> ImportResult:
+    """
+    Creates a timetrack page for every valid row in a CSV or Parquet file.
+    Rows that fail validation, or that Notion rejects, are skipped and returned in `failed`,
+    they're not saved in the checkpoint and are tried again by the next run.
+
+    ---
+    :param timetrack: (optional) timetrack database id, `NDB_TIMETRACK_ID` by default.
+    :param rollup: (optional) rollup database id, `NDB_ROLLUP_ID` by default.
+    :param checkpoint: (optional) JSON file to resume from and save progress to.
+    :param workers: (optional) number of creates sent at once.
+        requests still go through `_NotionClient.rate_limiter`, shared by every thread.
+    :param retries: (optional) attempts per create after rate limits, server errors,
+        or timeouts. after a timeout the page is looked for before it's sent again.
+    :param tz: (optional) timezone of the rollup dates, the local timezone by default.
+    """
+    if timetrack is None or rollup is None:
+        from bot.notionDBids import NDB_ROLLUP_ID
+        from bot.notionDBids import NDB_TIMETRACK_ID
+
+        timetrack = timetrack or NDB_TIMETRACK_ID
+        rollup = rollup or NDB_ROLLUP_ID
+
+    state = ImportCheckpoint(checkpoint, source=os.fspath(path))
+    importer = _Importer(
+        notion.Database(timetrack),
+        notion.Database(rollup),
+        state,
+        tz or get_localzone(),
+        retries,
+    )
+
+    created, skipped, failed = 0, 0, []
+    offset = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for batch in read_entries(path, chunk_size=chunk_size):
+            rows: list[ImportRow] = []
+            for row in _rows(batch, offset):
+                if not isinstance(row, ImportRow):
+                    failed.append(row)
+                elif row.index in state:
+                    skipped += 1
+                elif reason := importer.validate(row):
+                    failed.append((row.index, reason))
+                else:
+                    rows.append(row)
+            offset += batch.num_rows
+
+            importer.resolve_rollups({importer.day(row) for row in rows})
+            futures = {executor.submit(importer.create, row): row for row in rows}
+            try:
+                for future in as_completed(futures):
+                    try:
+                        future.result()
+                    except (_NotionErrors, requests.RequestException) as e:
+                        failed.append((futures[future].index, f"{e!r}"))
+                    else:
+                        created += 1
+            finally:
+                # if interrupted, the creates already sent are finished and saved,
+                # so they're not sent again when the import is resumed.
+                for future in futures:
+                    future.cancel()
+                wait(futures)
+                for future, row in futures.items():
+                    if not future.cancelled() and future.exception() is None:
+                        state.add(row.index)
+                state.save()
+
+            bot_logger.info(
+                f"Imported {created} entries from {path}, {skipped} skipped, {len(failed)} failed."
+            )
+
+    return ImportResult(created, skipped, sorted(failed))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Imports time entries to the timesheet."
+    )
+    parser.add_argument("path")
+    parser.add_argument("--checkpoint")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=3)
+    args = parser.parse_args()
+
+    result = import_timesheet(
+        args.path,
+        checkpoint=args.checkpoint,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+    )
+    print(
+        f"Created {result.created} entries, "
+        f"skipped {result.skipped} already imported, {len(result.failed)} failed."
+    )
+    for index, reason in result.failed:
+        print(f"  row {index}: {reason}")
+
+
+if __name__ == "__main__":
+    main()
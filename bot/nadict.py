@@ -3,11 +3,18 @@ from __future__ import annotations
 from typing import Any
 from typing import Optional
 from typing import Generator
-from typing import Generator
+from typing import Iterator
 from typing import Mapping
 from typing import Sequence
+from functools import lru_cache
+
+__all__: Sequence[str] = ["NAdict", "LazyNAdict"]
+
 
-__all__: Sequence[str] = ["NAdict"]
+@lru_cache(maxsize=4096)
+def _normalize(k: str) -> str:
+    # Notion property names repeat across every page, memoized across all instances.
+    return "".join([c if c.isalnum() else "_" for c in k]).lower()
 
 
 class NAdict(dict):
@@ -39,6 +46,8 @@ class NAdict(dict):
     # but you can choose to still access through multiple attributes for better readability.
     # Or you can choose to subscript as a normal dictionary.
     ```
+
+    The whole tree is flattened when created, see `LazyNAdict` to only resolve keys when accessed.
     """
 
     def __init__(self, map: Mapping[str, Any], *, sep: Optional[str] = None) -> None:
@@ -66,7 +75,7 @@ class NAdict(dict):
         d: Mapping[str, Any], parent_key: str, sep: str
     ) -> Generator[tuple[str, Any], tuple[str, dict[str, Any]], None]:
         for k, v in d.items():
-            k = "".join([c if c.isalnum() else "_" for c in k]).lower()
+            k = _normalize(k)
             new_key = parent_key + sep + k if parent_key else k
             if isinstance(v, dict):
                 yield from NAdict.fdict(v, new_key, sep=sep).items()
@@ -86,3 +95,100 @@ class NAdict(dict):
         d: Mapping[str, Any], parent_key: str = "", sep: str = "_"
     ) -> dict[str, Any]:
         return dict(NAdict._fdict_gen(d, parent_key, sep))
+
+
+_MISSING = object()
+
+
+class LazyNAdict(Mapping[str, Any]):
+    """
+    Same keys and values as `NAdict`, but nothing is flattened when created.
+    A flattened key is resolved against the original mapping when it's accessed,
+    and nested dictionaries are returned as `LazyNAdict` views of the same objects,
+    so the original mapping is the only copy kept.
+
+    Iterating, `len()`, `keys()`, and `items()` still walk the whole tree.
+
+    ```py
+    LazyNAdict(page.properties).name.title_0_text.content
+    ```
+    """
+
+    __slots__: Sequence[str] = ("_map", "_sep", "_resolved")
+
+    def __init__(self, map: Mapping[str, Any], *, sep: Optional[str] = None) -> None:
+        self._map = map
+        self._sep = sep if sep else "_"
+        self._resolved: dict[str, Any] = {}
+
+    def __getitem__(self, k: str) -> Any:
+        try:
+            return self._resolved[k]
+        except KeyError:
+            pass
+
+        v = self._resolve(self._map, k)
+        if v is _MISSING:
+            raise KeyError(k)
+        if isinstance(v, dict):
+            v = LazyNAdict(v)
+        self._resolved[k] = v
+        return v
+
+    def __getattr__(self, item: str) -> Any:
+        if item.startswith("__"):
+            raise AttributeError(item)
+        try:
+            return self[item]
+        except KeyError:
+            raise AttributeError(item)
+
+    def __contains__(self, k: object) -> bool:
+        return isinstance(k, str) and (
+            k in self._resolved or self._resolve(self._map, k) is not _MISSING
+        )
+
+    def __iter__(self) -> Iterator[str]:
+        # keys are unique in `NAdict.fdict`, the last duplicate replaces the first.
+        return iter(NAdict.fdict(self._map, sep=self._sep))
+
+    def __len__(self) -> int:
+        return len(NAdict.fdict(self._map, sep=self._sep))
+
+    def __bool__(self) -> bool:
+        return any(True for _ in NAdict._fdict_gen(self._map, "", self._sep))
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Mapping):
+            return dict(self.items()) == dict(other.items())
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self._map!r})"
+
+    def _resolve(self, d: Mapping[str, Any], k: str) -> Any:
+        """
+        Walks `d` along the keys that prefix `k`. If more than one key normalizes
+        to the same flattened key, the last one wins, same as `NAdict`.
+        """
+        found = _MISSING
+        for key, v in d.items():
+            key = _normalize(key)
+            if not k.startswith(key):
+                continue
+
+            rest = k[len(key) :]
+            if not rest:
+                # lists are only flattened to their indexed items in `NAdict`.
+                if not isinstance(v, list):
+                    found = v
+            elif isinstance(v, dict) and rest.startswith(self._sep):
+                v = self._resolve(v, rest[len(self._sep) :])
+                found = v if v is not _MISSING else found
+            elif isinstance(v, list) and rest.startswith("_"):
+                index, _, rest = rest[1:].partition(self._sep)
+                if index.isdigit() and int(index) < len(v) and rest:
+                    v = self._resolve(v[int(index)], rest)
+                    found = v if v is not _MISSING else found
+
+        return found
@@ -7,6 +7,7 @@ __all__: Sequence[str] = (
     "NDB_TIMETRACK_ID",
     "NDB_ROLLUP_ID",
     "NDB_SCHEDULE_ID",
+    "NDB_BOT_SCHEDULE_ID",
 )
 
 dotenv.load_dotenv()
@@ -15,3 +16,5 @@ NDB_TIMETRACK_ID = os.environ["NDB_TIMETRACK_ID"]
 NDB_ROLLUP_ID = os.environ["NDB_ROLLUP_ID"]
 NDB_OPTIONS_ID = os.environ["NDB_OPTIONS_ID"]
 NDB_SCHEDULE_ID = os.environ["NDB_SCHEDULE_ID"]
+# database of timeblock schedules, only used by `schedule-timeblocks`.
+NDB_BOT_SCHEDULE_ID = os.getenv("NDB_BOT_SCHEDULE_ID")
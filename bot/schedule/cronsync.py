@@ -1,6 +1,9 @@
 import os
+import asyncio
 import dotenv
+from typing import Any
 from typing import cast
+from typing import Optional
 from typing import Union
 from typing import Sequence
 from datetime import datetime
@@ -12,193 +15,289 @@ from apscheduler.triggers.cron import CronTrigger
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
 import notion
+import notion.properties as prop
 from notion.query import *
+from notion.api.mirror import MirrorEvent
 from notion.exceptions.errors import NotionValidationError
 from bot.groups import *
-from bot.nadict import NAdict
 from bot.utils import plugin
+from bot.utils import mention
+from bot.utils import respond
+from bot.startup import ready
+from bot.startup import requires
 from bot.schedule.scheduler import scheduler
+from bot.schedule.mirror import cron_mirror
+from bot.schedule.mirror import on_change
 from bot.schedule.reminders import DEFAULT_USER
 from bot.schedule.reminders import notion_block_reminder
 from bot.schedule.reminders import discord_reminder_channel_main
 
 __all__: Sequence[str] = ["sync_cron"]
 
+# a sync started from a command and one started by an edit in Notion don't run at once.
+_sync_lock = asyncio.Lock()
+
+_SYNC = notion.path("properties.sync.status.name", default="")
+_FLAGS = tuple(
+    notion.path(f"properties.{name}.checkbox", default=False)
+    for name in ("pause", "resume", "archive")
+)
+# sent at the end of each sync, one template per checkbox that's cleared once it's handled.
+_SYNCED = {
+    flag: notion.PayloadTemplate(
+        prop.Properties(
+            prop.StatusPropertyValue("sync", {"name": notion.Slot("status")}),
+            prop.DatePropertyValue("last_synced", start=notion.Slot("last_synced")),
+            prop.CheckboxPropertyValue(flag, False),
+        )
+    )
+    for flag in ("archive", "pause", "resume")
+}
+_ACTIVATED = notion.PayloadTemplate(
+    prop.Properties(
+        prop.StatusPropertyValue("sync", {"name": "active"}),
+        prop.DatePropertyValue("last_synced", start=notion.Slot("last_synced")),
+        prop.RichTextPropertyValue("job_id", [prop.RichText(notion.Slot("job_id"))]),
+        prop.RichTextPropertyValue(
+            "jobstore", [prop.RichText(notion.Slot("jobstore"))]
+        ),
+    )
+)
+_ROW_PROPERTIES = [
+    "sync",
+    "pause",
+    "resume",
+    "archive",
+    "job_id",
+    "cron_expression",
+    "message",
+    "function",
+]
+_CRON_PROPERTIES = {
+    "sync",
+    "pause",
+    "resume",
+    "archive",
+    "cron_expression",
+    "message",
+    "function",
+}
+
 
 async def _delete_synced_cron_jobs(
-    ctx: crescent.Context,
+    ctx: Optional[crescent.Context],
     scheduler: AsyncIOScheduler,
     job_id: str,
     page: notion.Page,
     dt_last_sync: datetime,
 ) -> None:
-    page.set_status("sync", "syncing")
+    await asyncio.to_thread(page.set_status, "sync", "syncing")
     scheduler.remove_job(job_id, jobstore="repeat")
-    page.set_status("sync", "archived")
-    page.set_checkbox("archive", False)
-    page.set_date("last_synced", dt_last_sync)
-    await ctx.respond(f"{ctx.user.mention} Archived page:`{page.id}` job: `{job_id}`")
+    await asyncio.to_thread(
+        page.apply, _SYNCED["archive"], status="archived", last_synced=dt_last_sync
+    )
+    await respond(ctx, f"{mention(ctx)} Archived page:`{page.id}` job: `{job_id}`")
 
 
 async def _pause_synced_cron_jobs(
-    ctx: crescent.Context,
+    ctx: Optional[crescent.Context],
     scheduler: AsyncIOScheduler,
     job_id: str,
     page: notion.Page,
     dt_last_sync: datetime,
 ) -> None:
-    page.set_status("sync", "syncing")
+    await asyncio.to_thread(page.set_status, "sync", "syncing")
     scheduler.pause_job(job_id, jobstore="repeat")
-    page.set_status("sync", "paused")
-    page.set_checkbox("pause", False)
-    page.set_date("last_synced", dt_last_sync)
-    await ctx.respond(
+    await asyncio.to_thread(
+        page.apply, _SYNCED["pause"], status="paused", last_synced=dt_last_sync
+    )
+    await respond(
+        ctx,
         "{}\n{}".format(
-            f"{ctx.user.mention} Paused job `{job_id}`",
+            f"{mention(ctx)} Paused job `{job_id}`",
             "No further run times will be calculated for it until the job is resumed.",
-        )
+        ),
     )
 
 
 async def _resume_paused_cron_jobs(
-    ctx: crescent.Context,
+    ctx: Optional[crescent.Context],
     scheduler: AsyncIOScheduler,
     job_id: str,
     page: notion.Page,
     dt_last_sync: datetime,
 ) -> None:
-    page.set_status("sync", "syncing")
+    await asyncio.to_thread(page.set_status, "sync", "syncing")
     scheduler.resume_job(job_id, jobstore="repeat")
-    page.set_status("sync", "active")
-    page.set_date("last_synced", dt_last_sync)
-    page.set_checkbox("resume", False)
-    await ctx.respond(f"{ctx.user.mention} Resuming page:`{page.id}` job: `{job_id}`")
+    await asyncio.to_thread(
+        page.apply, _SYNCED["resume"], status="active", last_synced=dt_last_sync
+    )
+    await respond(ctx, f"{mention(ctx)} Resuming page:`{page.id}` job: `{job_id}`")
+
+
+def _query_cron_rows() -> list[Any]:
+    if cron_mirror is None:
+        NDB_JOBSTORE_CRON = notion.Database(os.environ["NDB_JOBSTORE_CRON_ID"])
+    else:
+        NDB_JOBSTORE_CRON = cron_mirror.database
+    # iterating through every page, `query()` only returns the first 100 results.
+    return list(NDB_JOBSTORE_CRON.query_rows(_ROW_PROPERTIES))
 
 
 async def sync_crontasks_with_notion_db(
-    ctx: crescent.Context, user_name: Union[str, None] = DEFAULT_USER
+    ctx: Optional[crescent.Context], user_name: Union[str, None] = DEFAULT_USER
 ) -> None:
-    NDB_JOBSTORE_CRON = notion.Database(os.environ["NDB_JOBSTORE_CRON_ID"])
-    query = NDB_JOBSTORE_CRON.query()
+    # the first sync of the cron mirror can come before the jobstores are added.
+    if not await ready("scheduler"):
+        await respond(ctx, "Failed to add the scheduler's jobstores, not syncing.")
+        return
+
+    if cron_mirror is not None and cron_mirror.ready:
+        # only pages edited since the last sync are requested.
+        await asyncio.to_thread(cron_mirror.sync)
+        rows = cron_mirror.rows(_ROW_PROPERTIES)
+    else:
+        rows = await asyncio.to_thread(_query_cron_rows)
+
+    for row in rows:
+        page = notion.Page(row.id)
+
+        dt_last_sync = cast("datetime", datetime.now().astimezone(page.tz).isoformat())
+
+        synced = row.sync or ""
+        pause = row.pause
+        resume = row.resume
+        delete = row.archive
+
+        if (
+            "active" in synced
+            and not any([delete, pause, resume])
+            or "archived" in synced
+        ):
+            pass
 
-    if query.get("results") != []:
-        page_ids = [r["id"] for r in query.get("results", [])]
-        for id in page_ids:
-            page = notion.Page(id)
+        elif "active" in synced and delete:
+            await _delete_synced_cron_jobs(
+                ctx=ctx,
+                scheduler=scheduler,
+                job_id=str(row.job_id),
+                page=page,
+                dt_last_sync=dt_last_sync,
+            )
+
+        elif "active" in synced and pause:
+            await _pause_synced_cron_jobs(
+                ctx=ctx,
+                scheduler=scheduler,
+                job_id=str(row.job_id),
+                page=page,
+                dt_last_sync=dt_last_sync,
+            )
 
-            dt_last_sync = cast(
-                "datetime", datetime.now().astimezone(page.tz).isoformat()
+        elif "paused" in synced and resume:
+            await _resume_paused_cron_jobs(
+                ctx=ctx,
+                scheduler=scheduler,
+                job_id=str(row.job_id),
+                page=page,
+                dt_last_sync=dt_last_sync,
             )
 
-            _page = NAdict(page.properties)
-            synced = _page.sync.status.name
-            pause = _page.pause.checkbox
-            resume = _page.resume.checkbox
-            delete = _page.archive.checkbox
-
-            if (
-                "active" in synced
-                and not any([delete, pause, resume])
-                or "archived" in synced
-            ):
-                pass
-
-            elif "active" in synced and delete:
-                await _delete_synced_cron_jobs(
-                    ctx=ctx,
-                    scheduler=scheduler,
-                    job_id=str(_page.job_id.rich_text_0_text.content),
-                    page=page,
-                    dt_last_sync=dt_last_sync,
+        elif "queued" in synced and not any([delete, pause, resume]):
+            try:
+                await asyncio.to_thread(page.set_status, "sync", "syncing")
+
+                crontab = row.cron_expression
+                message = row.message
+                function_name = row.function or ""
+
+                if crontab is None or message is None:
+                    raise AttributeError("missing `cron_expression` or `message`.")
+
+                if "notion" in function_name:
+                    reminder_function = notion_block_reminder
+                    fkwargs = {
+                        "page_id": page.id,
+                        "user_name": user_name,
+                        "message": message,
+                    }
+
+                elif "discord" in function_name:
+                    reminder_function = discord_reminder_channel_main
+                    fkwargs = {"message": message}
+
+                else:
+                    error = f"`{page.__repr__()}` is missing a function to call."
+                    await respond(ctx, error)
+                    raise NotionValidationError(error)
+
+                trigger = CronTrigger.from_crontab(
+                    crontab, timezone=tzlocal.get_localzone()
+                )
+
+                job = scheduler.add_job(
+                    reminder_function,
+                    trigger=trigger,
+                    name=message,
+                    jobstore="repeat",
+                    executor="repeat",
+                    kwargs=fkwargs,
+                    misfire_grace_time=60,
                 )
 
-            elif "active" in synced and pause:
-                await _pause_synced_cron_jobs(
-                    ctx=ctx,
-                    scheduler=scheduler,
-                    job_id=str(_page.job_id.rich_text_0_text.content),
-                    page=page,
-                    dt_last_sync=dt_last_sync,
+                await asyncio.to_thread(
+                    page.apply,
+                    _ACTIVATED,
+                    last_synced=dt_last_sync,
+                    job_id=job.id,
+                    jobstore=f"{scheduler._jobstores[job._jobstore_alias]}",
                 )
 
-            elif "paused" in synced and resume:
-                await _resume_paused_cron_jobs(
-                    ctx=ctx,
-                    scheduler=scheduler,
-                    job_id=str(_page.job_id.rich_text_0_text.content),
-                    page=page,
-                    dt_last_sync=dt_last_sync,
+                await respond(
+                    ctx, f"Set `{page.__repr__()}` to active. Job ID: `{job.id}`"
                 )
 
-            elif "queued" in synced and not any([delete, pause, resume]):
-                try:
-                    page.set_status("sync", "syncing")
-
-                    crontab = _page.cron_expression.title_0_text.content
-                    message = _page.message.rich_text_0_text.content
-                    function_name = _page.function.select.name
-
-                    if "notion" in function_name:
-                        reminder_function = notion_block_reminder
-                        fkwargs = {
-                            "page_id": page.id,
-                            "user_name": user_name,
-                            "message": message,
-                        }
-
-                    elif "discord" in function_name:
-                        reminder_function = discord_reminder_channel_main
-                        fkwargs = {"message": message}
-
-                    else:
-                        error = f"`{page.__repr__()}` is missing a function to call."
-                        await ctx.respond(error)
-                        raise NotionValidationError(error)
-
-                    trigger = CronTrigger.from_crontab(
-                        crontab, timezone=tzlocal.get_localzone()
-                    )
-
-                    job = scheduler.add_job(
-                        reminder_function,
-                        trigger=trigger,
-                        name=message,
-                        jobstore="repeat",
-                        executor="repeat",
-                        kwargs=fkwargs,
-                        misfire_grace_time=60,
-                    )
-
-                    page.set_status("sync", "active")
-                    page.set_date("last_synced", dt_last_sync)
-                    page.set_text("job_id", job.id)
-                    page.set_text(
-                        "jobstore", f"{scheduler._jobstores[job._jobstore_alias]}"
-                    )
-
-                    await ctx.respond(
-                        f"Set `{page.__repr__()}` to active. Job ID: `{job.id}`"
-                    )
-
-                except AttributeError:
-                    page.set_status("sync", "queued")
-                    await ctx.respond(
-                        "{} {} {}\n{} {}".format(
-                            f"Failed to schedule reminder from",
-                            f"`{NDB_JOBSTORE_CRON.__repr__()}`",
-                            f" for `{page.__repr__()}`",
-                            f"Check to see if `cron_expression` and `message` are filled out,",
-                            "and that neither of them contain any mentions.",
-                        ),
-                        ephemeral=True,
-                    )
-            else:
-                pass
+            except AttributeError:
+                await asyncio.to_thread(page.set_status, "sync", "queued")
+                await respond(
+                    ctx,
+                    "{} {} {}\n{} {}".format(
+                        f"Failed to schedule reminder from",
+                        "`NDB_JOBSTORE_CRON`",
+                        f" for `{page.__repr__()}`",
+                        f"Check to see if `cron_expression` and `message` are filled out,",
+                        "and that neither of them contain any mentions.",
+                    ),
+                    ephemeral=True,
+                )
+        else:
+            pass
 
 
 @plugin.include
+@crescent.hook(requires("scheduler"))
 @crescent.user_command(name="sync-cron")
 async def sync_cron(ctx: crescent.Context, user: hikari.User):
     await ctx.defer()
-    await sync_crontasks_with_notion_db(ctx=ctx)
+    async with _sync_lock:
+        await sync_crontasks_with_notion_db(ctx=ctx)
     await ctx.respond("Sync with `NDB_JOBSTORE_CRON` complete.", ephemeral=True)
+
+
+def _needs_sync(event: MirrorEvent) -> bool:
+    # only edits to the properties a sync reads, so the bot's own updates
+    # to `last_synced`, `job_id`, etc. don't start another sync.
+    if event.type == "archived" or (
+        event.type == "changed" and not _CRON_PROPERTIES & event.changes.keys()
+    ):
+        return False
+    return "queued" in _SYNC(event.page) or any(flag(event.page) for flag in _FLAGS)
+
+
+if cron_mirror is not None:
+    # syncing as soon as a page is queued, paused, resumed, or archived in Notion.
+    @on_change(cron_mirror)
+    async def sync_cron_on_change(events: Sequence[MirrorEvent]) -> None:
+        if any(_needs_sync(e) for e in events):
+            async with _sync_lock:
+                await sync_crontasks_with_notion_db(ctx=None)
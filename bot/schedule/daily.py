@@ -1,4 +1,5 @@
 import os
+import asyncio
 from datetime import datetime
 
 from crescent.ext import tasks
@@ -10,6 +11,10 @@ from bot.utils import plugin
 @plugin.include
 @tasks.cronjob("10 0 * * *")
 async def daily_rollup_page() -> None:
+    await asyncio.to_thread(_create_rollup_page)
+
+
+def _create_rollup_page() -> None:
     # rollup page that time entries will relate to for totals.
     new_rollup_page = notion.Page.create(
         notion.Database(os.environ["NDB_ROLLUP_ID"]),
@@ -1,12 +1,12 @@
 import os
 import uuid
+from typing import Optional
 from typing import Sequence
 from datetime import datetime
 
 import crescent
-import dateparser
-from dateparser.conf import SettingValidationError
 
+from apscheduler.job import Job
 from apscheduler.triggers.date import DateTrigger
 from apscheduler.jobstores.base import JobLookupError
 
@@ -14,6 +14,8 @@ import notion
 from notion.query import *
 from bot.groups import *
 from bot.utils import plugin
+from bot.startup import requires
+from bot.deferred import run_blocking
 from bot.schedule.scheduler import scheduler
 from bot.schedule.bqstore import store_serialized_page
 from bot.schedule.bqstore import BQ_CACHE_TABLE_ID
@@ -31,8 +33,40 @@ __all__: Sequence[str] = (
 )
 
 
+def _parse_date(text: str) -> Optional[datetime]:
+    """
+    Raises `ValueError` or `TypeError` (`dateparser.conf.SettingValidationError` is a `ValueError`).
+    `dateparser` is imported on first use, in a worker thread, it takes ~0.2 s to import.
+    """
+    import dateparser
+
+    return dateparser.parse(
+        text,
+        settings={
+            "RELATIVE_BASE": datetime.now(),
+            "PREFER_DATES_FROM": "future",
+        },
+    )
+
+
+def _reminder_page(job: Job, title: str, status: str) -> notion.Page:
+    """A page in the reminders database with the job's info, for reference."""
+    page = notion.Page.create(
+        notion.Database(os.environ["NDB_JOBSTORE_REMINDERS_ID"]),
+        page_title=title,
+    )
+    page.set_text("job_id", job.id)
+    page.set_status("reminder_status", status)
+    page.set_date(
+        "next_run_time",
+        datetime.fromisoformat(str(job.next_run_time)).astimezone(page.tz),
+    )
+    return page
+
+
 @plugin.include
 @reminder.child
+@crescent.hook(requires("scheduler"))
 @crescent.command(
     name="in-notion",
     description="Creates a reminder page in `bot.apscheduler.reminders`",
@@ -50,15 +84,9 @@ class NotionDbColReminder:
         await ctx.respond(f"{ctx.user.mention} Scheduling job..", ephemeral=True)
 
         try:
-            date_trigger = dateparser.parse(
-                self.date,
-                settings={
-                    "RELATIVE_BASE": datetime.now(),
-                    "PREFER_DATES_FROM": "future",
-                },
-            )
+            date_trigger = await run_blocking(_parse_date, self.date)
 
-        except (ValueError, TypeError, SettingValidationError) as e:
+        except (ValueError, TypeError) as e:
             await ctx.edit(f"{ctx.user.mention} An error was raised: {e}")
 
         bq_id = str(uuid.uuid4())
@@ -78,18 +106,10 @@ class NotionDbColReminder:
 
         # Creates a page containing the job info for reference.
         # Reminder will trigger in this page at job runtime.
-        page = notion.Page.create(
-            notion.Database(os.environ["NDB_JOBSTORE_REMINDERS_ID"]),
-            page_title=self.message,
-        )
-        page.set_text("job_id", job.id)
-        page.set_status("reminder_status", "awaiting")
-        page.set_date(
-            "next_run_time",
-            datetime.fromisoformat(str(job.next_run_time)).astimezone(page.tz),
-        )
+        page = await run_blocking(_reminder_page, job, self.message, "awaiting")
         # At job runtime, page object will be retrieved from store.
-        store_serialized_page(
+        await run_blocking(
+            store_serialized_page,
             _object=page,
             table_id=BQ_CACHE_TABLE_ID,
             job_id=job.id,
@@ -101,6 +121,7 @@ class NotionDbColReminder:
 
 @plugin.include
 @reminder.child
+@crescent.hook(requires("scheduler"))
 @crescent.command(
     name="in-discord",
     description="Sends a webhook with the reminder in the channel `main`.",
@@ -113,15 +134,9 @@ class DiscordReminderChannelMain:
         await ctx.respond(f"{ctx.user.mention} Scheduling job..", ephemeral=True)
 
         try:
-            date_trigger = dateparser.parse(
-                self.date,
-                settings={
-                    "RELATIVE_BASE": datetime.now(),
-                    "PREFER_DATES_FROM": "future",
-                },
-            )
+            date_trigger = await run_blocking(_parse_date, self.date)
 
-        except (ValueError, TypeError, SettingValidationError) as e:
+        except (ValueError, TypeError) as e:
             await ctx.edit(f"{ctx.user.mention} An error was raised: {e}")
 
         job = scheduler.add_job(
@@ -137,20 +152,12 @@ class DiscordReminderChannelMain:
 
         await ctx.edit(f"{ctx.user.mention} Scheduled Job: \n`{job.__str__()}`.")
 
-        page = notion.Page.create(
-            notion.Database(os.environ["NDB_JOBSTORE_REMINDERS_ID"]),
-            page_title=self.message,
-        )
-        page.set_text("job_id", job.id)
-        page.set_status("reminder_status", "sending in discord")
-        page.set_date(
-            "next_run_time",
-            datetime.fromisoformat(str(job.next_run_time)).astimezone(page.tz),
-        )
+        await run_blocking(_reminder_page, job, self.message, "sending in discord")
 
 
 @plugin.include
 @jobstores.child
+@crescent.hook(requires("scheduler"))
 @crescent.command(name="get-all-jobs", description="Search for all jobs in a jobstore.")
 class GetAllJobs:
     jobstore = crescent.option(
@@ -180,6 +187,7 @@ class GetAllJobs:
 
 @plugin.include
 @jobstores.child
+@crescent.hook(requires("scheduler"))
 @crescent.command(name="get-job", description="Search a jobstore for a job ID.")
 class GetJob:
     jobstore = crescent.option(
@@ -209,6 +217,7 @@ class GetJob:
 
 @plugin.include
 @jobstores.child
+@crescent.hook(requires("scheduler"))
 @crescent.command(name="remove-job")
 class RemoveJob:
     jobstore = crescent.option(
@@ -230,6 +239,7 @@ class RemoveJob:
 
 @plugin.include
 @jobstores.child
+@crescent.hook(requires("scheduler"))
 @crescent.command(name="pause-job")
 class PauseJob:
     jobstore = crescent.option(
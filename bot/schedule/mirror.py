@@ -0,0 +1,140 @@
+import os
+import asyncio
+import dotenv
+from collections import deque
+from typing import Any
+from typing import Callable
+from typing import Coroutine
+from typing import Optional
+from typing import Sequence
+
+import requests
+from crescent.ext import tasks
+
+import notion
+from notion.api.mirror import MirrorEvent
+from notion.exceptions.errors import _NotionErrors
+from bot.notionDBids import *
+from bot.utils import plugin
+from bot import bot_logger
+
+__all__: Sequence[str] = (
+    "timetrack_mirror",
+    "rollup_mirror",
+    "options_mirror",
+    "cron_mirror",
+    "bot_schedule_mirror",
+    "mirrors",
+    "on_change",
+    "sync_mirrors",
+    "log_query_cache_stats",
+)
+
+dotenv.load_dotenv()
+
+# Local copies of the databases the bot reads from, see `notion.DatabaseMirror`.
+# Until a mirror's first sync completes (`mirror.ready`), reads go to Notion.
+NOTION_MIRROR_INTERVAL = float(os.getenv("NOTION_MIRROR_INTERVAL", 15))
+# Mirrors are kept in SQLite between restarts when a path is set, otherwise in memory.
+NOTION_MIRROR_PATH = os.getenv("NOTION_MIRROR_PATH")
+# Seconds to cache query results for the rollup and options databases, 0 to disable.
+# Writes from the bot drop them right away, edits in Notion are seen after the TTL.
+NOTION_QUERY_CACHE_TTL = float(os.getenv("NOTION_QUERY_CACHE_TTL", 30))
+
+# both have rollups of the timetrack database, so writes to timers drop them too.
+for _database_id in (NDB_ROLLUP_ID, NDB_OPTIONS_ID):
+    notion.Database.query_cache.set_ttl(
+        _database_id, NOTION_QUERY_CACHE_TTL, depends_on=[NDB_TIMETRACK_ID]
+    )
+
+
+NDB_JOBSTORE_CRON_ID = os.getenv("NDB_JOBSTORE_CRON_ID")
+
+
+def _mirror(database_id: str, name: str) -> notion.DatabaseMirror:
+    store = (
+        notion.SQLiteMirrorStore(NOTION_MIRROR_PATH, name)
+        if NOTION_MIRROR_PATH
+        else None
+    )
+    return notion.DatabaseMirror(database_id, store=store)
+
+
+timetrack_mirror = _mirror(NDB_TIMETRACK_ID, "timetrack")
+rollup_mirror = _mirror(NDB_ROLLUP_ID, "rollup")
+options_mirror = _mirror(NDB_OPTIONS_ID, "options")
+# read with `getenv`, so the timer plugins still load without it,
+# `sync_crontasks_with_notion_db` requires it when it runs.
+cron_mirror: Optional[notion.DatabaseMirror] = (
+    _mirror(NDB_JOBSTORE_CRON_ID, "cron") if NDB_JOBSTORE_CRON_ID else None
+)
+bot_schedule_mirror: Optional[notion.DatabaseMirror] = (
+    _mirror(NDB_BOT_SCHEDULE_ID, "bot_schedule") if NDB_BOT_SCHEDULE_ID else None
+)
+
+mirrors: tuple[notion.DatabaseMirror, ...] = tuple(
+    m
+    for m in (
+        timetrack_mirror,
+        rollup_mirror,
+        options_mirror,
+        cron_mirror,
+        bot_schedule_mirror,
+    )
+    if m is not None
+)
+
+EventHandler = Callable[[Sequence[MirrorEvent]], Coroutine[Any, Any, None]]
+
+# events are sent by mirrors in the thread that synced them,
+# and are handled on the event loop after each `sync_mirrors`.
+_pending: deque[tuple[EventHandler, Sequence[MirrorEvent]]] = deque()
+_running: set[asyncio.Task[None]] = set()
+
+
+def on_change(mirror: notion.DatabaseMirror) -> Callable[[EventHandler], EventHandler]:
+    """
+    Runs the decorated coroutine function with the events of every change to `mirror`,
+    i.e. pages added, changed, or archived in Notion, or by the bot.
+    The first sync of a mirror sends every page in the database as `added`.
+    """
+
+    def decorator(handler: EventHandler) -> EventHandler:
+        mirror.subscribe(lambda events: _pending.append((handler, events)))
+        return handler
+
+    return decorator
+
+
+async def _handle(handler: EventHandler, events: Sequence[MirrorEvent]) -> None:
+    try:
+        await handler(events)
+    except (Exception, _NotionErrors) as e:
+        bot_logger.info(f"Error handling mirror events in {handler.__name__}: {e!r}")
+
+
+@plugin.include
+@tasks.loop(seconds=NOTION_MIRROR_INTERVAL)
+async def sync_mirrors() -> None:
+    # synced in a thread, so a slow Notion doesn't block the gateway.
+    for mirror in mirrors:
+        try:
+            await asyncio.to_thread(mirror.sync)
+        except (_NotionErrors, requests.RequestException) as e:
+            bot_logger.info(f"Failed to sync {mirror.__repr__()}: {e!r}")
+
+    # handlers run as tasks, so a slow handler doesn't delay the next sync.
+    while _pending:
+        task = asyncio.create_task(_handle(*_pending.popleft()))
+        _running.add(task)
+        task.add_done_callback(_running.discard)
+
+
+@plugin.include
+@tasks.loop(hours=1)
+async def log_query_cache_stats() -> None:
+    stats = notion.Database.query_cache.stats()
+    bot_logger.info(
+        f"Query cache: {stats.hits} hits, {stats.misses} misses, "
+        f"hit rate {stats.hit_rate:.1%}."
+    )
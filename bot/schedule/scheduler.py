@@ -2,15 +2,14 @@ import os
 import dotenv
 from typing import Sequence
 
-from sqlalchemy.engine import create_engine
 from apscheduler.executors.pool import ThreadPoolExecutor
 from apscheduler.executors.pool import ProcessPoolExecutor
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
 
 from bot.utils import plugin
+from bot.startup import warmup
 
-__all__: Sequence[str] = ["scheduler"]
+__all__: Sequence[str] = ["scheduler", "add_jobstores"]
 
 dotenv.load_dotenv()
 
@@ -25,29 +24,33 @@ BQDATASET_APSCHEDULER_REPEATED = os.environ["BQDATASET_APSCHEDULER_REPEATED"]
 
 GOOGLE_APPLICATION_CREDENTIALS = os.environ["GOOGLE_APPLICATION_CREDENTIALS"]
 
-BQ_ENGINE_REMINDERS = create_engine(
-    BQDATASET_APSCHEDULER_REMINDERS,
-    credentials_path=GOOGLE_APPLICATION_CREDENTIALS,
-)
-
-BQ_ENGINE_REPEAT = create_engine(
-    BQDATASET_APSCHEDULER_REPEATED,
-    credentials_path=GOOGLE_APPLICATION_CREDENTIALS,
-)
-
 # main jobstore for one-time reminders, repeat jobstore for cron database.
+# they're added after the bot connects, see `add_jobstores`,
+# commands that use them are stopped until then by `bot.startup.requires("scheduler")`.
 scheduler = AsyncIOScheduler(
-    jobstores={
-        "main": SQLAlchemyJobStore(
-            engine=BQ_ENGINE_REMINDERS, tablename=BQ_TABLE_REMINDERS
-        ),
-        "repeat": SQLAlchemyJobStore(
-            engine=BQ_ENGINE_REPEAT, tablename=BQ_TABLE_REPEATED
-        ),
-    },
     executors={
         "main": ThreadPoolExecutor(20),
         "repeat": ThreadPoolExecutor(20),
         "processpool": ProcessPoolExecutor(10),
     },
 )
+
+
+@warmup("scheduler")
+def add_jobstores() -> None:
+    # creating the engines, and the jobstore tables if they don't exist, in a thread.
+    # SQLAlchemy and the BigQuery dialect are only imported here.
+    from sqlalchemy.engine import create_engine
+    from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+
+    for alias, dataset, table in (
+        ("main", BQDATASET_APSCHEDULER_REMINDERS, BQ_TABLE_REMINDERS),
+        ("repeat", BQDATASET_APSCHEDULER_REPEATED, BQ_TABLE_REPEATED),
+    ):
+        # added by an earlier attempt, if the other one failed.
+        if alias in scheduler._jobstores:
+            continue
+        engine = create_engine(dataset, credentials_path=GOOGLE_APPLICATION_CREDENTIALS)
+        scheduler.add_jobstore(
+            SQLAlchemyJobStore(engine=engine, tablename=table), alias=alias
+        )
@@ -2,24 +2,34 @@ import re
 from typing import Union
 from typing import Sequence
 from typing import Any
+from typing import Optional
 
 from dateutil import rrule
 from datetime import datetime
 from operator import methodcaller
 from dateutil.relativedelta import relativedelta
 import json
+import asyncio
 
 import crescent
 
 import notion
 from notion.query import *
+from notion.api.mirror import MirrorEvent
 
 from bot.groups import *
-from bot.nadict import NAdict
+from bot.nadict import LazyNAdict
 from bot.notionDBids import *
 from bot.utils import plugin
+from bot.utils import respond
+from bot.schedule.mirror import on_change
+from bot.schedule.mirror import bot_schedule_mirror
 
-__all__: Sequence[str] = ["schedule_timeblocks"]
+__all__: Sequence[str] = ["schedule_timeblocks", "build_timeblocks"]
+
+_build_lock = asyncio.Lock()
+
+_STATUS = notion.path("properties.status.status.name")
 
 
 @plugin.include
@@ -29,7 +39,11 @@ __all__: Sequence[str] = ["schedule_timeblocks"]
 )
 async def schedule_timeblocks(ctx: crescent.Context) -> None:
     await ctx.defer()
+    async with _build_lock:
+        await build_timeblocks(ctx)
+
 
+def _scheduled_pages() -> tuple[notion.Database, list[dict[str, Any]]]:
     scheduler = notion.Database(NDB_BOT_SCHEDULE_ID)
     query = scheduler.query(
         payload=notion.build_payload(
@@ -38,31 +52,63 @@ async def schedule_timeblocks(ctx: crescent.Context) -> None:
         ),
         filter_property_values=["name"],
     )
-    query_result = query.get("results", [])
+    return scheduler, query.get("results", [])
+
+
+def _create_timeblock(
+    schedule: notion.Database,
+    name: str,
+    d: tuple[datetime, ...],
+    page_content: LazyNAdict,
+) -> Optional[str]:
+    """Creates one timeblock, and returns an error if its page arguments couldn't be set."""
+    timeblock = notion.Page.create(schedule, page_title=str(name))
+    timeblock.set_date(
+        "date",
+        start=d[0].astimezone(timeblock.tz),
+        end=d[1].astimezone(timeblock.tz),
+    )
+
+    try:
+        page_args = json.loads(
+            str(page_content.results_0_code.rich_text_0_text.content)
+        )
+        for a in page_args:
+            arg_method = methodcaller(f"set_{page_args[a][0]}", a, page_args[a][1])
+            arg_method(timeblock)
+    except AttributeError as e:
+        return f"Error in {timeblock.__repr__()}: {e}"
+    return None
+
+
+async def build_timeblocks(ctx: Optional[crescent.Context]) -> None:
+    # Notion is called in threads, so a build doesn't block the gateway.
+    scheduler, query_result = await asyncio.to_thread(_scheduled_pages)
 
     if not query_result:
-        await ctx.respond(
+        await respond(
+            ctx,
             "{} {}".format(
                 "Did not find any timeblocks scheduled to run in",
                 f"{scheduler.__repr__()}",
-            )
+            ),
         )
 
     else:
-        schedule = notion.Database(NDB_SCHEDULE_ID)
+        schedule = await asyncio.to_thread(notion.Database, NDB_SCHEDULE_ID)
 
         for page in query_result:
             _page = notion.Page(page["id"])
-            _page.set_status("status", "building..")
-            properties = _page.properties
-            nproperties = NAdict(properties, sep=".")
+            await asyncio.to_thread(_page.set_status, "status", "building..")
+            properties = await asyncio.to_thread(getattr, _page, "properties")
+            nproperties = LazyNAdict(properties, sep=".")
 
             if not nproperties.rrule_freq:
                 error = "{} {}".format(
                     "missing 1 required positional argument: 'freq'",
                     f"in {_page.__repr__()}",
                 )
-                await ctx.respond(error)
+                await respond(ctx, error)
                 raise ValueError(error)
 
             rules: rrule.rrule = rrule.rrule(**_map_rrule(nproperties))
@@ -73,39 +119,42 @@ async def schedule_timeblocks(ctx: crescent.Context) -> None:
             dates: list[tuple[datetime, ...]] = [d for d in zip(ndt_start, ndt_end)]
             name: str = str(nproperties.name.title_0_text.content)
 
-            page_content = NAdict(_page.retrieve_page_content())
+            page_content = LazyNAdict(
+                await asyncio.to_thread(_page.retrieve_page_content)
+            )
 
             for d in dates:
-                timeblock = notion.Page.create(schedule, page_title=str(name))
-                timeblock.set_date(
-                    "date",
-                    start=d[0].astimezone(timeblock.tz),
-                    end=d[1].astimezone(timeblock.tz),
+                error = await asyncio.to_thread(
+                    _create_timeblock, schedule, name, d, page_content
                 )
+                if error:
+                    await respond(ctx, error)
+
+            await asyncio.to_thread(_page.set_status, "status", "complete")
+            await asyncio.to_thread(
+                _page.set_date, "last_run", datetime.now().astimezone(_page.tz)
+            )
 
-                try:
-                    page_args = json.loads(
-                        str(page_content.results_0_code.rich_text_0_text.content)
-                    )
-                    for a in page_args:
-                        arg_method = methodcaller(
-                            f"set_{page_args[a][0]}", a, page_args[a][1]
-                        )
-                        arg_method(timeblock)
-                except AttributeError as e:
-                    await ctx.respond(f"Error in {timeblock.__repr__()}: {e}")
+        await respond(ctx, f"Sync with schedule `{scheduler.__repr__()}` complete.")
 
-            _page.set_status("status", "complete")
-            _page.set_date("last_run", datetime.now().astimezone(_page.tz))
 
-        await ctx.respond(f"Sync with schedule `{scheduler.__repr__()}` complete.")
+if bot_schedule_mirror is not None:
+    # building as soon as a schedule is set to `build next sync` in Notion.
+    @on_change(bot_schedule_mirror)
+    async def build_timeblocks_on_change(events: Sequence[MirrorEvent]) -> None:
+        if any(
+            e.type != "archived" and _STATUS(e.page) == "build next sync"
+            for e in events
+        ):
+            async with _build_lock:
+                await build_timeblocks(None)
 
 
 def _extract_dt(d: dict, path: str) -> Union[datetime, None]:
     return datetime.fromisoformat(dtstart) if (dtstart := d.get(path)) else None
 
 
-def _map_rrule(properties: NAdict) -> dict[str, Any]:
+def _map_rrule(properties: LazyNAdict) -> dict[str, Any]:
     freq = properties.get("rrule_freq.select.name")
     count = properties.get("rrule_count.number")
     dtstart = _extract_dt(properties, "rrule_dtstart.date.start")
@@ -146,7 +195,7 @@ def _map_rrule(properties: NAdict) -> dict[str, Any]:
     return {k: v for k, v in rrule_kwargs.items() if v is not None}
 
 
-def _map_relativedelta(properties: NAdict) -> dict[str, str]:
+def _map_relativedelta(properties: LazyNAdict) -> dict[str, str]:
     days = properties.get("relativedelta_days.number")
     hours = properties.get("relativedelta_hours.number")
     minutes = properties.get("relativedelta_minutes.number")
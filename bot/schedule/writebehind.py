@@ -0,0 +1,146 @@
+import os
+import asyncio
+import dotenv
+from typing import Sequence
+from typing import Optional
+from datetime import datetime
+
+import crescent
+from crescent.ext import tasks
+
+import notion
+from notion.api.journal import JournalEntry
+from bot.groups import *
+from bot.utils import plugin
+from bot import bot_logger
+
+__all__: Sequence[str] = (
+    "write_behind",
+    "replay_write_behind",
+    "GetAllEntries",
+    "GetEntry",
+    "RemoveEntry",
+    "RetryEntry",
+)
+
+dotenv.load_dotenv()
+
+# Write-behind is only enabled when a path for the journal is set,
+# otherwise pages are updated in Notion directly.
+NOTION_JOURNAL_PATH = os.getenv("NOTION_JOURNAL_PATH")
+
+write_behind: Optional[notion.WriteJournal] = (
+    notion.WriteJournal(NOTION_JOURNAL_PATH) if NOTION_JOURNAL_PATH else None
+)
+
+
+@plugin.include
+@tasks.loop(seconds=10)
+async def replay_write_behind() -> None:
+    # replayed in a thread, so a slow Notion, or the journal's fsyncs,
+    # don't block the gateway.
+    if write_behind is None:
+        return
+    completed = await asyncio.to_thread(_replay, write_behind)
+    if completed is not None:
+        bot_logger.info(f"Replayed {completed} journal entries to Notion.")
+
+
+def _replay(journal: notion.WriteJournal) -> Optional[int]:
+    if not journal.pending(limit=1):
+        return None
+    completed = journal.replay()
+    journal.purge(older_than=86400)
+    return completed
+
+
+def _entry_details(entry: JournalEntry) -> str:
+    return "{}\n{}\n{}\n{}\n{}\n\n".format(
+        f"Entry: {entry.seq} ({entry.status})",
+        f"Request: {entry.method} {entry.url}",
+        f"Payload: {entry.payload.decode()[:300]}",
+        f"Attempts: {entry.attempts} Last error: {entry.last_error}",
+        f"Created: {datetime.fromtimestamp(entry.created_at)}",
+    )
+
+
+@plugin.include
+@journal.child
+@crescent.command(
+    name="get-all-entries",
+    description="Search for entries in the write-behind journal.",
+)
+class GetAllEntries:
+    status = crescent.option(
+        str,
+        name="status",
+        description="Choose which entries to search.",
+        choices=[("pending", "pending"), ("failed", "failed"), ("done", "done")],
+    )
+
+    async def callback(self, ctx: crescent.Context):
+        await ctx.respond(f"{ctx.user.mention} Searching journal..", ephemeral=True)
+
+        if write_behind is None:
+            await ctx.edit(f"{ctx.user.mention} Write-behind is not enabled.")
+            return
+
+        entries = write_behind.entries(status=self.status, limit=5)
+
+        if not entries:
+            await ctx.edit(f"{ctx.user.mention} No entries found in journal.")
+        else:
+            # Discord caps message at 2000 characters, only showing the oldest entries.
+            all_entry_details = "".join(_entry_details(e) for e in entries)
+            await ctx.edit(f"{ctx.user.mention}\n```{all_entry_details[:1900]}```")
+
+
+@plugin.include
+@journal.child
+@crescent.command(name="get-entry", description="Search the journal for an entry.")
+class GetEntry:
+    seq = crescent.option(int, name="entry", description="Entry number in journal.")
+
+    async def callback(self, ctx: crescent.Context):
+        await ctx.respond(f"{ctx.user.mention} Searching for entry..", ephemeral=True)
+
+        entry = write_behind.get(self.seq) if write_behind is not None else None
+
+        if not entry:
+            await ctx.edit(f"{ctx.user.mention} Entry not found.")
+        else:
+            await ctx.edit(f"{ctx.user.mention}\n```{_entry_details(entry)[:1900]}```")
+
+
+@plugin.include
+@journal.child
+@crescent.command(name="remove-entry")
+class RemoveEntry:
+    seq = crescent.option(int, name="entry", description="Entry number to remove.")
+
+    async def callback(self, ctx: crescent.Context):
+        await ctx.respond(f"{ctx.user.mention} Searching journal..", ephemeral=True)
+
+        if write_behind is not None and write_behind.remove(self.seq):
+            await ctx.edit(f"{ctx.user.mention} Removed entry `{self.seq}`")
+        else:
+            await ctx.edit(f"{ctx.user.mention} Entry `{self.seq}` not found.")
+
+
+@plugin.include
+@journal.child
+@crescent.command(name="retry-entry")
+class RetryEntry:
+    seq = crescent.option(int, name="entry", description="Failed entry to retry.")
+
+    async def callback(self, ctx: crescent.Context):
+        await ctx.respond(f"{ctx.user.mention} Searching journal..", ephemeral=True)
+
+        if write_behind is not None and write_behind.retry(self.seq):
+            await ctx.edit(
+                f"{ctx.user.mention} Entry `{self.seq}` will be sent on the next replay."
+            )
+        else:
+            await ctx.edit(
+                f"{ctx.user.mention} Entry `{self.seq}` not found, or is not failed."
+            )
@@ -0,0 +1,187 @@
+""" Warmups run once the bot has connected, instead of when its plugins are imported.
+
+Loading the plugins used to query the options table, and create the BigQuery client
+and scheduler engines, before the gateway connected. Modules now register that work
+with `@warmup(name)`, and `run_warmups()` runs all of it at once after `StartedEvent`:
+functions in threads, coroutine functions on the event loop.
+
+```py
+@warmup("timer options")
+def create_time_entry_options() -> list[hikari.CommandChoice]:
+    ...
+
+@crescent.hook(requires("scheduler"))
+@crescent.command(...)
+class GetAllJobs:
+    ...
+```
+
+Commands that need a warmup use the `requires()` hook, or wait for it with `ready()`.
+How long each warmup took, and the time from the `bot` package being imported
+to the last warmup finishing, are logged.
+
+A warmup that raises is retried with backoff, e.g. after a network error.
+If it still fails, `run_warmups()` returns its name, and the bot exits with an error
+so it's restarted, as it was when the same work failed while importing the plugins.
+"""
+import time
+import asyncio
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import Optional
+from typing import Sequence
+from typing import TypeVar
+from typing import Union
+
+import crescent
+
+from bot import bot_logger
+from bot import imported_at
+
+__all__: Sequence[str] = (
+    "Warmup",
+    "warmup",
+    "warmups",
+    "run_warmups",
+    "is_ready",
+    "ready",
+    "requires",
+)
+
+_F = TypeVar("_F", bound=Callable[[], Union[Any, Awaitable[Any]]])
+
+# attempts per warmup, waiting 2, 4, 8, .. seconds between them.
+_ATTEMPTS = 5
+
+
+class Warmup:
+    """
+    Work run once at startup by `run_warmups()`, attempted again if it raises.
+    `done` is set when it finishes, or when the last attempt raised.
+
+    ---
+    :param name: (required) the name used by `ready()`, `requires()`, and in logs.
+    :param function: (required) a function without arguments,
+        called in a thread, or awaited if it's a coroutine function.
+    """
+
+    __slots__: Sequence[str] = ("name", "function", "done", "error", "elapsed")
+
+    def __init__(self, name: str, function: Callable[[], Any], /) -> None:
+        self.name = name
+        self.function = function
+        self.done = asyncio.Event()
+        self.error: Optional[BaseException] = None
+        self.elapsed: Optional[float] = None
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.name!r})"
+
+    @property
+    def ready(self) -> bool:
+        return self.done.is_set() and self.error is None
+
+    async def run(self, attempts: int = _ATTEMPTS) -> None:
+        start = time.perf_counter()
+        for attempt in range(1, attempts + 1):
+            try:
+                if asyncio.iscoroutinefunction(self.function):
+                    await self.function()
+                else:
+                    await asyncio.to_thread(self.function)
+            except Exception as e:
+                self.error = e
+            else:
+                self.error = None
+                break
+            if attempt < attempts:
+                bot_logger.info(
+                    f"Warmup `{self.name}` attempt {attempt} failed: {self.error!r}, "
+                    f"retrying in {2**attempt} s."
+                )
+                await asyncio.sleep(2**attempt)
+        self.elapsed = time.perf_counter() - start
+        self.done.set()
+
+        if self.error is None:
+            bot_logger.info(f"Warmup `{self.name}` ready in {self.elapsed:.2f} s.")
+        else:
+            bot_logger.info(
+                f"Warmup `{self.name}` failed after {self.elapsed:.2f} s: {self.error!r}"
+            )
+
+
+warmups: dict[str, Warmup] = {}
+
+
+def warmup(name: str) -> Callable[[_F], _F]:
+    """Registers the decorated function to run at startup, and returns it unchanged."""
+
+    def decorator(function: _F) -> _F:
+        warmups[name] = Warmup(name, function)
+        return function
+
+    return decorator
+
+
+async def run_warmups() -> list[str]:
+    """
+    Runs every registered warmup concurrently, waits for all of them, and logs the timings.
+    Returns the names of the warmups that failed.
+    """
+    start = time.perf_counter()
+    await asyncio.gather(*(w.run() for w in warmups.values() if not w.done.is_set()))
+    failed = [w.name for w in warmups.values() if w.error is not None]
+    bot_logger.info(
+        f"Warmups finished in {time.perf_counter() - start:.2f} s, "
+        f"{time.monotonic() - imported_at:.2f} s since the bot was imported."
+        + (f" Failed: {', '.join(failed)}." if failed else "")
+    )
+    return failed
+
+
+def is_ready(name: str) -> bool:
+    """Whether the warmup `name` finished without an error, True if there's no such warmup."""
+    w = warmups.get(name)
+    return w is None or w.ready
+
+
+async def ready(name: str, /, *, timeout: Optional[float] = None) -> bool:
+    """
+    Waits for the warmup `name` to finish, for at most `timeout` seconds.
+    Returns whether it finished without an error.
+    """
+    w = warmups.get(name)
+    if w is None:
+        return True
+    try:
+        await asyncio.wait_for(w.done.wait(), timeout)
+    except asyncio.TimeoutError:
+        return False
+    return w.ready
+
+
+def requires(
+    *names: str,
+) -> Callable[[crescent.Context], Awaitable[Optional[crescent.HookResult]]]:
+    """
+    A hook that stops the command, and tells the user, until the warmups in `names` are ready.
+    Responds right away instead of waiting, since an interaction has to be answered within 3 seconds.
+    """
+
+    async def hook(ctx: crescent.Context) -> Optional[crescent.HookResult]:
+        pending = [name for name in names if not is_ready(name)]
+        if not pending:
+            return None
+        failed = [name for name in pending if warmups[name].done.is_set()]
+        await ctx.respond(
+            f"{ctx.user.mention} Failed to start `{', '.join(failed)}`, check the logs."
+            if failed
+            else f"{ctx.user.mention} Still starting up `{', '.join(pending)}`, "
+            "try again in a moment.",
+            ephemeral=True,
+        )
+        return crescent.HookResult(exit=True)
+
+    return hook
@@ -0,0 +1,256 @@
+""" Timers that are still running, kept in memory for `/timer end` autocomplete.
+
+`TimerStart` and `TimerEnd` update the registry as they run, changes made in Notion
+are picked up from the timetrack mirror, and `reconcile_active_timers` replaces
+the registry with the running timers in Notion every few minutes,
+so the autocomplete never has to query Notion.
+
+Durations are computed locally (`bot.hours.running_hours`) instead of reading the `timer`
+formula. With `NOTION_TIMER_VERIFY_SAMPLE` set, `verify_timer_durations` reads the formula
+for that many recent entries every `NOTION_TIMER_VERIFY_INTERVAL` minutes,
+and logs any that differ from the local result.
+"""
+import os
+import math
+import time
+import asyncio
+import dotenv
+from typing import Any
+from typing import Iterator
+from typing import Mapping
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+from datetime import datetime
+from datetime import timezone
+
+import requests
+from crescent.ext import tasks
+
+import notion
+from notion.query import PropertyFilter
+from notion.query import SortFilter
+from notion.query import EntryTimestampSort
+from notion.api.mirror import MirrorEvent
+from notion.api.mirror import _page_id
+from notion.exceptions.errors import _NotionErrors
+from bot.notionDBids import *
+from bot.utils import plugin
+from bot.hours import _ms
+from bot.hours import _date_ms
+from bot.hours import TimerDrift
+from bot.hours import timer_drift
+from bot.schedule.mirror import on_change
+from bot.schedule.mirror import timetrack_mirror
+from bot import bot_logger
+
+__all__: Sequence[str] = (
+    "ActiveTimer",
+    "ActiveTimers",
+    "active_timers",
+    "reconcile_active_timers",
+    "track_active_timers",
+    "verify_timer_durations",
+)
+
+dotenv.load_dotenv()
+
+# Minutes between replacing the registry with the running timers in Notion.
+NOTION_ACTIVE_TIMERS_INTERVAL = float(os.getenv("NOTION_ACTIVE_TIMERS_INTERVAL", 5))
+# Entries to compare with the `timer` formula in Notion, 0 to turn verification off.
+NOTION_TIMER_VERIFY_SAMPLE = int(os.getenv("NOTION_TIMER_VERIFY_SAMPLE", 0))
+NOTION_TIMER_VERIFY_INTERVAL = float(os.getenv("NOTION_TIMER_VERIFY_INTERVAL", 60))
+# Seconds a timer ended by the bot is kept out of the registry while Notion,
+# or the write-behind journal, catches up.
+_ENDED_TTL = 600
+
+_RUNNING = PropertyFilter.checkbox("stop", "equals", False)
+_PROPERTIES = ["name", "override_start", "override_end", "stop"]
+_NEWEST_FIRST = SortFilter([EntryTimestampSort.created_time_descending()])
+
+
+class ActiveTimer(NamedTuple):
+    page_id: str
+    category: str
+    start: datetime
+
+    @classmethod
+    def from_page(cls, page: Mapping[str, Any]) -> Optional["ActiveTimer"]:
+        """
+        The timer of a timetrack page, or None if it's stopped,
+        i.e. `stop` is checked or it has an `override_end`, same as the `timer` formula.
+        """
+        properties = page["properties"]
+        # same parsing as `bot.hours.timer_formula`, so the two can't disagree.
+        if properties.get("stop", {}).get("checkbox") or not math.isnan(
+            _date_ms(properties.get("override_end"))
+        ):
+            return None
+        category = "".join(t["plain_text"] for t in properties["name"]["title"])
+        start = _date_ms(properties.get("override_start"))
+        if math.isnan(start):
+            start = _ms(page["created_time"])
+        return cls(
+            _page_id(page["id"]),
+            category,
+            datetime.fromtimestamp(start / 1000, timezone.utc),
+        )
+
+
+class ActiveTimers:
+    """
+    Running timers by page id.
+    Ids are kept dashed, as Notion returns them, and the methods accept either form,
+    e.g. `notion.Page.id` (undashed) or an id pasted into `/timer delete`.
+    Only used from the event loop, Notion is queried in a thread by `reconcile_active_timers`.
+    """
+
+    def __init__(self) -> None:
+        self._timers: dict[str, ActiveTimer] = {}
+        # when each timer was added or ended by the bot, see `replace()`.
+        self._added: dict[str, float] = {}
+        self._ended: dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._timers)
+
+    def __iter__(self) -> Iterator[ActiveTimer]:
+        return iter(self._timers.values())
+
+    def __contains__(self, page_id: object) -> bool:
+        return isinstance(page_id, str) and _page_id(page_id) in self._timers
+
+    def recent(self, limit: Optional[int] = None) -> list[ActiveTimer]:
+        """Running timers, the most recently started first."""
+        timers = sorted(self._timers.values(), key=lambda t: t.start, reverse=True)
+        return timers[:limit]
+
+    def started(self, timer: ActiveTimer) -> None:
+        timer = timer._replace(page_id=_page_id(timer.page_id))
+        self._timers[timer.page_id] = timer
+        self._added[timer.page_id] = time.monotonic()
+        self._ended.pop(timer.page_id, None)
+
+    def ended(self, page_id: str) -> None:
+        page_id = _page_id(page_id)
+        self._timers.pop(page_id, None)
+        self._added.pop(page_id, None)
+        self._ended[page_id] = time.monotonic()
+
+    def _recently_ended(self, page_id: str, now: float) -> bool:
+        ended = self._ended.get(page_id)
+        return ended is not None and now - ended < _ENDED_TTL
+
+    def update(self, page: Mapping[str, Any]) -> None:
+        """Adds, updates, or removes the timer of a page read from Notion."""
+        timer = ActiveTimer.from_page(page)
+        page_id = _page_id(page["id"])
+        if timer is None:
+            self._timers.pop(page_id, None)
+            self._ended.pop(page_id, None)
+        elif not self._recently_ended(page_id, time.monotonic()):
+            self._timers[timer.page_id] = timer
+
+    def remove(self, page_id: str) -> None:
+        self._timers.pop(_page_id(page_id), None)
+
+    def replace(self, timers: Sequence[ActiveTimer], /, *, since: float) -> None:
+        """
+        Replaces the registry with `timers`, read from Notion starting at `since` (`time.monotonic()`).
+        Timers the bot started since then are kept, and timers it ended recently are left out,
+        since Notion may not have them yet.
+        """
+        now = time.monotonic()
+        current = {_page_id(t.page_id): t for t in timers}
+        for page_id, added in self._added.items():
+            if added >= since and page_id in self._timers:
+                current.setdefault(page_id, self._timers[page_id])
+        self._timers = {
+            page_id: timer
+            for page_id, timer in current.items()
+            if not self._recently_ended(page_id, now)
+        }
+        self._added = {k: v for k, v in self._added.items() if v >= since}
+        self._ended = {
+            k: v
+            for k, v in self._ended.items()
+            if k in current and self._recently_ended(k, now)
+        }
+
+
+active_timers = ActiveTimers()
+
+
+def _running_timers() -> list[ActiveTimer]:
+    pages = notion.Database(NDB_TIMETRACK_ID).iter_query(
+        payload=notion.build_payload(_RUNNING),
+        filter_property_values=_PROPERTIES,
+        cache=False,
+    )
+    return [timer for timer in map(ActiveTimer.from_page, pages) if timer]
+
+
+@plugin.include
+@tasks.loop(minutes=NOTION_ACTIVE_TIMERS_INTERVAL)
+async def reconcile_active_timers() -> None:
+    since = time.monotonic()
+    try:
+        # queried in a thread, so a slow Notion doesn't block the gateway.
+        timers = await asyncio.to_thread(_running_timers)
+    except (_NotionErrors, requests.RequestException) as e:
+        bot_logger.info(f"Failed to reconcile active timers: {e!r}")
+        return
+    active_timers.replace(timers, since=since)
+
+
+# Timers started, stopped, or deleted in Notion.
+@on_change(timetrack_mirror)
+async def track_active_timers(events: Sequence[MirrorEvent]) -> None:
+    for event in events:
+        if event.type == "archived":
+            active_timers.remove(event.page_id)
+        else:
+            active_timers.update(event.page)
+
+
+def _check_timer_formula(sample: int) -> tuple[int, list[TimerDrift]]:
+    before = datetime.now(timezone.utc)
+    pages = list(
+        notion.Database(NDB_TIMETRACK_ID).iter_query(
+            payload=notion.build_payload(_NEWEST_FIRST),
+            filter_property_values=_PROPERTIES + ["timer"],
+            limit=sample,
+            cache=False,
+        )
+    )
+    after = datetime.now(timezone.utc)
+    # Notion evaluated `now()` somewhere during the request.
+    elapsed = after - before
+    drifted = timer_drift(
+        pages,
+        now=before + elapsed / 2,
+        tolerance=0.01 + elapsed.total_seconds() / 3600,
+    )
+    return len(pages), drifted
+
+
+@plugin.include
+@tasks.loop(minutes=NOTION_TIMER_VERIFY_INTERVAL)
+async def verify_timer_durations() -> None:
+    if not NOTION_TIMER_VERIFY_SAMPLE:
+        return
+    try:
+        checked, drifted = await asyncio.to_thread(
+            _check_timer_formula, NOTION_TIMER_VERIFY_SAMPLE
+        )
+    except (_NotionErrors, requests.RequestException) as e:
+        bot_logger.info(f"Failed to verify timer durations: {e!r}")
+        return
+
+    bot_logger.info(
+        f"Timer formula check: {checked} entries, {len(drifted)} differ from local durations."
+    )
+    for drift in drifted:
+        bot_logger.info(
+            f"Timer drift in {drift.page_id}: local {drift.local}, notion {drift.notion}."
+        )
@@ -1,23 +1,39 @@
 from typing import Sequence
+from datetime import datetime
+from datetime import timezone
+
+import numpy as np
 
 import crescent
 import hikari
 
 import notion
 from notion.query import *
+from notion.api.mirror import MirrorEvent
 from notion.exceptions.errors import NotionObjectNotFound
 from notion.exceptions.errors import NotionValidationError
 
 from bot.groups import *
 from bot.notionDBids import *
-from bot.nadict import NAdict
 from bot.utils import plugin
+from bot.deferred import DeferredResponse
+from bot.deferred import run_blocking
+from bot.startup import warmup
+from bot.startup import ready
+from bot.hours import TimerEntries
+from bot.hours import running_hours
+from bot.typeahead import TypeaheadIndex
+from bot.timer.active import active_timers
+from bot.schedule.mirror import on_change
+from bot.schedule.mirror import options_mirror
+from bot.schedule.mirror import timetrack_mirror
 
 __all__: Sequence[str] = (
     "create_time_entry_options",
     "autocomplete_time_entry_options",
     "autocomplete_active_timers",
     "session",
+    "refresh_time_entry_options_on_change",
     "EntryListAdd",
     "EntryListDelete",
 )
@@ -28,36 +44,58 @@ class _TimerCache:
 
     def __init__(self) -> None:
         self.timer_options: list[hikari.CommandChoice] = []
+        # searched by what's typed, see `autocomplete_time_entry_options`.
+        self.index = TypeaheadIndex(())
 
 
 session = _TimerCache()
 
 
+# queried after the bot connects, see `bot.startup`.
+@warmup("timer options")
 def create_time_entry_options() -> list[hikari.CommandChoice]:
     if not session.timer_options:
-        query_results = (
-            notion.Database(NDB_OPTIONS_ID)
-            .query(filter_property_values=["lifetime_entries"])
-            .get("results", [])
-        )
+        if options_mirror.ready:
+            rows = options_mirror.rows(["lifetime_entries"])
+        else:
+            rows = notion.Database(NDB_OPTIONS_ID).query_rows(["lifetime_entries"])
         session.timer_options = []
-        for result in query_results:
-            e = NAdict(result)
-            entry_name = e.properties.lifetime_entries.title_0_text.content
+        for row in rows:
+            entry_name = row.lifetime_entries
             session.timer_options.append(
                 hikari.CommandChoice(name=str(entry_name), value=str(entry_name))
             )
+        session.index = TypeaheadIndex(
+            (choice.name for choice in session.timer_options),
+            last_used=session.index.last_used or _last_started(),
+        )
         return session.timer_options
     else:
         return session.timer_options
 
 
-# Query options table and create list at initial runtime.
-create_time_entry_options()
+def _last_started() -> dict[str, float]:
+    """When a timer was last started for each category, from the timetrack mirror."""
+    if not timetrack_mirror.ready:
+        return {}
+    entries = TimerEntries.from_pages(timetrack_mirror.pages())
+    latest = np.full(len(entries.categories), -np.inf)
+    np.maximum.at(latest, entries.category, entries.start)
+    return {
+        category: ms / 1000
+        for category, ms in zip(entries.categories.tolist(), latest.tolist())
+    }
 
 
-# App command to refresh the options table
-# if changes are made outside of the bot functions to add/delete options.
+# Options added, renamed, or deleted in Notion are picked up by the options mirror,
+# the list is recreated on the next autocomplete.
+@on_change(options_mirror)
+async def refresh_time_entry_options_on_change(events: Sequence[MirrorEvent]) -> None:
+    session.timer_options.clear()
+
+
+# App command to refresh the options table,
+# if the options mirror can't be synced.
 @plugin.include
 @crescent.user_command(name="refresh-timesheet-entries", dm_enabled=True)
 async def refresh_time_entry_options(ctx: crescent.Context, user: hikari.User):
@@ -67,7 +105,7 @@ async def refresh_time_entry_options(ctx: crescent.Context, user: hikari.User):
     )
 
 
-# Autocomplete function only retrieves the session attribute,
+# Autocomplete function only searches the session index,
 # and re runs the function if it's empty.
 # The query function and the autocomplete function are separated,
 # otherwise the autocomplete in command takes too long to load.
@@ -75,8 +113,15 @@ async def autocomplete_time_entry_options(
     ctx: crescent.AutocompleteContext, option: hikari.AutocompleteInteractionOption
 ) -> list[hikari.CommandChoice]:
     if not session.timer_options:
-        create_time_entry_options()
-    return session.timer_options
+        # waiting for the startup query if it's still running, instead of sending another.
+        await ready("timer options", timeout=2)
+    if not session.timer_options:
+        await run_blocking(create_time_entry_options)
+    # Discord shows at most 25 choices, the best matches for what's been typed.
+    return [
+        hikari.CommandChoice(name=name, value=name)
+        for name in session.index.search(str(option.value or ""), limit=25)
+    ]
 
 
 @plugin.include
@@ -88,10 +133,37 @@ class EntryListAdd:
     page_title = crescent.option(str, description="Name to add to list.")
 
     async def callback(self, ctx: crescent.Context):
-        NDB_OPTIONS = notion.Database(NDB_OPTIONS_ID)
-        notion.Page.create(NDB_OPTIONS, page_title=self.page_title)
-        await ctx.respond(f"Added a new option for `{self.page_title}`.")
-        session.timer_options.clear()
+        async with DeferredResponse(ctx, "Adding option..") as response:
+            NDB_OPTIONS = await response.run(notion.Database, NDB_OPTIONS_ID)
+            await response.run(
+                notion.Page.create, NDB_OPTIONS, page_title=self.page_title
+            )
+            await response.edit(f"Added a new option for `{self.page_title}`.")
+            if options_mirror.ready:
+                await response.run(options_mirror.sync)
+            session.timer_options.clear()
+
+
+def _delete_option(page_title: str) -> str:
+    query_filter = PropertyFilter.text(
+        "lifetime_entries", "title", "contains", page_title
+    )
+    if options_mirror.ready:
+        results = options_mirror.query(query_filter)
+    else:
+        results = (
+            notion.Database(NDB_OPTIONS_ID)
+            .query(
+                payload=notion.build_payload(query_filter),
+                filter_property_values=["lifetime_entries"],
+            )
+            .get("results", [])
+        )
+
+    block_id = [r["id"] for r in results][0]
+    notion.Block(str(block_id)).delete_self
+    options_mirror.archive(block_id)
+    return block_id
 
 
 @plugin.include
@@ -103,59 +175,37 @@ class EntryListDelete:
     page_title = crescent.option(str, description="Name to remove from list.")
 
     async def callback(self, ctx: crescent.Context):
-        query_filter = PropertyFilter.text(
-            "lifetime_entries", "title", "contains", self.page_title
-        )
+        async with DeferredResponse(ctx, "Deleting option..") as response:
+            try:
+                await response.run(_delete_option, self.page_title)
+                await response.edit(f"Deleted option for `{self.page_title}`.")
+                session.timer_options.clear()
 
-        try:
-            result = notion.Database(NDB_OPTIONS_ID).query(
-                payload=notion.build_payload(query_filter),
-                filter_property_values=["lifetime_entries"],
-            )
-
-            block_id = [r["id"] for r in result.get("results", [])][0]
-            notion.Block(str(block_id)).delete_self
-            await ctx.respond(f"Deleted option for `{self.page_title}`.")
-            session.timer_options.clear()
-
-        except NotionObjectNotFound:
-            await ctx.respond(f"Did not find an option for: `{self.page_title}`.")
-        except NotionValidationError as e:
-            await ctx.edit(f"{e}.")  # page is likely already archived.
+            except NotionObjectNotFound:
+                await response.edit(f"Did not find an option for: `{self.page_title}`.")
+            except NotionValidationError as e:
+                await response.edit(f"{e}.")  # page is likely already archived.
 
 
 async def autocomplete_active_timers(
     ctx: crescent.AutocompleteContext, option: hikari.AutocompleteInteractionOption
 ) -> list[hikari.CommandChoice]:
+    # from the active timer registry, without querying Notion.
+    now = datetime.now(timezone.utc)
     list_command_choices: list[hikari.CommandChoice] = []
 
-    query_results = notion.Database(NDB_TIMETRACK_ID).query(
-        payload=notion.build_payload(
-            CompoundFilter()._and(
-                PropertyFilter.checkbox("active", "equals", True),
-                TimestampFilter.created_time("this_week", {}),
-            ),
-            SortFilter([EntryTimestampSort.created_time_descending()]),
-        ),
-        filter_property_values=["name", "id", "timer"],
-    )
-
-    if pages := query_results.get("results", []):
-        for page in pages:
-            page = NAdict(page)
-            page_id, name, timer = (
-                page.id,
-                page.properties.name.title_0_text.content,
-                page.properties.timer.formula.number,
-            )
-
-            list_command_choices.append(
-                hikari.CommandChoice(
-                    name=f"Category: {name} - Duration: {timer}", value=str(page_id)
-                )
+    for timer in active_timers.recent(
+        25
+    ):  # max number of choices Discord will display.
+        duration = running_hours(timer.start, now=now)
+        list_command_choices.append(
+            hikari.CommandChoice(
+                name=f"Category: {timer.category} - Duration: {duration}",
+                value=timer.page_id,
             )
+        )
 
+    if list_command_choices:
         return list_command_choices
-
     else:
         return [hikari.CommandChoice(name="No active timers to display.", value="null")]
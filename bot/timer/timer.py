@@ -1,6 +1,9 @@
 import asyncio
+from typing import Optional
 from typing import Sequence
+from datetime import date
 from datetime import datetime
+from datetime import timezone
 
 import crescent
 
@@ -12,10 +15,20 @@ from notion.exceptions.errors import NotionObjectNotFound
 
 from bot.groups import *
 from bot.notionDBids import *
-from bot.nadict import NAdict
 from bot.utils import plugin
+from bot.deferred import DeferredResponse
+from bot.deferred import run_blocking
 from bot.timer.options import autocomplete_time_entry_options
 from bot.timer.options import autocomplete_active_timers
+from bot.timer.options import session
+from bot.timer.active import ActiveTimer
+from bot.timer.active import active_timers
+from bot.schedule.writebehind import write_behind
+from bot.schedule.mirror import rollup_mirror
+from bot.schedule.mirror import timetrack_mirror
+from bot.hours import TimerEntries
+from bot.hours import timer_hours
+from bot.hours import totals
 
 __all__: Sequence[str] = (
     "TimerStart",
@@ -28,6 +41,71 @@ __all__: Sequence[str] = (
     "live",
 )
 
+_NAME = notion.path("name.title[0].text.content", type=str)
+_TOTAL_EXPRESSION = notion.path("total.formula.expression", type=str)
+_SYNCED_PROPERTY_ID = notion.path("relation.dual_property.synced_property_id")
+# sent every time a timer is stopped, built once, see `notion.PayloadTemplate`.
+_STOP_TIMER = notion.PayloadTemplate(
+    prop.Properties(
+        prop.CheckboxPropertyValue("stop", True),
+        prop.DatePropertyValue("override_end", start=notion.Slot("end")),
+    )
+)
+
+
+def _add_category_columns(
+    ndb_timetrack: notion.Database, ndb_rollup: notion.Database, category: str
+) -> None:
+    """Relates a new category to the rollup table, and adds its sum to the daily total."""
+    rollup_category = f"rollup_{category}"
+    timer_category = f"timer_{category}"
+    sum_category = f"sum_{category}"
+
+    try:
+        # checking to see if a related column already exists.
+        ndb_timetrack[rollup_category]
+        return
+    except NotionObjectNotFound:
+        pass
+
+    # creating a new one if not found.
+    ndb_timetrack.schema_update().add(
+        prop.RelationPropertyObject.dual(rollup_category, ndb_rollup.id, timer_category)
+    ).apply()
+    synced_property_id = _SYNCED_PROPERTY_ID(ndb_timetrack[rollup_category])
+
+    # adding new rollup property to total sum.
+    expression = _TOTAL_EXPRESSION(ndb_rollup._property_schema)
+    expression += f""" + prop("{sum_category}")"""
+
+    # renaming the synced relation (see `Database.dual_relation_column`),
+    # adding the rollup, and updating the total, in one update to the rollup table.
+    ndb_rollup.schema_update().rename(synced_property_id, timer_category).add(
+        prop.RollupPropertyObject.from_relation_id(
+            sum_category,
+            synced_property_id,
+            "timer",
+            prop.NotionFunctionFormats.sum,
+        ),
+        prop.FormulaPropertyObject("total", expression),
+    ).apply()
+
+
+def _rollup_page_id(ndb_rollup: notion.Database, day: date) -> str:
+    # querying rollup table for today's date to get id for related column,
+    # from the mirror if it's already there.
+    today = PropertyFilter.text("name", "title", "equals", day)
+    mirrored = rollup_mirror.rows(["name"], today, limit=1)
+    if mirrored:
+        return mirrored[0].id
+    rollup_page = next(
+        ndb_rollup.query_rows(["name"], payload=notion.build_payload(today), limit=1),
+        None,
+    )
+    if rollup_page is None:
+        raise NotionObjectNotFound(f"No rollup page for {day}.")
+    return rollup_page.id
+
 
 @plugin.include
 @timer.child
@@ -38,72 +116,69 @@ class TimerStart:
     )
 
     async def callback(self, ctx: crescent.Context) -> None:
-        await ctx.respond(f"Starting Timer..")
+        async with DeferredResponse(ctx, "Starting Timer..") as response:
+            session.index.use(self.category)
 
-        ndb_timetrack = notion.Database(NDB_TIMETRACK_ID)
-        new_timer = notion.Page.create(ndb_timetrack, page_title=self.category)
-
-        await ctx.edit(
-            "{}\n{}\n{}\n{}".format(
-                f"{ctx.user.mention} New Timer:",
-                f"**Category:** `{self.category}`",
-                f"**uuid ref:** `{new_timer.id}`",
-                f"[notion page]({new_timer.url})",
+            ndb_timetrack = await response.run(notion.Database, NDB_TIMETRACK_ID)
+            ndb_rollup = await response.run(notion.Database, NDB_ROLLUP_ID)
+            new_timer = await response.run(
+                notion.Page.create, ndb_timetrack, page_title=self.category
             )
-        )
-
-        rollup_category = f"rollup_{self.category}"
-        timer_category = f"timer_{self.category}"
-        sum_category = f"sum_{self.category}"
-
-        ndb_rollup = notion.Database(NDB_ROLLUP_ID)
-
-        try:
-            # checking to see if a related column already exists.
-            ndb_timetrack[rollup_category]
-        except NotionObjectNotFound:
-            # creating a new one if not found.
-            ndb_timetrack.dual_relation_column(
-                rollup_category, ndb_rollup.id, timer_category
+            active_timers.started(
+                ActiveTimer(new_timer.id, self.category, datetime.now(timezone.utc))
             )
-            ndb_rollup.rollup_column(
-                sum_category, timer_category, "timer", prop.NotionFunctionFormats.sum
+            url = await response.run(getattr, new_timer, "url")
+
+            await response.edit(
+                "{}\n{}\n{}\n{}".format(
+                    f"{ctx.user.mention} New Timer:",
+                    f"**Category:** `{self.category}`",
+                    f"**uuid ref:** `{new_timer.id}`",
+                    f"[notion page]({url})",
+                )
             )
 
-            # adding new rollup property to total sum.
-            expression = str(
-                NAdict(ndb_rollup._property_schema).total.formula_expression
+            await response.run(
+                _add_category_columns, ndb_timetrack, ndb_rollup, self.category
             )
-            expression += f""" + prop("{sum_category}")"""
-            ndb_rollup.formula_column("total", expression=expression)
-
-        now = datetime.now().astimezone(new_timer.tz)
+            now = datetime.now().astimezone(new_timer.tz)
+            rollup_page_id = await response.run(_rollup_page_id, ndb_rollup, now.date())
 
-        # querying rollup table for today's date to get id for related column.
-        query_filter = notion.build_payload(
-            PropertyFilter.text("name", "title", "equals", now.date())
-        )
-        query_results = ndb_rollup.query(
-            payload=query_filter, filter_property_values=["name"]
+            await response.run(
+                new_timer.set_related, f"rollup_{self.category}", [rollup_page_id]
+            )
+            await response.run(new_timer.set_date, "override_start", now)
+
+
+def _daily_total(day: date) -> Optional[float]:
+    """
+    Total hours of the rollup page for `day`.
+    From the mirrors if they're ready and have the rollup page, summing the `timer`
+    formula of the entries related to it like the rollup does, otherwise from Notion.
+    """
+    today = PropertyFilter.text("name", "title", "equals", day)
+    mirrored = (
+        rollup_mirror.rows(["name"], today, limit=1)
+        if timetrack_mirror.ready and rollup_mirror.ready
+        else []
+    )
+    if not mirrored:
+        # also when the rollup page was just created, and isn't mirrored yet.
+        rollup_page = next(
+            notion.Database(NDB_ROLLUP_ID).query_rows(
+                ["total"], payload=notion.build_payload(today), limit=1
+            ),
+            None,
         )
+        return rollup_page.total if rollup_page else None
 
-        related_id = [str(NAdict(query_results).results_0_id)]
-        new_timer.set_related(rollup_category, related_id)
-        new_timer.set_date("override_start", now)
+    entries = TimerEntries.from_pages(timetrack_mirror.related(mirrored[0].id))
+    return round(totals(entries, timer_hours(entries), by=None).get(None, 0), 2)
 
 
 async def update_daily_total(ctx: crescent.Context) -> None:
     date = datetime.today().date()
-    query_filter = notion.build_payload(
-        PropertyFilter.text("name", "title", "equals", date)
-    )
-
-    query_result = notion.Database(NDB_ROLLUP_ID).query(
-        payload=query_filter, filter_property_values=["total"]
-    )
-
-    _query_result = NAdict(query_result)
-    total = _query_result.results_0_properties.total.formula.number
+    total = await run_blocking(_daily_total, date)
 
     await ctx.respond(
         "{} {}".format(
@@ -125,18 +200,29 @@ class TimerEnd:
     async def callback(self, ctx: crescent.Context) -> None:
         if self.active_timer == "null":
             await ctx.respond(f"{ctx.user.mention} Nothing to stop!", ephemeral=True)
-        else:
-            await ctx.respond(f"Stopping timer...")
-            timer = notion.Page(self.active_timer)
+            return
 
-            timer.set_checkbox("stop", True)
-            timer.set_date("override_end", datetime.now(tz=timer.tz))
+        async with DeferredResponse(ctx, "Stopping timer...") as response:
+            # if write-behind is enabled, the stop is journaled and sent to Notion later.
+            timer = notion.Page(self.active_timer, journal=write_behind)
 
-            await ctx.edit(
+            await response.run(timer.apply, _STOP_TIMER, end=datetime.now(tz=timer.tz))
+            active_timers.ended(self.active_timer)
+
+            await response.edit(
                 f"{ctx.user.mention} Ended timer: `{self.active_timer}`.",
             )
 
 
+def _delete_timer(page_id: str) -> None:
+    timer = notion.Page(page_id)
+    title = _NAME(timer.properties)
+    # removing related page, or total would continue to show in totals.
+    timer.set_related(f"rollup_{title}", [])
+    notion.Block(page_id).delete_self
+    timetrack_mirror.archive(page_id)
+
+
 @plugin.include
 @timer.child
 @crescent.command(name="delete", description="Delete a page by `uuid`.")
@@ -144,41 +230,33 @@ class TimerDelete:
     uuid = crescent.option(str, description="page id")
 
     async def callback(self, ctx: crescent.Context) -> None:
-        await ctx.respond(f"{ctx.user.mention} Deleting page..")
+        async with DeferredResponse(
+            ctx, f"{ctx.user.mention} Deleting page.."
+        ) as response:
+            try:
+                await response.run(_delete_timer, self.uuid)
+                active_timers.ended(self.uuid)
 
-        try:
-            timer = notion.Page(self.uuid)
-            title = NAdict(timer.properties).name.title_0_text.content
-            # removing related page, or total would continue to show in totals.
-            timer.set_related(f"rollup_{title}", [])
-            notion.Block(self.uuid).delete_self
+                await response.edit(f"{ctx.user.mention} Deleted `{self.uuid}`.")
 
-            await ctx.edit(f"{ctx.user.mention} Deleted `{self.uuid}`.")
-
-        except NotionObjectNotFound:
-            await ctx.edit(
-                f"{ctx.user.mention} No results found for `uuid`: `{self.uuid}`."
-            )
-        except NotionValidationError as e:
-            await ctx.edit(f"{ctx.user.mention} {e}.")
+            except NotionObjectNotFound:
+                await response.edit(
+                    f"{ctx.user.mention} No results found for `uuid`: `{self.uuid}`."
+                )
+            except NotionValidationError as e:
+                await response.edit(f"{ctx.user.mention} {e}.")
 
 
 @plugin.include
 @timesheet.child
 @crescent.command(name="daily-total", description="Check total hours for today.")
 async def daily_total(ctx: crescent.Context) -> None:
-    await ctx.respond(f"Checking total for today..")
-
-    date = datetime.today().date()
-    query_filter = notion.build_payload(
-        PropertyFilter.text("name", "title", "equals", date)
-    )
-
-    result = notion.Database(NDB_ROLLUP_ID).query(
-        payload=query_filter, filter_property_values=["total"]
-    )
-    total = NAdict(result).results_0_properties.total.formula.number
-    await ctx.edit(f"{ctx.user.mention} _{date}_ daily total (hrs): **`{total}`**")
+    async with DeferredResponse(ctx, "Checking total for today..") as response:
+        date = datetime.today().date()
+        total = await response.run(_daily_total, date)
+        await response.edit(
+            f"{ctx.user.mention} _{date}_ daily total (hrs): **`{total}`**"
+        )
 
 
 @plugin.include
@@ -0,0 +1,165 @@
+""" In-memory typeahead index for autocomplete choices.
+
+Discord only shows 25 autocomplete choices, so choices are searched by what's been typed
+instead of sending all of them. Matches are ranked in tiers:
+    - names starting with the query.
+    - names with a word starting with the query.
+    - names sharing most of the query's trigrams, so typos and substrings still match.
+Within a tier, the most recently used names come first, then alphabetical order.
+
+```py
+index = TypeaheadIndex(["deep work", "meetings", "reading"])
+index.use("reading")
+index.search("rea")  # ["reading"]
+index.search("work")  # ["deep work"]
+index.search("meetngs")  # ["meetings"]
+```
+
+Prefixes are looked up with a binary search over the sorted names and words,
+which is what a trie gives for a list this size, without a node per character.
+"""
+import heapq
+import time
+from bisect import bisect_left
+from operator import itemgetter
+from typing import Iterable
+from typing import Mapping
+from typing import Optional
+from typing import Sequence
+
+__all__: Sequence[str] = ("TypeaheadIndex",)
+
+# fraction of the query's trigrams a name needs to be a fuzzy match.
+_FUZZY_THRESHOLD = 0.4
+
+
+def _fold(text: str) -> str:
+    return " ".join(text.casefold().split())
+
+
+def _trigrams(folded: str, /, *, complete: bool = True) -> set[str]:
+    # padded, so short queries and the start of a name have trigrams too.
+    # a query is still being typed, so its end isn't padded.
+    padded = f"  {folded} " if complete else f"  {folded}"
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class TypeaheadIndex:
+    """
+    Names searched by prefix, word prefix, and trigrams, ranked by recent use.
+    The index is read-only once built, build a new one when the names change,
+    passing `last_used` to keep the recent use of each name.
+
+    ---
+    :param names: (required) the names to search, duplicates are ignored.
+    :param last_used: (optional) time each name was last used, as from `time.time()`.
+    """
+
+    __slots__: Sequence[str] = (
+        "names",
+        "last_used",
+        "_ids",
+        "_order",
+        "_prefixes",
+        "_words",
+        "_trigrams",
+    )
+
+    def __init__(
+        self,
+        names: Iterable[str],
+        /,
+        *,
+        last_used: Optional[Mapping[str, float]] = None,
+    ) -> None:
+        self.names: tuple[str, ...] = tuple(dict.fromkeys(names))
+        self.last_used: dict[str, float] = dict(last_used or {})
+
+        self._ids = {name: i for i, name in enumerate(self.names)}
+        folded = [_fold(name) for name in self.names]
+        # alphabetical rank of each name, to break ties without comparing strings.
+        self._order = [0] * len(self.names)
+        for rank, i in enumerate(sorted(range(len(folded)), key=folded.__getitem__)):
+            self._order[i] = rank
+
+        self._prefixes = sorted((f, i) for i, f in enumerate(folded))
+        self._words = sorted(
+            (word, i) for i, f in enumerate(folded) for word in f.split()[1:]
+        )
+        self._trigrams: dict[str, list[int]] = {}
+        for i, f in enumerate(folded):
+            for trigram in _trigrams(f):
+                self._trigrams.setdefault(trigram, []).append(i)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({len(self)} names)"
+
+    def use(self, name: str, /, *, at: Optional[float] = None) -> None:
+        """Records that `name` was used, so it's ranked above names used before it."""
+        self.last_used[name] = time.time() if at is None else at
+
+    def _rank(self, i: int) -> tuple[float, int]:
+        return -self.last_used.get(self.names[i], 0), self._order[i]
+
+    def _recent(self, limit: int) -> list[str]:
+        used = heapq.nlargest(
+            limit,
+            (item for item in self.last_used.items() if item[0] in self._ids),
+            key=itemgetter(1),
+        )
+        recent = [name for name, _ in used]
+        # then the names never used, in alphabetical order.
+        for _, i in self._prefixes:
+            if len(recent) >= limit:
+                break
+            if self.names[i] not in self.last_used:
+                recent.append(self.names[i])
+        return recent
+
+    def _starting_with(self, keys: list[tuple[str, int]], query: str) -> list[int]:
+        matches = []
+        position = bisect_left(keys, (query,))
+        while position < len(keys) and keys[position][0].startswith(query):
+            matches.append(keys[position][1])
+            position += 1
+        return matches
+
+    def _fuzzy(self, query: str, exclude: set[int]) -> list[tuple[float, int]]:
+        trigrams = _trigrams(query, complete=False)
+        shared: dict[int, int] = {}
+        for trigram in trigrams:
+            for i in self._trigrams.get(trigram, ()):
+                shared[i] = shared.get(i, 0) + 1
+        return [
+            (count / len(trigrams), i)
+            for i, count in shared.items()
+            if i not in exclude and count / len(trigrams) >= _FUZZY_THRESHOLD
+        ]
+
+    def search(self, query: str, /, *, limit: int = 25) -> list[str]:
+        """
+        The best `limit` names for what's been typed so far.
+        An empty query gives the most recently used names.
+        """
+        query = _fold(query)
+        if not query:
+            return self._recent(limit)
+
+        found: list[int] = []
+        seen: set[int] = set()
+        for keys in (self._prefixes, self._words):
+            tier = [i for i in self._starting_with(keys, query) if i not in seen]
+            seen.update(tier)
+            found += heapq.nsmallest(limit - len(found), tier, key=self._rank)
+            if len(found) >= limit:
+                return [self.names[i] for i in found]
+
+        fuzzy = heapq.nsmallest(
+            limit - len(found),
+            self._fuzzy(query, seen),
+            key=lambda match: (-match[0], *self._rank(match[1])),
+        )
+        return [self.names[i] for i in found + [i for _, i in fuzzy]]
@@ -1,6 +1,11 @@
+from typing import Any
+from typing import Optional
+
 import crescent
 import hikari
 
+from bot import bot_logger
+
 plugin = crescent.Plugin[hikari.GatewayBot, None]()
 
 # class Model:
@@ -11,3 +16,18 @@ plugin = crescent.Plugin[hikari.GatewayBot, None]()
 
 #     async def on_stop(self, _: hikari.StoppedEvent) -> None:
 #       ...
+
+
+def mention(ctx: Optional[crescent.Context]) -> str:
+    return ctx.user.mention if ctx is not None else ""
+
+
+async def respond(ctx: Optional[crescent.Context], content: str, **kwargs: Any) -> None:
+    """
+    Responds to the command, or logs `content` if there isn't one,
+    i.e. when the bot runs a command's function itself (`ctx=None`).
+    """
+    if ctx is None:
+        bot_logger.info(content)
+    else:
+        await ctx.respond(content, **kwargs)
@@ -0,0 +1,205 @@
+""" `/timesheet recent`, the most recent time entries, a page at a time.
+
+Entries are read from the timetrack database by `created_time`, newest first,
+following Notion's `next_cursor` from one page to the next. Every page fetched is kept
+by the view, so going back and forth doesn't send any requests, and the next page
+is requested in the background while the current one is shown.
+The pages are dropped when the view times out.
+"""
+import os
+import asyncio
+import dotenv
+from typing import Any
+from typing import Optional
+from typing import Sequence
+from datetime import datetime
+from datetime import timezone
+
+import crescent
+import hikari
+import miru
+import numpy as np
+import requests
+from tzlocal import get_localzone
+
+import notion
+from notion.query import SortFilter
+from notion.query import EntryTimestampSort
+from notion.exceptions.errors import _NotionErrors
+from bot.groups import *
+from bot.notionDBids import *
+from bot.utils import plugin
+from bot.hours import TimerEntries
+from bot.hours import timer_hours
+from bot.deferred import DeferredResponse
+from bot.deferred import run_blocking
+from bot import bot_logger
+
+__all__: Sequence[str] = ("RecentEntries", "RecentEntriesView", "recent_entries")
+
+dotenv.load_dotenv()
+
+# Entries shown on each page of `/timesheet recent`.
+NOTION_RECENT_PAGE_SIZE = int(os.getenv("NOTION_RECENT_PAGE_SIZE", 10))
+# Seconds without a button press before the view stops, and its pages are dropped.
+_TIMEOUT = 300
+
+_NEWEST_FIRST = SortFilter([EntryTimestampSort.created_time_descending()])
+_PROPERTIES = ["name", "override_start", "override_end", "stop"]
+
+
+class RecentEntries:
+    """
+    Pages of timetrack entries, newest first, fetched once each and kept until `clear()`.
+    Page `i` needs the cursor returned with page `i - 1`, so pages are fetched in order.
+
+    ---
+    :param database: (required) the timetrack database.
+    :param page_size: (optional) entries per page, maximum 100.
+    """
+
+    def __init__(
+        self,
+        database: notion.Database,
+        /,
+        *,
+        page_size: int = NOTION_RECENT_PAGE_SIZE,
+    ) -> None:
+        self.database = database
+        self.page_size = page_size
+        self.pages: list[list[dict[str, Any]]] = []
+        self._next_cursor: Optional[str] = None
+        self._has_more = True
+        self._fetching: Optional[asyncio.Task[None]] = None
+
+    def __len__(self) -> int:
+        return len(self.pages)
+
+    def has_page(self, index: int) -> bool:
+        """Whether page `index` was fetched, or can be."""
+        return 0 <= index < len(self.pages) or (
+            index == len(self.pages) and self._has_more
+        )
+
+    def _request(self, cursor: Optional[str]) -> dict[str, Any]:
+        body: dict[str, Any] = {"page_size": self.page_size}
+        if cursor:
+            body["start_cursor"] = cursor
+        # not cached, the same cursor is never requested twice by a view.
+        return self.database.query(
+            payload=notion.build_payload(_NEWEST_FIRST, body),
+            filter_property_values=_PROPERTIES,
+            cache=False,
+        )
+
+    async def _fetch_next(self) -> None:
+        response = await run_blocking(self._request, self._next_cursor)
+        self.pages.append(response.get("results", []))
+        self._next_cursor = response.get("next_cursor")
+        self._has_more = bool(response.get("has_more") and self._next_cursor)
+
+    def _next(self) -> asyncio.Task[None]:
+        # one request at a time, a prefetch and a button press share it.
+        if self._fetching is None or self._fetching.done():
+            self._fetching = asyncio.create_task(self._fetch_next())
+        return self._fetching
+
+    async def page(self, index: int) -> list[dict[str, Any]]:
+        """Page `index`, fetching the pages up to it if they haven't been."""
+        while index >= len(self.pages) and self._has_more:
+            await self._next()
+        if index >= len(self.pages):
+            raise IndexError(f"no page {index}, there are {len(self.pages)}.")
+        return self.pages[index]
+
+    def prefetch(self, index: int) -> None:
+        """Requests page `index` in the background, if it's the next one to fetch."""
+        if index != len(self.pages) or not self._has_more:
+            return
+        task = self._next()
+        task.add_done_callback(_log_prefetch_error)
+
+    def clear(self) -> None:
+        if self._fetching is not None:
+            self._fetching.cancel()
+        self.pages.clear()
+        self._next_cursor = None
+        self._has_more = True
+
+
+def _log_prefetch_error(task: asyncio.Task[None]) -> None:
+    # the page is requested again when it's needed.
+    if not task.cancelled() and task.exception() is not None:
+        bot_logger.info(f"Failed to prefetch recent entries: {task.exception()!r}")
+
+
+def _format(pages: list[dict[str, Any]], now: datetime) -> list[str]:
+    entries = TimerEntries.from_pages(pages)
+    hours = timer_hours(entries, now=now)
+    running = ~entries.stop & np.isnan(entries.override_end)
+    tz = get_localzone()
+    lines = []
+    for category, start, h, r in zip(
+        entries.categories[entries.category], entries.start, hours, running
+    ):
+        started = datetime.fromtimestamp(start / 1000, tz)
+        duration = "-" if np.isnan(h) else f"{h:g} hrs"
+        lines.append(
+            f"`{started:%Y-%m-%d %H:%M}` **{category}** {duration}"
+            + (" (running)" if r else "")
+        )
+    return lines
+
+
+class RecentEntriesView(miru.View):
+    """Older/Newer buttons over `RecentEntries`, starting at the newest page."""
+
+    def __init__(self, entries: RecentEntries, /) -> None:
+        super().__init__(timeout=_TIMEOUT)
+        self.entries = entries
+        self.index = 0
+
+    async def content(self) -> str:
+        """The current page, also updating which buttons can be pressed."""
+        page = await self.entries.page(self.index)
+        self.newer.disabled = self.index == 0
+        self.older.disabled = not self.entries.has_page(self.index + 1)
+        lines = _format(page, datetime.now(timezone.utc)) or ["No entries."]
+        return "\n".join([f"**Recent entries**, page {self.index + 1}", *lines])
+
+    async def _show(self, ctx: miru.ViewContext, index: int) -> None:
+        previous, self.index = self.index, index
+        try:
+            content = await self.content()
+        except (_NotionErrors, requests.RequestException) as e:
+            self.index = previous
+            await ctx.respond(f"{ctx.user.mention} Failed to load entries: {e}")
+            return
+        await ctx.edit_response(content, components=self.build())
+        self.entries.prefetch(self.index + 1)
+
+    @miru.button(label="Newer", style=hikari.ButtonStyle.SECONDARY)
+    async def newer(self, button: miru.Button, ctx: miru.ViewContext) -> None:
+        await self._show(ctx, max(self.index - 1, 0))
+
+    @miru.button(label="Older", style=hikari.ButtonStyle.SECONDARY)
+    async def older(self, button: miru.Button, ctx: miru.ViewContext) -> None:
+        if self.entries.has_page(self.index + 1):
+            await self._show(ctx, self.index + 1)
+
+    async def on_timeout(self) -> None:
+        self.entries.clear()
+        if self.message is not None:
+            await self.message.edit(components=[])
+
+
+@plugin.include
+@timesheet.child
+@crescent.command(name="recent", description="Browse the most recent time entries.")
+async def recent_entries(ctx: crescent.Context) -> None:
+    async with DeferredResponse(ctx, "Loading recent entries..") as response:
+        database = await response.run(notion.Database, NDB_TIMETRACK_ID)
+        view = RecentEntriesView(RecentEntries(database))
+        message = await response.edit(await view.content(), components=view.build())
+        await view.start(message)
+        view.entries.prefetch(1)
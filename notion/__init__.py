@@ -33,7 +33,13 @@ from notion.api import Database
 from notion.api import Block
 from notion.api import Workspace
 from notion.api import BlockFactory
+from notion.api import WriteJournal
+from notion.api import DatabaseMirror
+from notion.api import SQLiteMirrorStore
 from notion.core.build import build_payload
+from notion.core.build import PayloadTemplate
+from notion.core.build import Slot
+from notion.core.path import path
 
 from typing import Sequence
 
@@ -43,5 +49,11 @@ __all__: Sequence[str] = (
     "Block",
     "Workspace",
     "BlockFactory",
+    "WriteJournal",
+    "DatabaseMirror",
+    "SQLiteMirrorStore",
     "build_payload",
+    "PayloadTemplate",
+    "Slot",
+    "path",
 )
@@ -25,6 +25,9 @@ from notion.api.notionblock import Block
 from notion.api.notiondatabase import Database
 from notion.api.notionworkspace import Workspace
 from notion.api.blocktypefactory import BlockFactory
+from notion.api.journal import WriteJournal
+from notion.api.mirror import DatabaseMirror
+from notion.api.mirrorstore import SQLiteMirrorStore
 
 from typing import Sequence
 
@@ -33,5 +36,8 @@ __all__: Sequence[str] = (
     "Block", 
     "Page", 
     "Database",
-    "BlockFactory" 
+    "BlockFactory",
+    "WriteJournal",
+    "DatabaseMirror",
+    "SQLiteMirrorStore",
 )
@@ -22,6 +22,13 @@
 
 from __future__ import annotations
 import os
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import ClassVar
+from typing import Iterable
+from typing import NamedTuple
 from typing import Sequence
 from typing import TypeAlias
 from typing import Optional
@@ -35,12 +42,202 @@ from notion.exceptions import *
 from notion.api._about import *
 from notion.core.typedefs import *
 
-__all__: Sequence[str] = ["_NotionClient"]
+__all__: Sequence[str] = ["_NotionClient", "RateLimiter", "QueryCache", "CacheStats"]
+
+
+class RateLimiter:
+    """
+    Token bucket shared by every request sent from `_NotionClient`, thread-safe.
+    Notion allows an average of three requests per second, with some bursts beyond that.
+
+    ---
+    :param rate: (required) average number of requests per second.
+    :param burst: (optional) number of requests that can be sent at once before waiting.
+
+    https://developers.notion.com/reference/request-limits
+    """
+
+    def __init__(self, rate: float, /, *, burst: int = 1) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Blocks until a request can be sent."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._last) * self.rate
+            )
+            self._last = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def _normalize_id(database_id: str) -> str:
+    return database_id.replace("-", "").lower()
+
+
+class QueryCache:
+    """
+    Responses to database queries, shared by every request sent from `_NotionClient`, thread-safe.
+
+    Responses are keyed by a hash of the database id, the filter, sorts, cursor, and page size
+    in the payload, and `filter_properties`, so equal queries share an entry regardless of how
+    the payload was built. A database's responses are kept for its TTL,
+    and dropped as soon as a page in that database (or the database) is created, updated,
+    or deleted through the client. Edits made in Notion are only seen once the TTL expires.
+
+    ```py
+    _NotionClient.query_cache.set_ttl(NDB_OPTIONS_ID, 60)
+    _NotionClient.query_cache.stats().hit_rate
+    ```
+
+    ---
+    :param ttl: (optional) seconds responses are kept for databases without their own TTL.
+        0 doesn't cache them.
+    :param maxsize: (optional) max number of responses kept, the least recently used is dropped first.
+    """
+
+    def __init__(self, ttl: float = 0, /, *, maxsize: int = 1024) -> None:
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._ttls: dict[str, float] = {}
+        self._dependents: dict[str, set[str]] = {}
+        # incremented on writes, responses from an older generation are stale.
+        self._generations: dict[str, int] = {}
+        self._entries: OrderedDict[bytes, tuple[str, int, float, bytes]] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def set_ttl(
+        self, database_id: str, ttl: float, /, *, depends_on: Iterable[str] = ()
+    ) -> None:
+        """
+        :param ttl: (required) seconds to keep responses for this database, 0 to not cache them.
+        :param depends_on: (optional) ids of databases this one has rollups or relations to,
+            writes to pages in those databases also drop this database's responses.
+        """
+        database_id = _normalize_id(database_id)
+        with self._lock:
+            self._ttls[database_id] = ttl
+            for other in depends_on:
+                self._dependents.setdefault(_normalize_id(other), set()).add(
+                    database_id
+                )
+
+    def enabled(self, database_id: str, /) -> bool:
+        return self._ttls.get(_normalize_id(database_id), self.ttl) > 0
+
+    @staticmethod
+    def key(
+        database_id: str,
+        payload: JSONObject,
+        filter_properties: Optional[Sequence[str]] = None,
+    ) -> bytes:
+        canonical = orjson.dumps(
+            [
+                _normalize_id(database_id),
+                payload,
+                sorted(filter_properties) if filter_properties else None,
+            ],
+            option=orjson.OPT_SORT_KEYS,
+        )
+        return hashlib.blake2b(canonical, digest_size=16).digest()
+
+    def generation(self, database_id: str, /) -> int:
+        return self._generations.get(_normalize_id(database_id), 0)
+
+    def get(self, database_id: str, key: bytes, /) -> Optional[JSONObject]:
+        """A copy of the cached response, or None if there isn't one or it expired."""
+        database_id = _normalize_id(database_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                _, generation, expires, response = entry
+                if (
+                    generation == self._generations.get(database_id, 0)
+                    and expires > time.monotonic()
+                ):
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return orjson.loads(response)
+                del self._entries[key]
+            self._misses += 1
+        return None
+
+    def put(
+        self, database_id: str, key: bytes, response: JSONObject, generation: int, /
+    ) -> None:
+        """
+        Caches `response`, unless the database was written to since `generation`,
+        i.e. while the query was being sent.
+        """
+        database_id = _normalize_id(database_id)
+        ttl = self._ttls.get(database_id, self.ttl)
+        if ttl <= 0:
+            return
+        serialized = orjson.dumps(response)
+        with self._lock:
+            if generation != self._generations.get(database_id, 0):
+                return
+            self._entries[key] = (
+                database_id,
+                generation,
+                time.monotonic() + ttl,
+                serialized,
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, database_id: str, /) -> None:
+        """Drops the responses for a database, and the databases that depend on it."""
+        database_id = _normalize_id(database_id)
+        with self._lock:
+            for stale in (database_id, *self._dependents.get(database_id, ())):
+                self._generations[stale] = self._generations.get(stale, 0) + 1
+
+    def written(self, response: JSONObject, /) -> None:
+        """Invalidates the database of an object returned by a create, update, or delete."""
+        if response.get("object") == "database":
+            self.invalidate(response["id"])
+        elif response.get("object") in ("page", "block"):
+            parent = response.get("parent") or {}
+            if parent.get("type") == "database_id":
+                self.invalidate(parent["database_id"])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        return CacheStats(self._hits, self._misses)
 
 
 class _NotionClient:
     """Base Class to inherit: token, headers, requests, and endpoints."""
 
+    # replace with another `RateLimiter` to change the limit for all requests.
+    rate_limiter: ClassVar[RateLimiter] = RateLimiter(3, burst=10)
+    # replace, or set TTLs on it, to cache the responses of database queries.
+    query_cache: ClassVar[QueryCache] = QueryCache()
+
     def __init__(
         self, *, token: Optional[str] = None, notion_version: Optional[str] = None
     ) -> None:
@@ -122,6 +319,7 @@ class _NotionClient:
         *,
         payload: Optional[Union[JSONObject, JSONPayload]] = None,
     ) -> JSONObject:
+        self.rate_limiter.acquire()
         if payload is None:
             response = orjson.loads(requests.get(url, headers=self.headers).text)
         else:
@@ -141,6 +339,7 @@ class _NotionClient:
         *,
         payload: Optional[Union[JSONObject, JSONPayload]] = None,
     ) -> JSONObject:
+        self.rate_limiter.acquire()
         if payload is None:
             response = orjson.loads(requests.post(url, headers=self.headers).text)
         else:
@@ -151,11 +350,13 @@ class _NotionClient:
             )
 
         validate_response(response)
+        self.query_cache.written(response)
         return response
 
     def _patch(
         self, url: NotionEndpoint, /, *, payload: Union[JSONObject, JSONPayload]
     ) -> JSONObject:
+        self.rate_limiter.acquire()
         if isinstance(payload, dict):
             payload = orjson.dumps(payload)
         response = orjson.loads(
@@ -163,10 +364,13 @@ class _NotionClient:
         )
 
         validate_response(response)
+        self.query_cache.written(response)
         return response
 
     def _delete(self, url: NotionEndpoint, /) -> JSONObject:
+        self.rate_limiter.acquire()
         response = orjson.loads(requests.delete(url, headers=self.headers).text)
 
         validate_response(response)
+        self.query_cache.written(response)
         return response
@@ -0,0 +1,297 @@
+# MIT License
+
+# Copyright (c) 2023 ayvi#0001
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from __future__ import annotations
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Sequence
+from typing import Optional
+from typing import NamedTuple
+from typing import Union
+
+import orjson
+import requests
+
+from notion.core import notion_logger
+from notion.core.typedefs import *
+from notion.api.client import _NotionClient
+from notion.exceptions.errors import *
+
+__all__: Sequence[str] = ["WriteJournal", "JournalEntry"]
+
+
+# Errors worth retrying, the entry stays pending and is retried on the next replay.
+# Any other error from Notion means the request itself is bad, and it's marked failed.
+_TRANSIENT_ERRORS = (
+    NotionRateLimited,
+    NotionConflictError,
+    NotionInternalServerError,
+    NotionServiceUnavailable,
+    NotionDatabaseConnectionUnavailable,
+)
+
+
+class JournalEntry(NamedTuple):
+    seq: int
+    dedup_key: str
+    method: str
+    url: str
+    payload: bytes
+    status: str
+    attempts: int
+    last_error: Optional[str]
+    created_at: float
+    updated_at: float
+
+
+class WriteJournal:
+    """
+    Durable write-behind journal for mutations sent to Notion.
+
+    Requests are appended to a local SQLite database (WAL mode) instead of being sent,
+    and are replayed to Notion in the order they were written by calling `replay()`.
+    Entries move from `pending` to `done`, or to `failed` if Notion rejects the request
+    or `max_attempts` is reached. Appending a request that is identical to the latest
+    pending entry for the same url is ignored, since sending it twice changes nothing.
+    A request identical to an older entry is still appended, so replaying the journal
+    always ends with the latest request for each url.
+
+    Used by `notion.api.notionpage.Page` when an instance is created with `journal=`.
+
+    ---
+    :param path: (optional) path to the SQLite file, created if it doesn't exist.
+    :param max_attempts: (optional) number of transient failures before an entry is marked failed.
+    """
+
+    def __init__(
+        self, path: str = "notion_journal.sqlite3", /, *, max_attempts: int = 10
+    ) -> None:
+        self.path = path
+        self.max_attempts = max_attempts
+        self.logger = notion_logger.getChild(f"{self.__repr__()}")
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS journal (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                dedup_key TEXT NOT NULL,
+                method TEXT NOT NULL,
+                url TEXT NOT NULL,
+                payload BLOB NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS journal_pending_url
+                ON journal (url, seq) WHERE status = 'pending';
+            CREATE INDEX IF NOT EXISTS journal_status ON journal (status, seq);
+            """
+        )
+        self._conn.commit()
+
+    def __repr__(self) -> str:
+        return f"notion.{self.__class__.__name__}('{self.path}')"
+
+    def append(
+        self,
+        method: str,
+        url: str,
+        payload: Union[JSONObject, JSONPayload],
+        /,
+        *,
+        dedup_key: Optional[str] = None,
+    ) -> int:
+        """
+        Writes a request to the journal and returns its sequence number.
+        The entry is committed before returning, so it survives a restart.
+
+        ---
+        :param method: (required) one of `POST`, `PATCH`, `DELETE`.
+        :param url: (required) endpoint the request is sent to.
+        :param payload: (required) json payload of the request.
+        :param dedup_key: (optional) a request is ignored if the latest pending entry
+            for its url has the same key. defaults to a hash of the method, url, and payload.
+        """
+        if isinstance(payload, dict):
+            payload = orjson.dumps(payload)
+        if isinstance(payload, str):
+            payload = payload.encode()
+
+        if dedup_key is None:
+            dedup_key = hashlib.sha1(
+                method.encode() + url.encode() + bytes(payload)  # type: ignore[arg-type]
+            ).hexdigest()
+
+        now = time.time()
+        with self._lock:
+            latest = self._conn.execute(
+                """
+                SELECT seq, dedup_key FROM journal WHERE url = ? AND status = 'pending'
+                ORDER BY seq DESC LIMIT 1
+                """,
+                (url,),
+            ).fetchone()
+            if latest is not None and latest[1] == dedup_key:
+                return int(latest[0])
+
+            seq = self._conn.execute(
+                """
+                INSERT INTO journal
+                    (dedup_key, method, url, payload, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (dedup_key, method.upper(), url, payload, now, now),
+            ).lastrowid
+            self._conn.commit()
+
+        self.logger.info(f"Journaled {method.upper()} {url} as entry {seq}.")
+        return int(seq)  # type: ignore[arg-type]
+
+    def get(self, seq: int, /) -> Optional[JournalEntry]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM journal WHERE seq = ?", (seq,)
+            ).fetchone()
+        return JournalEntry(*row) if row else None
+
+    def entries(
+        self, *, status: Optional[str] = None, limit: Optional[int] = None
+    ) -> list[JournalEntry]:
+        """
+        :param status: (optional) one of `pending`, `done`, `failed`. Returns all entries if not set.
+        :param limit: (optional) max number of entries to return, oldest first.
+        """
+        query = "SELECT * FROM journal"
+        params: list[Union[str, int]] = []
+        if status:
+            query += " WHERE status = ?"
+            params.append(status)
+        query += " ORDER BY seq"
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [JournalEntry(*row) for row in rows]
+
+    def pending(self, *, limit: Optional[int] = None) -> list[JournalEntry]:
+        return self.entries(status="pending", limit=limit)
+
+    def remove(self, seq: int, /) -> bool:
+        """Deletes an entry from the journal. Returns False if it didn't exist."""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM journal WHERE seq = ?", (seq,))
+            self._conn.commit()
+        return cursor.rowcount > 0
+
+    def retry(self, seq: int, /) -> bool:
+        """Sets a failed entry back to pending. Returns False if it isn't a failed entry."""
+        with self._lock:
+            cursor = self._conn.execute(
+                """
+                UPDATE journal SET status = 'pending', attempts = 0, updated_at = ?
+                WHERE seq = ? AND status = 'failed'
+                """,
+                (time.time(), seq),
+            )
+            self._conn.commit()
+        return cursor.rowcount > 0
+
+    def purge(self, *, older_than: float = 0) -> int:
+        """Deletes `done` entries last updated more than `older_than` seconds ago."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM journal WHERE status = 'done' AND updated_at <= ?",
+                (time.time() - older_than,),
+            )
+            self._conn.commit()
+        return cursor.rowcount
+
+    def _set_status(
+        self, entry: JournalEntry, status: str, *, error: Optional[str] = None
+    ) -> None:
+        attempts = entry.attempts + (status != "done")
+        if status == "pending" and attempts >= self.max_attempts:
+            status = "failed"
+
+        with self._lock:
+            self._conn.execute(
+                """
+                UPDATE journal SET status = ?, attempts = ?, last_error = ?, updated_at = ?
+                WHERE seq = ?
+                """,
+                (status, attempts, error, time.time(), entry.seq),
+            )
+            self._conn.commit()
+
+    def replay(
+        self, client: Optional[_NotionClient] = None, /, *, limit: Optional[int] = None
+    ) -> int:
+        """
+        Sends pending entries to Notion, oldest first, and returns the number completed.
+        Stops at the first transient error so that later entries are never applied
+        ahead of an earlier one, the entry is retried on the next call.
+        Not safe to call from more than one thread at a time.
+
+        ---
+        :param client: (optional) client used to send requests, defaults to `NOTION_TOKEN`.
+        :param limit: (optional) max number of entries to send in this call.
+        """
+        client = client if client is not None else _NotionClient()
+        requests_ = {"POST": client._post, "PATCH": client._patch}
+        completed = 0
+
+        for entry in self.pending(limit=limit):
+            try:
+                if entry.method == "DELETE":
+                    client._delete(entry.url)
+                else:
+                    requests_[entry.method](entry.url, payload=entry.payload)
+            except (
+                *_TRANSIENT_ERRORS,
+                requests.RequestException,
+                orjson.JSONDecodeError,
+            ) as e:
+                self._set_status(entry, "pending", error=repr(e))
+                self.logger.info(f"Entry {entry.seq} will be retried: {e!r}")
+                break
+            except _NotionErrors as e:
+                self._set_status(entry, "failed", error=repr(e))
+                self.logger.info(f"Entry {entry.seq} failed: {e!r}")
+            else:
+                self._set_status(entry, "done")
+                completed += 1
+
+        return completed
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
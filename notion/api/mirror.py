@@ -0,0 +1,377 @@
+# MIT License
+
+# Copyright (c) 2023 ayvi#0001
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+from __future__ import annotations
+import time
+import threading
+from typing import Any
+from typing import Callable
+from typing import Mapping
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+from typing import Union
+from datetime import datetime
+from datetime import timezone
+from functools import cached_property
+from uuid import UUID
+
+from notion.core import notion_logger
+from notion.core.build import build_payload
+from notion.core.typedefs import *
+from notion.api.notiondatabase import Database
+from notion.api.mirrorstore import MirrorStore
+from notion.query.local import LocalQuery
+from notion.query.local import _decode
+from notion.query.rows import Row
+from notion.query.rows import RowProjection
+from notion.query.sort import SortFilter
+from notion.query.sort import EntryTimestampSort
+from notion.query.timestamp import TimestampFilter
+
+__all__: Sequence[str] = ["DatabaseMirror", "MirrorSync", "MirrorEvent"]
+
+
+class MirrorEvent(NamedTuple):
+    """
+    A page added to, changed in, or archived from a `DatabaseMirror`.
+
+    :param type: one of `added`, `changed`, or `archived`.
+    :param page: the page as mirrored now, or the last mirrored version if archived.
+    :param changes: property name -> (old value, new value) for `changed` pages,
+        decoded the same way as `notion.query.rows`. Empty for `added` and `archived` pages.
+    """
+
+    type: str
+    page_id: str
+    page: Mapping[str, Any]
+    changes: dict[str, tuple[Any, Any]]
+
+
+class MirrorSync(NamedTuple):
+    """Page ids updated and archived by one `DatabaseMirror.sync()`, and the events sent for them."""
+
+    upserted: tuple[str, ...]
+    archived: tuple[str, ...]
+    full: bool
+    events: tuple[MirrorEvent, ...]
+
+
+def _page_id(page_id: str) -> str:
+    # pages are keyed by id as Notion returns them, with dashes,
+    # ids without them (e.g. `Page.id`) are accepted too.
+    try:
+        return str(UUID(page_id))
+    except ValueError:
+        return page_id
+
+
+def _is_archived(page: Mapping[str, Any]) -> bool:
+    return bool(page.get("archived") or page.get("in_trash"))
+
+
+def _diff(old: Mapping[str, Any], new: Mapping[str, Any]) -> dict[str, tuple[Any, Any]]:
+    old_properties, new_properties = old["properties"], new["properties"]
+    changes = {}
+    for name in old_properties.keys() | new_properties.keys():
+        before, after = old_properties.get(name), new_properties.get(name)
+        if before != after:
+            changes[name] = (
+                _decode(before, before["type"]) if before else None,
+                _decode(after, after["type"]) if after else None,
+            )
+    return changes
+
+
+class DatabaseMirror:
+    """
+    A local copy of the pages in a database, kept up to date by calling `sync()`.
+
+    The first sync scans the whole database. After that, only pages edited since the
+    latest `last_edited_time` already mirrored (the watermark) are queried, oldest first,
+    so each sync costs one request unless pages were edited.
+
+    Archived pages aren't returned by database queries, so every `reconcile_every` syncs
+    the page ids in the database are scanned again, and mirrored pages missing from it are removed.
+    Removed pages are kept as tombstones for `tombstone_ttl` seconds, so a page archived
+    while a sync was running isn't added back by a response that was already on its way.
+
+    Reads (`get()`, `related()`, `query()`, `rows()`) never send a request.
+    Changes are sent as `notion.api.mirror.MirrorEvent` to callbacks added with `subscribe()`.
+
+    ---
+    :param database: (required) `notion.api.notiondatabase.Database`, or its id.
+        an id isn't retrieved until the first sync.
+    :param store: (optional) where pages are kept, `notion.api.mirrorstore.MirrorStore` (in memory) by default.
+        with a `notion.api.mirrorstore.SQLiteMirrorStore`, the mirror is kept between restarts,
+        and only syncs pages edited since, after checking for archived pages once.
+    :param reconcile_every: (optional) number of syncs between scans for archived pages.
+    :param tombstone_ttl: (optional) seconds to keep a tombstone for removed pages.
+    """
+
+    def __init__(
+        self,
+        database: Union[str, Database],
+        /,
+        *,
+        store: Optional[MirrorStore] = None,
+        reconcile_every: int = 20,
+        tombstone_ttl: float = 86400,
+    ) -> None:
+        if isinstance(database, Database):
+            self.__dict__["database"] = database
+        self.database_id = database if isinstance(database, str) else database.id
+        self.reconcile_every = reconcile_every
+        self.tombstone_ttl = tombstone_ttl
+        self.logger = notion_logger.getChild(f"{self.__repr__()}")
+
+        self.store = store if store is not None else MirrorStore()
+        self.syncs = 0
+        self._subscribers: list[Callable[[Sequence[MirrorEvent]], Any]] = []
+        self._lock = threading.RLock()
+
+    def __repr__(self) -> str:
+        return f"notion.{self.__class__.__name__}('{self.database_id}')"
+
+    def __len__(self) -> int:
+        return len(self.store.pages)
+
+    def __contains__(self, page_id: object) -> bool:
+        return isinstance(page_id, str) and _page_id(page_id) in self.store.pages
+
+    @cached_property
+    def database(self) -> Database:
+        return Database(self.database_id)
+
+    @property
+    def watermark(self) -> Optional[str]:
+        return self.store.watermark
+
+    @property
+    def ready(self) -> bool:
+        """True once the first full scan has completed."""
+        return self.watermark is not None
+
+    def sync(self) -> MirrorSync:
+        """
+        Applies pages edited since the last sync, or scans the whole database on the first sync.
+        Every `reconcile_every` syncs, also removes pages that are no longer in the database.
+
+        Sends requests and blocks, run in a thread from async code.
+        """
+        full = self.watermark is None
+        # `last_edited_time` is rounded down to the minute in Notion.
+        started = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:00.000Z")
+        # the mirror is how the bot sees edits made in Notion, so it never reads from the query cache.
+        if full:
+            pages = self.database.iter_query(cache=False)
+        else:
+            pages = self.database.iter_query(
+                payload=build_payload(
+                    TimestampFilter.last_edited_time("on_or_after", self.watermark),
+                    SortFilter([EntryTimestampSort.last_edited_time_ascending()]),
+                ),
+                cache=False,
+            )
+
+        events: list[MirrorEvent] = []
+        seen: set[str] = set()
+        latest = self.watermark or ""
+        for page in pages:
+            seen.add(page["id"])
+            latest = max(latest, page["last_edited_time"])
+            if event := self._apply(page):
+                events.append(event)
+
+        with self._lock:
+            self.syncs += 1
+            if full:
+                # pages that were mirrored before, but weren't in the scan.
+                events.extend(self._remove(set(self.store.pages) - seen))
+            # pages edited while results were paginated may have been returned
+            # before the edit, so the watermark doesn't move past the start of this sync.
+            self.store.set_watermark(min(latest, started) if latest else started)
+            self.store.commit()
+
+        # after a restart with a persistent store, pages may have been archived since.
+        if not full and (
+            self.syncs == 1
+            and len(self.store.pages)
+            or self.reconcile_every
+            and self.syncs % self.reconcile_every == 0
+        ):
+            events.extend(self._reconcile())
+
+        upserted = tuple(e.page_id for e in events if e.type != "archived")
+        archived = tuple(e.page_id for e in events if e.type == "archived")
+        if events:
+            self.logger.info(
+                f"Synced {len(upserted)} pages, removed {len(archived)} archived pages."
+            )
+            self._send(events)
+        return MirrorSync(upserted, archived, full, tuple(events))
+
+    def reconcile(self) -> tuple[str, ...]:
+        """
+        Scans the ids of every page in the database, and removes mirrored pages that
+        are missing from it (archived or deleted). Only the title property is requested.
+        Returns the ids of the removed pages.
+        """
+        events = self._reconcile()
+        self._send(events)
+        return tuple(e.page_id for e in events)
+
+    def _reconcile(self) -> list[MirrorEvent]:
+        # the schema may have changed since it was retrieved.
+        self.database.__dict__.pop("retrieve", None)
+        self.database.__dict__.pop("_property_schema", None)
+        title = next(
+            name
+            for name, schema in self.database._property_schema.items()
+            if schema["type"] == "title"
+        )
+        ids = {
+            p["id"]
+            for p in self.database.iter_query(
+                filter_property_values=[title], cache=False
+            )
+        }
+
+        with self._lock:
+            removed = self._remove(set(self.store.pages) - ids)
+            expired = time.time() - self.tombstone_ttl
+            for page_id, (_, removed_at) in list(self.store.tombstones.items()):
+                if removed_at < expired:
+                    self.store.remove_tombstone(page_id)
+            self.store.commit()
+        return removed
+
+    def apply(self, page: Mapping[str, Any], /) -> bool:
+        """
+        Adds or replaces a page in the mirror, or removes it if the page is archived.
+        Use for pages the bot already has a response for, e.g. after an update.
+        Returns False if the page is unchanged, or older than the mirrored page or tombstone.
+        """
+        event = self._apply(page)
+        self.store.commit()
+        if event:
+            self._send([event])
+        return event is not None
+
+    def _apply(self, page: Mapping[str, Any]) -> Optional[MirrorEvent]:
+        page_id, edited = page["id"], page["last_edited_time"]
+        with self._lock:
+            if page_id in self.store.tombstones:
+                if edited <= self.store.tombstones[page_id][0] and not _is_archived(
+                    page
+                ):
+                    return None
+                self.store.remove_tombstone(page_id)
+
+            if _is_archived(page):
+                removed = self._remove({page_id}, edited=edited)
+                return removed[0] if removed else None
+
+            current = self.store.pages.get(page_id)
+            if current is not None and (
+                current["last_edited_time"] > edited or current == page
+            ):
+                return None
+
+            self.store.put(page)
+            if current is None:
+                return MirrorEvent("added", page_id, page, {})
+            return MirrorEvent("changed", page_id, page, _diff(current, page))
+
+    def archive(self, page_id: str, /) -> bool:
+        """Removes a page the bot archived or deleted, without waiting for a reconcile."""
+        with self._lock:
+            removed = self._remove({_page_id(page_id)})
+            self.store.commit()
+        self._send(removed)
+        return bool(removed)
+
+    def _remove(
+        self, page_ids: set[str], *, edited: Optional[str] = None
+    ) -> list[MirrorEvent]:
+        removed = []
+        for page_id in map(_page_id, page_ids):
+            page = self.store.remove(page_id)
+            last_edited = edited or (page["last_edited_time"] if page else "")
+            self.store.put_tombstone(page_id, last_edited, time.time())
+            if page is not None:
+                removed.append(MirrorEvent("archived", page_id, page, {}))
+        return removed
+
+    def subscribe(
+        self, callback: Callable[[Sequence[MirrorEvent]], Any], /
+    ) -> Callable[[], None]:
+        """
+        Calls `callback` with the events from every change to the mirror, in the same thread,
+        once per `sync()`, `reconcile()`, `apply()`, or `archive()` that changed anything.
+        Exceptions in callbacks are logged, and don't stop the other callbacks.
+        Returns a function to unsubscribe.
+        """
+        self._subscribers.append(callback)
+        return lambda: self._subscribers.remove(callback)
+
+    def _send(self, events: Sequence[MirrorEvent]) -> None:
+        if not events:
+            return
+        for callback in list(self._subscribers):
+            try:
+                callback(events)
+            except Exception:
+                self.logger.exception(f"Error in mirror subscriber {callback!r}")
+
+    def get(self, page_id: str, /) -> Optional[Mapping[str, Any]]:
+        return self.store.pages.get(_page_id(page_id))
+
+    def pages(self) -> list[Mapping[str, Any]]:
+        with self._lock:
+            return list(self.store.pages.values())
+
+    def related(
+        self, related_id: str, /, *, property: Optional[str] = None
+    ) -> list[Mapping[str, Any]]:
+        """Pages with a relation to `related_id`, in any relation property, or only in `property`."""
+        with self._lock:
+            return self.store.related(_page_id(related_id), property=property)
+
+    def query(
+        self, *objects: Mapping[str, Any], limit: Optional[int] = None
+    ) -> list[Mapping[str, Any]]:
+        """
+        Pages in the mirror matching filter/sort objects, as in `notion.build_payload`.
+        See `notion.query.local.LocalQuery` for how filters are evaluated.
+        """
+        return LocalQuery(*objects)(self.pages(), limit=limit)
+
+    def rows(
+        self,
+        properties: Sequence[str],
+        /,
+        *objects: Mapping[str, Any],
+        limit: Optional[int] = None,
+    ) -> list[Row]:
+        """Same as `query()`, decoded into `notion.query.rows.Row` like `Database.query_rows()`."""
+        projection = RowProjection(self.database._property_schema, properties)
+        return list(map(projection, self.query(*objects, limit=limit)))
@@ -0,0 +1,398 @@
+# MIT License
+
+# Copyright (c) 2023 ayvi#0001
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+""" Storage for `notion.api.mirror.DatabaseMirror`.
+
+`MirrorStore` keeps pages in memory only. `SQLiteMirrorStore` also writes them to SQLite,
+so a mirror doesn't need to scan the whole database again after a restart,
+with one typed column per property for queries in SQL.
+"""
+from __future__ import annotations
+import re
+import sqlite3
+import threading
+from typing import Any
+from typing import Iterator
+from typing import Mapping
+from typing import Optional
+from typing import Sequence
+from datetime import datetime
+
+import orjson
+
+from notion.core import notion_logger
+from notion.query.local import _decode
+
+__all__: Sequence[str] = ["MirrorStore", "SQLiteMirrorStore"]
+
+
+def _relations(page: Mapping[str, Any]) -> Iterator[tuple[str, str]]:
+    for name, value in page["properties"].items():
+        if value["type"] == "relation":
+            for related in value["relation"]:
+                yield name, related["id"]
+
+
+class MirrorStore:
+    """
+    Pages, tombstones, and the watermark of a `notion.api.mirror.DatabaseMirror`, in memory.
+
+    `pages` and `tombstones` are read directly, and only changed through the methods,
+    so subclasses can persist each change. Changes since the last `commit()` may be lost.
+    Relations are indexed by related page id, for `related()`.
+    """
+
+    def __init__(self) -> None:
+        self.pages: dict[str, Mapping[str, Any]] = {}
+        # page id -> (last_edited_time when removed, time.time() when removed)
+        self.tombstones: dict[str, tuple[str, float]] = {}
+        self.watermark: Optional[str] = None
+        # related page id -> (page id, relation property) of each page related to it.
+        self._related: dict[str, set[tuple[str, str]]] = {}
+
+    def put(self, page: Mapping[str, Any], /) -> None:
+        self._unrelate(self.pages.get(page["id"]))
+        self.pages[page["id"]] = page
+        for name, related_id in _relations(page):
+            self._related.setdefault(related_id, set()).add((page["id"], name))
+
+    def remove(self, page_id: str, /) -> Optional[Mapping[str, Any]]:
+        page = self.pages.pop(page_id, None)
+        self._unrelate(page)
+        return page
+
+    def _unrelate(self, page: Optional[Mapping[str, Any]]) -> None:
+        if page is None:
+            return
+        for name, related_id in _relations(page):
+            related = self._related.get(related_id)
+            if related is not None:
+                related.discard((page["id"], name))
+                if not related:
+                    del self._related[related_id]
+
+    def related(
+        self, related_id: str, /, *, property: Optional[str] = None
+    ) -> list[Mapping[str, Any]]:
+        """Pages with a relation to `related_id`, in any relation property, or only in `property`."""
+        page_ids = {
+            page_id
+            for page_id, name in self._related.get(related_id, ())
+            if property is None or name == property
+        }
+        return [self.pages[page_id] for page_id in page_ids]
+
+    def put_tombstone(
+        self, page_id: str, last_edited: str, removed_at: float, /
+    ) -> None:
+        self.tombstones[page_id] = (last_edited, removed_at)
+
+    def remove_tombstone(self, page_id: str, /) -> None:
+        self.tombstones.pop(page_id, None)
+
+    def set_watermark(self, watermark: str, /) -> None:
+        self.watermark = watermark
+
+    def commit(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+# declared column types, other property types are stored as text.
+_COLUMN_TYPES: dict[str, str] = {
+    "number": "REAL",
+    "checkbox": "INTEGER",
+    "formula": "",
+    "rollup": "",
+}
+
+_NAME = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _column_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (list, tuple, dict)):
+        return orjson.dumps(value).decode()
+    return value
+
+
+class SQLiteMirrorStore(MirrorStore):
+    """
+    `MirrorStore` that also writes every change to SQLite (WAL mode), and loads
+    the pages, tombstones, and watermark written before when it's created.
+    Reads are still served from memory.
+
+    Each mirror has its own table, named `name`, with columns:
+        `_id`, `_created_time`, `_last_edited_time`, `_page` (the page as json),
+        and one column per property, with the property value decoded as in
+        `notion.query.rows` (dates as ISO 8601 text, lists as json).
+        Columns are added when a property first appears, and named `p0`, `p1`, ..
+        instead of after the property, since property names can differ only by case,
+        or be the name of one of the columns above. `column()` returns a property's column.
+    Properties are matched to columns by property id, kept in `{name}_columns`
+    (`property_id`, `property`, `column_name`), so a renamed property keeps its column.
+
+    Relations are also stored in `{name}_relations` (`page_id`, `property`, `related_id`).
+    Titles, `_created_time`, `_last_edited_time`, and related ids are indexed.
+
+    ```py
+    store = SQLiteMirrorStore("mirror.sqlite3", "timetrack")
+    mirror = notion.DatabaseMirror(NDB_TIMETRACK_ID, store=store)
+    store.select(f"{store.column('timer')} > ? ORDER BY _created_time DESC", (2,), limit=10)
+    store.related(rollup_page_id)
+    ```
+
+    ---
+    :param path: (required) path to the SQLite file, created if it doesn't exist.
+        several stores (with different names) can use the same file.
+    :param name: (required) table name for this mirror, letters, numbers and `_`.
+
+    :raises `ValueError`: if `name` isn't a valid table name.
+    """
+
+    def __init__(self, path: str, name: str, /) -> None:
+        if not _NAME.fullmatch(name):
+            raise ValueError(f"Invalid table name `{name}`.")
+        super().__init__()
+        self.path = path
+        self.name = name
+        self.logger = notion_logger.getChild(f"{self.__repr__()}")
+
+        self._table = _quote(name)
+        self._relations = _quote(f"{name}_relations")
+        self._mapping = _quote(f"{name}_columns")
+        # property id -> column, and property name -> column.
+        self._columns: dict[str, str] = {}
+        self._names: dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            f"""
+            CREATE TABLE IF NOT EXISTS {self._table} (
+                _id TEXT PRIMARY KEY,
+                _created_time TEXT NOT NULL,
+                _last_edited_time TEXT NOT NULL,
+                _page BLOB NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS {_quote(f"{name}_created_time")}
+                ON {self._table} (_created_time);
+            CREATE INDEX IF NOT EXISTS {_quote(f"{name}_last_edited_time")}
+                ON {self._table} (_last_edited_time);
+            CREATE TABLE IF NOT EXISTS {self._mapping} (
+                property_id TEXT PRIMARY KEY,
+                property TEXT NOT NULL,
+                column_name TEXT NOT NULL UNIQUE
+            );
+            CREATE TABLE IF NOT EXISTS {self._relations} (
+                page_id TEXT NOT NULL,
+                property TEXT NOT NULL,
+                related_id TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS {_quote(f"{name}_related_id")}
+                ON {self._relations} (related_id);
+            CREATE INDEX IF NOT EXISTS {_quote(f"{name}_relations_page_id")}
+                ON {self._relations} (page_id);
+            CREATE TABLE IF NOT EXISTS mirror_tombstones (
+                name TEXT NOT NULL,
+                page_id TEXT NOT NULL,
+                last_edited_time TEXT NOT NULL,
+                removed_at REAL NOT NULL,
+                PRIMARY KEY (name, page_id)
+            );
+            CREATE TABLE IF NOT EXISTS mirror_watermarks (
+                name TEXT PRIMARY KEY,
+                watermark TEXT NOT NULL
+            );
+            """
+        )
+        self._conn.commit()
+        self._load()
+
+    def __repr__(self) -> str:
+        return f"notion.{self.__class__.__name__}('{self.path}', '{self.name}')"
+
+    def _load(self) -> None:
+        for property_id, name, column in self._conn.execute(
+            f"SELECT property_id, property, column_name FROM {self._mapping}"
+        ):
+            self._columns[property_id] = column
+            self._names[name] = column
+        for (page,) in self._conn.execute(f"SELECT _page FROM {self._table}"):
+            # in memory only, the rows are already stored.
+            super().put(orjson.loads(page))
+        for page_id, last_edited, removed_at in self._conn.execute(
+            "SELECT page_id, last_edited_time, removed_at "
+            "FROM mirror_tombstones WHERE name = ?",
+            (self.name,),
+        ):
+            self.tombstones[page_id] = (last_edited, removed_at)
+        row = self._conn.execute(
+            "SELECT watermark FROM mirror_watermarks WHERE name = ?", (self.name,)
+        ).fetchone()
+        self.watermark = row[0] if row else None
+        if self.pages:
+            self.logger.info(
+                f"Loaded {len(self.pages)} pages, watermark {self.watermark}."
+            )
+
+    def column(self, property: str, /) -> str:
+        """
+        The quoted column of `property`, for `select()`.
+
+        :raises `KeyError`: if no page with `property` was stored yet.
+        """
+        return _quote(self._names[property])
+
+    def _add_columns(self, properties: Mapping[str, Any]) -> list[str]:
+        columns = []
+        for name, value in properties.items():
+            column = self._columns.get(value["id"])
+            if column is None:
+                column = f"p{len(self._columns)}"
+                column_type = _COLUMN_TYPES.get(value["type"], "TEXT")
+                self._conn.execute(
+                    f"ALTER TABLE {self._table} ADD COLUMN {column} {column_type}"
+                )
+                if value["type"] == "title":
+                    self._conn.execute(
+                        f"CREATE INDEX IF NOT EXISTS {_quote(f'{self.name}_title')} "
+                        f"ON {self._table} ({column})"
+                    )
+                self._columns[value["id"]] = column
+            if self._names.get(name) != column:
+                # a new property, or one that was renamed.
+                self._conn.execute(
+                    f"INSERT OR REPLACE INTO {self._mapping} VALUES (?, ?, ?)",
+                    (value["id"], name, column),
+                )
+                self._names = {n: c for n, c in self._names.items() if c != column}
+                self._names[name] = column
+            columns.append(column)
+        return columns
+
+    def put(self, page: Mapping[str, Any], /) -> None:
+        super().put(page)
+        properties = page["properties"]
+        with self._lock:
+            columns = ", ".join(self._add_columns(properties))
+            placeholders = ", ?" * len(properties)
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self._table} "
+                f"(_id, _created_time, _last_edited_time, _page"
+                f"{', ' if columns else ''}{columns}) "
+                f"VALUES (?, ?, ?, ?{placeholders})",
+                (
+                    page["id"],
+                    page["created_time"],
+                    page["last_edited_time"],
+                    orjson.dumps(page),
+                    *(
+                        _column_value(_decode(value, value["type"]))
+                        for value in properties.values()
+                    ),
+                ),
+            )
+            self._conn.execute(
+                f"DELETE FROM {self._relations} WHERE page_id = ?", (page["id"],)
+            )
+            self._conn.executemany(
+                f"INSERT INTO {self._relations} VALUES (?, ?, ?)",
+                (
+                    (page["id"], name, related_id)
+                    for name, related_id in _relations(page)
+                ),
+            )
+
+    def remove(self, page_id: str, /) -> Optional[Mapping[str, Any]]:
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self._table} WHERE _id = ?", (page_id,))
+            self._conn.execute(
+                f"DELETE FROM {self._relations} WHERE page_id = ?", (page_id,)
+            )
+        return super().remove(page_id)
+
+    def put_tombstone(
+        self, page_id: str, last_edited: str, removed_at: float, /
+    ) -> None:
+        super().put_tombstone(page_id, last_edited, removed_at)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO mirror_tombstones VALUES (?, ?, ?, ?)",
+                (self.name, page_id, last_edited, removed_at),
+            )
+
+    def remove_tombstone(self, page_id: str, /) -> None:
+        super().remove_tombstone(page_id)
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM mirror_tombstones WHERE name = ? AND page_id = ?",
+                (self.name, page_id),
+            )
+
+    def set_watermark(self, watermark: str, /) -> None:
+        super().set_watermark(watermark)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO mirror_watermarks VALUES (?, ?)",
+                (self.name, watermark),
+            )
+
+    def commit(self) -> None:
+        with self._lock:
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
+
+    def select(
+        self,
+        where: str = "1",
+        parameters: Sequence[Any] = (),
+        /,
+        *,
+        limit: Optional[int] = None,
+    ) -> list[Mapping[str, Any]]:
+        """
+        Pages matching an SQL `WHERE` clause on this mirror's table, in the order selected.
+        Properties are referenced by `column()` (e.g. `f"{store.column('timer')} > ?"`),
+        see the class docstring for the other columns.
+
+        ---
+        :param where: (optional) condition, may end with `ORDER BY`. every page by default.
+        :param parameters: (optional) values for `?` placeholders in `where`.
+        :param limit: (optional) max number of pages returned.
+        """
+        sql = f"SELECT _id FROM {self._table} WHERE {where}"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        with self._lock:
+            ids = [page_id for (page_id,) in self._conn.execute(sql, parameters)]
+        return [self.pages[page_id] for page_id in ids if page_id in self.pages]
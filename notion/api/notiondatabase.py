@@ -21,9 +21,13 @@
 # SOFTWARE.
 
 from __future__ import annotations
+import queue
+import threading
+from typing import Any
 from typing import Sequence
 from typing import Optional
 from typing import Union
+from typing import Iterator
 from typing import TYPE_CHECKING
 from functools import cached_property
 
@@ -32,7 +36,10 @@ import orjson
 from notion.properties import *
 from notion.core.typedefs import *
 from notion.core import notion_logger
+from notion.core.path import path
 from notion.api.notionblock import Block
+from notion.query.rows import Row
+from notion.query.rows import RowProjection
 from notion.api.blockmixin import _TokenBlockMixin
 from notion.exceptions.errors import NotionInvalidRequest
 from notion.exceptions.errors import NotionObjectNotFound
@@ -40,7 +47,9 @@ from notion.exceptions.errors import NotionObjectNotFound
 if TYPE_CHECKING:
     from notion.api.notionpage import Page
 
-__all__: Sequence[str] = ["Database"]
+__all__: Sequence[str] = ["Database", "SchemaUpdate"]
+
+_TITLE = path("title[0].text.content", default="")
 
 
 class Database(_TokenBlockMixin):
@@ -82,7 +91,10 @@ class Database(_TokenBlockMixin):
             raise NotionInvalidRequest(
                 f"{target_block.__repr__()} does not reference a Database"
             )
-        return super().__new__(cls)
+        instance = super().__new__(cls)
+        # reusing the block already retrieved, so `type` doesn't request it again.
+        instance.__dict__["_block"] = target_block._block
+        return instance
 
     def __init__(
         self,
@@ -150,10 +162,7 @@ class Database(_TokenBlockMixin):
 
     @property
     def title(self) -> str:
-        try:
-            return self.retrieve["title"][0]["text"]["content"]
-        except IndexError:
-            return ""
+        return str(_TITLE(self.retrieve))
 
     @title.setter
     def title(self, __new_title: str) -> None:
@@ -198,13 +207,31 @@ class Database(_TokenBlockMixin):
         """
         Updates an existing database as specified by the parameters.
         Used internally but optionally can update custom payloads.
+        The response is the updated database object, and replaces the cached schema.
 
         ---
         :param payload: (required) json payload for updated properties parameters.
 
         https://developers.notion.com/reference/update-a-database
         """
-        return self._patch(self._database_endpoint(self.id), payload=payload)
+        response = self._patch(self._database_endpoint(self.id), payload=payload)
+        if response.get("object") == "database":
+            self.__dict__["retrieve"] = response
+            self.__dict__["_property_schema"] = response["properties"]
+        return response
+
+    def schema_update(self) -> SchemaUpdate:
+        """
+        Returns a `notion.api.notiondatabase.SchemaUpdate` to collect multiple property changes,
+        which are sent in a single request with `SchemaUpdate.apply()`.
+
+        ```py
+        database.schema_update().rename("old name", "new name").add(
+            NumberPropertyObject("hours"), CheckboxPropertyObject("billed")
+        ).apply()
+        ```
+        """
+        return SchemaUpdate(self)
 
     def delete_property(self, name_or_id: str) -> None:
         """
@@ -229,6 +256,7 @@ class Database(_TokenBlockMixin):
         *,
         payload: Optional[Union[JSONObject, JSONPayload]] = None,
         filter_property_values: Optional[list[str]] = None,
+        cache: bool = True,
     ) -> JSONObject:
         """
         Gets a list of Pages contained in the database,
@@ -243,9 +271,152 @@ class Database(_TokenBlockMixin):
             filter objects built in `notion.query`
         :param filter_property_values: (optional) list of property names,
             query will only return the selected properties.
+        :param cache: (optional) if False, the query is always sent to Notion,
+            instead of using `_NotionClient.query_cache`.
 
         https://developers.notion.com/reference/post-database-query
         """
+        body = orjson.loads(payload) if isinstance(payload, (bytes, str)) else {}
+        if isinstance(payload, dict):
+            body |= payload
+        return self._query(body, filter_property_values, cache)
+
+    def iter_query(
+        self,
+        *,
+        payload: Optional[Union[JSONObject, JSONPayload]] = None,
+        filter_property_values: Optional[list[str]] = None,
+        page_size: int = 100,
+        limit: Optional[int] = None,
+        prefetch: int = 0,
+        cache: bool = True,
+    ) -> Iterator[JSONObject]:
+        """
+        Same as `query()`, but yields every matching page, one at a time,
+        following `next_cursor` until `has_more` is false.
+        Only one response of `page_size` results is held at a time,
+        plus the responses requested ahead with `prefetch`.
+        Stopping iteration early (e.g. `break`) doesn't request any further results.
+
+        ---
+        :param payload: (optional) filter/sort objects to apply to query.
+            filter objects built in `notion.query`
+        :param filter_property_values: (optional) list of property names,
+            query will only return the selected properties.
+        :param page_size: (optional) number of results per request, maximum 100.
+        :param limit: (optional) max number of pages to yield in total.
+        :param prefetch: (optional) number of responses to request in a background thread,
+            while the current results are still being processed. The thread holds one more
+            response while it waits for room, so up to `prefetch + 1` are requested ahead.
+            Requests ahead still count against `_NotionClient.rate_limiter`.
+        :param cache: (optional) if False, every response is requested from Notion,
+            instead of using `_NotionClient.query_cache`.
+
+        https://developers.notion.com/reference/pagination
+        """
+        responses = self._iter_query_responses(
+            filter_property_values, payload, page_size, limit, cache
+        )
+        if prefetch > 0:
+            responses = _prefetch(responses, prefetch)
+
+        for response in responses:
+            yield from response["results"]
+
+    def query_rows(
+        self,
+        properties: Sequence[str],
+        /,
+        *,
+        payload: Optional[Union[JSONObject, JSONPayload]] = None,
+        page_size: int = 100,
+        limit: Optional[int] = None,
+        prefetch: int = 0,
+        cache: bool = True,
+    ) -> Iterator[Row]:
+        """
+        Same as `iter_query()`, but only the selected properties are returned,
+        and each page is decoded into a typed `notion.query.rows.Row`.
+
+        ```py
+        for row in database.query_rows(["name", "timer"], payload=...):
+            row.id, row.name, row.timer  # str, str, float
+        ```
+
+        ---
+        :param properties: (required) names of the properties to return.
+            see `notion.query.rows` for how each property type is converted.
+        """
+        projection = RowProjection(self._property_schema, properties)
+        return map(
+            projection,
+            self.iter_query(
+                payload=payload,
+                filter_property_values=list(projection.properties),
+                page_size=page_size,
+                limit=limit,
+                prefetch=prefetch,
+                cache=cache,
+            ),
+        )
+
+    def _iter_query_responses(
+        self,
+        filter_property_values: Optional[list[str]],
+        payload: Optional[Union[JSONObject, JSONPayload]],
+        page_size: int,
+        limit: Optional[int],
+        cache: bool,
+    ) -> Iterator[JSONObject]:
+        body = orjson.loads(payload) if isinstance(payload, (bytes, str)) else {}
+        if isinstance(payload, dict):
+            body |= payload
+
+        page_size = max(1, min(page_size, 100))
+        remaining = limit
+        next_cursor: Optional[str] = None
+
+        while remaining is None or remaining > 0:
+            body["page_size"] = (
+                page_size if remaining is None else min(page_size, remaining)
+            )
+            if next_cursor:
+                body["start_cursor"] = next_cursor
+
+            response = self._query(body, filter_property_values, cache)
+            response.setdefault("results", [])
+            if remaining is not None:
+                response["results"] = response["results"][:remaining]
+                remaining -= len(response["results"])
+
+            yield response
+
+            next_cursor = response.get("next_cursor")
+            if not response.get("has_more") or not next_cursor:
+                return
+
+    def _query(
+        self,
+        body: JSONObject,
+        filter_property_values: Optional[list[str]],
+        cache: bool,
+    ) -> JSONObject:
+        query_url = self._query_endpoint(filter_property_values)
+        query_cache = self.query_cache
+        if not cache or not query_cache.enabled(self.id):
+            return self._post(query_url, payload=body)
+
+        key = query_cache.key(self.id, body, filter_property_values)
+        response = query_cache.get(self.id, key)
+        if response is None:
+            generation = query_cache.generation(self.id)
+            response = self._post(query_url, payload=body)
+            query_cache.put(self.id, key, response, generation)
+        return response
+
+    def _query_endpoint(
+        self, filter_property_values: Optional[list[str]] = None
+    ) -> str:
         query_url = self._database_endpoint(self.id, query=True)
 
         if filter_property_values:
@@ -253,18 +424,18 @@ class Database(_TokenBlockMixin):
             for name in filter_property_values:
                 name_id = self._property_schema[name].get("id")
                 query_url += "filter_properties=" + name_id + "&"
-            return self._post(query_url, payload=payload)
-        else:
-            return self._post(query_url, payload=payload)
+        return query_url
 
     def dual_relation_column(
         self, property_name: str, database_id: str, synced_property_name: str
-    ) -> None:
+    ) -> str:
         """
         :param database_id: (required) The database that the relation property refers to.
             The corresponding linked page values must belong to the database in order to be valid.
         :param synced_property_name: (required) The name of the corresponding property that is
             updated in the related database when this property is changed.
+
+        returns the id of the synced property in the related database.
         """
         self._update(
             Properties(
@@ -273,19 +444,25 @@ class Database(_TokenBlockMixin):
                 )
             )
         )
+        dual_property = self[property_name]["relation"]["dual_property"]
 
         # NOTE: there is an issue with the current API version and `synced_property_name`,
         # Notion UI will default to `Related to {original database name} ({property name})`,
         # regardless of what name is included in the request.
-        # TEMP fix to default synced property name
-        synced_database = Database(database_id)
-        try:
-            synced_database[f"Related to {self.title} ({property_name})"]
-            Database(database_id).rename_property(
-                f"Related to {self.title} ({property_name})", synced_property_name
+        # TEMP fix to rename the synced property by id, the response includes the name it was given.
+        if dual_property.get("synced_property_name") != synced_property_name:
+            self._patch(
+                self._database_endpoint(database_id),
+                payload=orjson.dumps(
+                    {
+                        "properties": {
+                            dual_property["synced_property_id"]: {
+                                "name": synced_property_name
+                            }
+                        }
+                    }
+                ),
             )
-        except NotionObjectNotFound:
-            pass
 
         self.logger.info(
             "{} {}".format(
@@ -293,6 +470,7 @@ class Database(_TokenBlockMixin):
                 f" linked to notion.Database('{database_id}').",
             )
         )
+        return str(dual_property["synced_property_id"])
 
     def single_relation_column(self, property_name: str, database_id: str) -> None:
         self._update(
@@ -435,3 +613,97 @@ class Database(_TokenBlockMixin):
     # NOTE:
     # It is not possible to update a status database property in the current API version.
     # Update these values from the Notion UI, instead.
+
+
+def _prefetch(responses: Iterator[JSONObject], depth: int) -> Iterator[JSONObject]:
+    """
+    Runs `responses` in a background thread, buffering up to `depth` responses ahead
+    of the caller, plus the one the thread holds while waiting for room in the buffer.
+    Errors are raised in the caller's thread when reached.
+    """
+    buffer: queue.Queue[tuple[str, Any]] = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(item: tuple[str, Any]) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for response in responses:
+                if not put(("response", response)):
+                    return
+            put(("done", None))
+        except BaseException as e:  # `_NotionErrors` derive from BaseException.
+            put(("error", e))
+
+    threading.Thread(target=produce, daemon=True).start()
+    try:
+        while True:
+            kind, item = buffer.get()
+            if kind == "error":
+                raise item
+            if kind == "done":
+                return
+            yield item
+    finally:
+        # lets the thread exit if iteration stopped early.
+        stop.set()
+
+
+class SchemaUpdate:
+    """
+    Collects property additions, renames, and deletions for a database,
+    and sends them as one update request with `apply()`.
+    Created with `notion.api.notiondatabase.Database.schema_update()`.
+
+    Properties can be referenced by name or id. When a property is renamed in the same
+    update that another property refers to it (e.g. a rollup of a relation), refer to it by id.
+
+    https://developers.notion.com/reference/update-a-database
+    """
+
+    __slots__: Sequence[str] = ("database", "_properties")
+
+    def __init__(self, database: Database, /) -> None:
+        self.database = database
+        self._properties: dict[str, Optional[JSONObject]] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self._properties)
+
+    def add(self, *property_objects: PropertyObject) -> SchemaUpdate:
+        """
+        :param property_objects: (required) property objects from `notion.properties`,
+            adding a property with the same name as an existing one will update/replace it.
+        """
+        self._properties |= Properties(*property_objects)["properties"]
+        return self
+
+    def rename(self, name_or_id: str, new_name: str) -> SchemaUpdate:
+        self._properties[name_or_id] = {"name": new_name}
+        return self
+
+    def delete(self, name_or_id: str) -> SchemaUpdate:
+        self._properties[name_or_id] = None
+        return self
+
+    def apply(self) -> JSONObject:
+        """
+        Sends all collected changes in one request,
+        and updates the cached schema of the database from the response.
+        """
+        if not self._properties:
+            return self.database.retrieve
+
+        response = self.database._update(payload={"properties": self._properties})
+        self.database.logger.info(
+            f"Updated properties {', '.join(f'`{p}`' for p in self._properties)}."
+        )
+        self._properties = {}
+        return response
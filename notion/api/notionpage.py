@@ -27,16 +27,14 @@ from typing import Optional
 from typing import Any
 from typing import TYPE_CHECKING
 from functools import cached_property
-from functools import reduce
-from operator import getitem
 from datetime import datetime
 
-from jsonpath_ng.ext import parse
-
 from notion.properties import *
 from notion.core.typedefs import *
 from notion.core import notion_logger
 from notion.core.build import build_payload
+from notion.core.build import PayloadTemplate
+from notion.core.path import path
 
 from notion.api.notionblock import Block
 from notion.api.notiondatabase import Database
@@ -46,9 +44,12 @@ from notion.exceptions.errors import NotionObjectNotFound
 
 if TYPE_CHECKING:
     from datetime import timedelta
+    from notion.api.journal import WriteJournal
 
 __all__: Sequence[str] = ["Page"]
 
+_TITLE = path("properties.title.title[0].text.content", default="")
+
 
 class Page(_TokenBlockMixin):
     """
@@ -72,6 +73,9 @@ class Page(_TokenBlockMixin):
         see https://developers.notion.com/reference/authentication.
     :param notion_version: (optional) API version
         see https://developers.notion.com/reference/versioning
+    :param journal: (optional) `notion.api.journal.WriteJournal`, if set, property updates
+        are appended to the journal and return immediately, instead of waiting on Notion.
+        The journal is replayed to Notion separately with `WriteJournal.replay()`.
 
     https://developers.notion.com/reference/page
     """
@@ -83,14 +87,21 @@ class Page(_TokenBlockMixin):
         *,
         token: Optional[str] = None,
         notion_version: Optional[str] = None,
+        journal: Optional[WriteJournal] = None,
     ) -> None:
         super().__init__(id, token=token, notion_version=notion_version)
 
+        self.journal = journal
         self.logger = notion_logger.getChild(f"{self.__repr__()}")
 
     @classmethod
     def create(
-        cls, parent_instance: Union[Page, Database, Block], /, *, page_title: str
+        cls,
+        parent_instance: Union[Page, Database, Block],
+        /,
+        *,
+        page_title: str,
+        properties: Optional[Properties] = None,
     ) -> Page:
         """
         Creates a blank page with properties.
@@ -101,21 +112,21 @@ class Page(_TokenBlockMixin):
         :param parent_instance: (required) an instance of
             `notion.api.notionpage.Page` or `notion.api.notiondatabase.Database`.
         :param page_title: (required)
+        :param properties: (optional) additional property values for the new page,
+            sent in the same request instead of one update per property.
         :param icon_url: (optional) #not yet implemented
         :param cover: (optional) #not yet implemented
 
         https://developers.notion.com/reference/post-page
         """
+        properties_ = Properties(TitlePropertyValue([RichText(page_title)]))
+        if properties:
+            properties_["properties"] |= properties["properties"]
+
         if parent_instance.type == "child_database":
-            payload = build_payload(
-                Parent.database(parent_instance.id),
-                Properties(TitlePropertyValue([RichText(page_title)])),
-            )
+            payload = build_payload(Parent.database(parent_instance.id), properties_)
         else:
-            payload = build_payload(
-                Parent.page(parent_instance.id),
-                Properties(TitlePropertyValue([RichText(page_title)])),
-            )
+            payload = build_payload(Parent.page(parent_instance.id), properties_)
 
         new_page = cls._post(parent_instance, cls._pages_endpoint(), payload=payload)
 
@@ -143,11 +154,7 @@ class Page(_TokenBlockMixin):
 
     @property
     def title(self) -> str:
-        title_keys = ["properties", "title", "title", 0, "text", "content"]
-        try:
-            return str(reduce(getitem, title_keys, self._retrieve))
-        except IndexError:
-            return ""
+        return str(_TITLE(self._retrieve))
 
     @title.setter
     def title(self, __new_title: str) -> None:
@@ -242,8 +249,13 @@ class Page(_TokenBlockMixin):
         If the parent is a database,
         new property values must conform to the parent database's property schema.
 
+        If the page has a `journal`, the update is appended to it and sent later.
+
         https://developers.notion.com/reference/patch-page
         """
+        if self.journal is not None:
+            seq = self.journal.append("PATCH", self._pages_endpoint(self.id), payload)
+            return {"object": "journal_entry", "seq": seq}
         return self._patch(self._pages_endpoint(self.id), payload=payload)
 
     def retrieve_page_content(
@@ -299,6 +311,8 @@ class Page(_TokenBlockMixin):
         :param select_option: (required) if the option already exists, then it is
             case sensitive. if the option does not exist, it will be created.
         """
+        from jsonpath_ng.ext import parse
+
         color = [
             m.value
             for m in parse(
@@ -325,6 +339,8 @@ class Page(_TokenBlockMixin):
             if the option already exists, then it is case sensitive.
             if the option does not exist, it will be created.
         """
+        from jsonpath_ng.ext import parse
+
         selected_options: list[Option] = []
 
         for option in multi_select_options:
@@ -349,6 +365,8 @@ class Page(_TokenBlockMixin):
             status option must already exist when using this endpoint.
             to create a new status option, use the database endpoints.
         """
+        from jsonpath_ng.ext import parse
+
         color = [
             m.value
             for m in parse(
@@ -388,6 +406,20 @@ class Page(_TokenBlockMixin):
             Properties(DatePropertyValue(column_name, start=start, end=end))
         )
 
+    def apply(self, template: PayloadTemplate, /, **values: Any) -> None:
+        """
+        Updates property values with a payload rendered from `template`, in one request.
+        datetime values are converted to the page's timezone, like in `set_date`.
+
+        ---
+        :param template: (required) `notion.core.build.PayloadTemplate` of a property update.
+        :param values: (required) a value for each slot in the template.
+        """
+        for name, value in values.items():
+            if isinstance(value, datetime):
+                values[name] = value.astimezone(self.tz)
+        self._patch_properties(template.render(**values))
+
     def set_related(self, column_name: str, related_ids: list[str]) -> None:
         """
         :param related_ids: (required) list of notion page ids to reference
@@ -27,8 +27,6 @@ from typing import TypeAlias
 from typing import MutableMapping
 from operator import methodcaller
 
-from jsonpath_ng.ext import parse
-
 from notion.api._about import *
 from notion.api._about import __notion_version__
 from notion.api.client import _NotionClient
@@ -134,6 +132,8 @@ class Workspace(_NotionClient):
         https://developers.notion.com/reference/get-users
         """
         if user_name:
+            from jsonpath_ng.ext import parse
+
             try:
                 user = [
                     m.value
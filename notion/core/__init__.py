@@ -24,9 +24,18 @@ from typing import Sequence
 import logging
 
 from notion.core.build import *
+from notion.core.path import *
 
 logging.basicConfig(level=logging.INFO)
 
 notion_logger = logging.getLogger("notion-api")
 
-__all__: Sequence[str] = ("NotionObject", "build_payload")
+__all__: Sequence[str] = (
+    "NotionObject",
+    "FrozenNotionObject",
+    "build_payload",
+    "Slot",
+    "PayloadTemplate",
+    "JSONPath",
+    "path",
+)
@@ -27,17 +27,27 @@ from typing import TypeVar
 from typing import Iterable
 from typing import Any
 
+import re
+
 import orjson
 
 from notion.core.typedefs import *
 
-__all__: Sequence[str] = ("NotionObject", "build_payload")
+__all__: Sequence[str] = (
+    "NotionObject",
+    "FrozenNotionObject",
+    "build_payload",
+    "Slot",
+    "PayloadTemplate",
+)
 
 _KT = TypeVar("_KT")
 _VT = TypeVar("_VT")
 
 
 def build_payload(*objects: dict[str, Any]) -> JSONPayload:
+    if len(objects) == 1 and isinstance(objects[0], FrozenNotionObject):
+        return objects[0].serialized
     final: dict[str, Any] = {}
     for o in objects:
         final |= o
@@ -57,7 +67,228 @@ class NotionObject(dict[str, Any], Generic[_KT, _VT]):
         if key not in self:
             self.set(key, {k: v})
         else:
-            self[key] |= {k: v}
+            self[key][k] = v
 
     def set_array(self, key: str, values: Union[Iterable[Any], JSONObject]) -> None:
         self[key] = list(values)
+
+
+class _FrozenDict(dict[str, Any]):
+    """Nested objects in a `FrozenNotionObject`, serialized by orjson like a dict."""
+
+    __slots__: Sequence[str] = ()
+
+    def _immutable(self, *args: Any, **kwargs: Any) -> None:
+        raise TypeError(f"{self.__class__.__name__} is immutable.")
+
+    __setitem__ = __delitem__ = __ior__ = _immutable  # type: ignore[assignment]
+    clear = pop = popitem = setdefault = update = _immutable  # type: ignore[assignment]
+
+    def __hash__(self) -> int:  # type: ignore[override]
+        return hash(orjson.dumps(self, option=orjson.OPT_SORT_KEYS))
+
+    def __copy__(self) -> "_FrozenDict":
+        return self
+
+    def __deepcopy__(self, memo: Any) -> "_FrozenDict":
+        return self
+
+    def __reduce__(self) -> Any:
+        return (_FrozenDict._from_items, (tuple(self.items()),))
+
+    @staticmethod
+    def _from_items(items: Iterable[tuple[str, Any]]) -> "_FrozenDict":
+        frozen = _FrozenDict()
+        dict.update(frozen, items)
+        return frozen
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        frozen = _FrozenDict()
+        dict.update(frozen, ((k, _freeze(v)) for k, v in value.items()))
+        return frozen
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+class FrozenNotionObject(NotionObject):
+    """
+    A `NotionObject` that can't be changed once built, used for filters and sorts.
+    Subclasses build themselves with `set()`/`nest()` in `__init__`, then call `_freeze()`.
+
+    Once frozen, nested objects are copied into immutable dicts and tuples,
+    the object is serialized once (`serialized`, with sorted keys),
+    and it's hashable, so the same object can be shared between threads,
+    reused in payloads, and used as a cache key.
+    """
+
+    __slots__: Sequence[str] = ("_serialized", "_hash")
+
+    def _freeze(self) -> None:
+        for k, v in self.items():
+            dict.__setitem__(self, k, _freeze(v))
+        serialized = orjson.dumps(self, option=orjson.OPT_SORT_KEYS)
+        object.__setattr__(self, "_serialized", serialized)
+        object.__setattr__(self, "_hash", hash(serialized))
+
+    @property
+    def frozen(self) -> bool:
+        return hasattr(self, "_serialized")
+
+    @property
+    def serialized(self) -> bytes:
+        """The JSON of this object, with sorted keys, computed once when frozen."""
+        return self._serialized
+
+    def _immutable(self, *args: Any, **kwargs: Any) -> None:
+        raise TypeError(f"{self.__class__.__name__} is immutable.")
+
+    def __setitem__(self, k: str, v: Any) -> None:
+        if self.frozen:
+            self._immutable()
+        super().__setitem__(k, v)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if self.frozen:
+            self._immutable()
+        object.__setattr__(self, name, value)
+
+    __delitem__ = __ior__ = _immutable  # type: ignore[assignment]
+    clear = pop = popitem = setdefault = update = _immutable  # type: ignore[assignment]
+
+    def nest(self, key, k: _KT, v: _VT) -> None:
+        if key not in self:
+            self.set(key, {k: v})
+        else:
+            self[key] = self[key] | {k: v}
+
+    def __hash__(self) -> int:  # type: ignore[override]
+        return self._hash
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, FrozenNotionObject) and other.frozen and self.frozen:
+            return self._serialized == other._serialized
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other: object) -> bool:
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __copy__(self) -> "FrozenNotionObject":
+        return self
+
+    def __deepcopy__(self, memo: Any) -> "FrozenNotionObject":
+        return self
+
+    def __reduce__(self) -> Any:
+        attributes = {
+            name: getattr(self, name)
+            for c in type(self).__mro__
+            for name in getattr(c, "__slots__", ())
+            if name not in ("_serialized", "_hash") and hasattr(self, name)
+        }
+        return (_thaw, (self.__class__, self._serialized, attributes))
+
+
+def _thaw(
+    cls: type[FrozenNotionObject], serialized: bytes, attributes: dict[str, Any]
+) -> FrozenNotionObject:
+    # unpickled without calling `__init__`, which may need arguments.
+    instance = cls.__new__(cls)
+    dict.update(instance, orjson.loads(serialized))
+    for name, value in attributes.items():
+        object.__setattr__(instance, name, value)
+    instance._freeze()
+    return instance
+
+
+class Slot(str):
+    """
+    Placeholder for a value filled in when a `PayloadTemplate` is rendered.
+    It's a string, so it can be passed to any property value or object in place of the value.
+    """
+
+    __slots__: Sequence[str] = ()
+
+    def __new__(cls, name: str) -> "Slot":
+        if not name.isidentifier():
+            raise ValueError(f"Slot name must be an identifier, not `{name}`.")
+        return super().__new__(cls, f"\x00{name}\x00")
+
+    @property
+    def name(self) -> str:
+        return self[1:-1]
+
+
+# how orjson serializes a `Slot`.
+_SLOT = re.compile(rb'"\\u0000(\w+)\\u0000"')
+
+
+class PayloadTemplate:
+    """
+    A payload built once, with `Slot` placeholders for the values that change.
+    Rendering only serializes the slot values, and joins them with the rest of the payload,
+    which was serialized when the template was created.
+
+    ```py
+    STOP_TIMER = PayloadTemplate(
+        Properties(
+            CheckboxPropertyValue("stop", True),
+            DatePropertyValue("override_end", start=Slot("end")),
+        )
+    )
+    page.apply(STOP_TIMER, end=datetime.now())
+    ```
+
+    ---
+    :param objects: (required) objects to build the payload from, as in `build_payload`.
+    """
+
+    __slots__: Sequence[str] = ("_static", "_names", "slots")
+
+    def __init__(self, *objects: dict[str, Any]) -> None:
+        pieces = _SLOT.split(build_payload(*objects))
+        # the serialized payload between slots, and the name of each slot in order.
+        self._static: tuple[bytes, ...] = tuple(pieces[::2])
+        self._names: tuple[str, ...] = tuple(name.decode() for name in pieces[1::2])
+        self.slots: frozenset[str] = frozenset(self._names)
+
+    def __repr__(self) -> str:
+        placeholders = (b'"<%s>"' % name.encode() for name in self._names)
+        payload = self._static[0] + b"".join(
+            p + s for p, s in zip(placeholders, self._static[1:])
+        )
+        return f"{self.__class__.__name__}({payload.decode()})"
+
+    def render(self, **values: Any) -> JSONPayload:
+        """
+        The payload with every slot replaced by its value, serialized like `build_payload`.
+
+        :raises `TypeError`: if a slot is missing a value, or a value isn't for a slot.
+        """
+        if values.keys() != self.slots:
+            missing = ", ".join(sorted(self.slots - values.keys()))
+            unknown = ", ".join(sorted(values.keys() - self.slots))
+            raise TypeError(
+                f"{self!r} missing values for: [{missing}], unknown slots: [{unknown}]."
+            )
+        rendered = [self._static[0]]
+        for name, static in zip(self._names, self._static[1:]):
+            rendered.append(_dumps(values[name]))
+            rendered.append(static)
+        return b"".join(rendered)
+
+
+def _dumps(value: Any) -> bytes:
+    # plain strings don't need escaping, and skip allocating an orjson output buffer.
+    if (
+        type(value) is str
+        and value.isascii()
+        and value.isprintable()
+        and '"' not in value
+        and "\\" not in value
+    ):
+        return b'"%s"' % value.encode()
+    return orjson.dumps(value)
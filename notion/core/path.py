@@ -0,0 +1,137 @@
+# MIT License
+
+# Copyright (c) 2023 ayvi#0001
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+""" Compiled getters for nested paths in Notion JSON objects.
+
+```py
+timer = notion.path("properties.timer.formula.number", type=float, default=0.0)
+title = notion.path("properties.name.title[0].text.content", default="")
+
+for page in database.iter_query():
+    timer(page), title(page)
+```
+"""
+from __future__ import annotations
+import re
+from typing import Any
+from typing import Callable
+from typing import Optional
+from typing import Sequence
+from typing import Union
+from functools import lru_cache
+from operator import itemgetter
+
+__all__: Sequence[str] = ["JSONPath", "path"]
+
+_SEGMENT = re.compile(r"([^.\[\]]+)|\[(\d+)\]")
+
+
+def _parse(expression: str) -> tuple[Union[str, int], ...]:
+    """
+    Keys are separated by `.`, list indexes are either a number between dots,
+    or in brackets after a key, e.g. `title.0.text` or `title[0].text`.
+    """
+    keys: list[Union[str, int]] = []
+    position = 0
+    for match in _SEGMENT.finditer(expression):
+        key, index = match.groups()
+        between = expression[position : match.start()]
+        # keys follow a `.` (except the first), indexes may follow a key directly.
+        valid = ("",) if not keys else ("", ".") if index is not None else (".",)
+        if between not in valid:
+            raise ValueError(f"Invalid path `{expression}` at position {position}.")
+        keys.append(
+            int(index) if index is not None else int(key) if key.isdigit() else key
+        )
+        position = match.end()
+
+    if not keys or position != len(expression):
+        raise ValueError(f"Invalid path `{expression}`.")
+    return tuple(keys)
+
+
+@lru_cache(maxsize=None)
+def _compile(keys: tuple[Union[str, int], ...]) -> Callable[[Any], Any]:
+    getters = tuple(itemgetter(k) for k in keys)
+    if len(getters) == 1:
+        return getters[0]
+
+    def get(obj: Any) -> Any:
+        for getter in getters:
+            obj = getter(obj)
+        return obj
+
+    return get
+
+
+class JSONPath:
+    """
+    A path into a JSON object, parsed and compiled once and called on each object.
+    Returns `default` if any key or index along the path is missing, or the value is null.
+
+    ---
+    :param expression: (required) keys separated by `.`, list indexes as `.0` or `[0]`.
+        keys that contain `.` or brackets can't be used in a path.
+    :param type: (optional) callable to convert the value with, e.g. `float`, `str`.
+    :param default: (optional) returned if the path doesn't exist or the value is null.
+
+    :raises `ValueError`: if the expression can't be parsed.
+    """
+
+    __slots__: Sequence[str] = ("expression", "keys", "type", "default", "_get")
+
+    def __init__(
+        self,
+        expression: str,
+        /,
+        *,
+        type: Optional[Callable[[Any], Any]] = None,
+        default: Any = None,
+    ) -> None:
+        self.expression = expression
+        self.keys = _parse(expression)
+        self.type = type
+        self.default = default
+        self._get = _compile(self.keys)
+
+    def __call__(self, obj: Any, /) -> Any:
+        try:
+            value = self._get(obj)
+        except (KeyError, IndexError, TypeError):
+            return self.default
+        if value is None:
+            return self.default
+        return self.type(value) if self.type is not None else value
+
+    def __repr__(self) -> str:
+        return f"notion.path('{self.expression}')"
+
+
+def path(
+    expression: str,
+    /,
+    *,
+    type: Optional[Callable[[Any], Any]] = None,
+    default: Any = None,
+) -> JSONPath:
+    """Compiles `expression` into a `notion.core.path.JSONPath`, see it for parameters."""
+    return JSONPath(expression, type=type, default=default)
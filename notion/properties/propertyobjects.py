@@ -40,7 +40,6 @@ from typing import Optional
 from typing import Union
 
 from notion.core import build
-from notion.exceptions import errors
 from notion.properties.options import PropertyColors
 from notion.properties.options import NotionNumberFormats
 from notion.properties.options import NotionFunctionFormats
@@ -134,13 +133,13 @@ class RelationPropertyObject(PropertyObject, build.NotionObject):
         synced_property_name: Optional[str] = None,
     ) -> None:
         super().__init__(property_name=property_name)
-        self._related_to_: _Dual_Property | _Single_Property
-
-        try:
-            self.set("type", "relation")
-            self.set("relation", self._related_to_)
-        except AttributeError:
-            raise errors.NotionInvalidJson("Use classmethods.")
+        self._related_to_: _Dual_Property | _Single_Property = (
+            _Dual_Property(database_id, synced_property_name)
+            if synced_property_name is not None
+            else _Single_Property(database_id)
+        )
+        self.set("type", "relation")
+        self.set("relation", self._related_to_)
 
     @classmethod
     def dual(cls, property_name: str, database_id: str, synced_property_name: str, /):
@@ -150,7 +149,6 @@ class RelationPropertyObject(PropertyObject, build.NotionObject):
         :param synced_property_name: (required) The name of the corresponding property that is
             updated in the related database when this property is changed.
         """
-        cls._related_to_ = _Dual_Property(database_id, synced_property_name)
         return cls(
             property_name,
             database_id=database_id,
@@ -163,7 +161,6 @@ class RelationPropertyObject(PropertyObject, build.NotionObject):
         :param database_id: (required) The database that the relation property refers to.
             The corresponding linked page values must belong to the database in order to be valid.
         """
-        cls._related_to_ = _Single_Property(database_id)
         return cls(property_name, database_id=database_id)
 
 
@@ -390,3 +387,22 @@ class RollupPropertyObject(PropertyObject, build.NotionObject):
         self.nest("rollup", "relation_property_name", relation_property_name)
         self.nest("rollup", "rollup_property_name", rollup_property_name)
         self.nest("rollup", "function", function)
+
+    @classmethod
+    def from_relation_id(
+        cls,
+        property_name: str,
+        relation_property_id: str,
+        rollup_property_name: str,
+        function: Union[NotionFunctionFormats, str],
+        /,
+    ):
+        """
+        References the relation column by id instead of name,
+        for when the relation is created or renamed in the same database update.
+        """
+        rollup = cls(property_name, relation_property_id, rollup_property_name, function)
+        rollup["rollup"]["relation_property_id"] = rollup["rollup"].pop(
+            "relation_property_name"
+        )
+        return rollup
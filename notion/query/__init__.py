@@ -34,12 +34,18 @@ Visit https://developers.notion.com/reference/post-database-query for info on da
     Create a separate CompoundFilter object to nest an `and` operator inside another `and` or `or`.
 
 `notion.query.SortFilter` contains a list of either *`notion.query.PropertyValueSort` || `notion.query.EntryTimestampSort`
+
+`notion.query.LocalQuery` evaluates filter and sort objects against pages in memory, without a request.
+
+`notion.query.RowProjection` decodes selected properties of query results into typed `notion.query.Row` objects.
 """
 from notion.query.compound import *
 from notion.query.conditions import *
 from notion.query.propfilter import *
 from notion.query.timestamp import *
 from notion.query.sort import *
+from notion.query.rows import *
+from notion.query.local import *
 
 from typing import Sequence
 
@@ -50,4 +56,7 @@ __all__: Sequence[str] = (
     "TimestampFilter",
     "EntryTimestampSort",
     "PropertyValueSort",
+    "Row",
+    "RowProjection",
+    "LocalQuery",
 )
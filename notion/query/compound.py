@@ -23,6 +23,7 @@
 from __future__ import annotations
 from typing import Sequence
 from typing import Union
+from typing import Optional
 
 from notion.core import build
 from notion.query.propfilter import PropertyFilter
@@ -31,12 +32,14 @@ from notion.query.timestamp import TimestampFilter
 __all__: Sequence[str] = ["CompoundFilter"]
 
 
-class CompoundFilter(build.NotionObject):
+class CompoundFilter(build.FrozenNotionObject):
     """NOTE: only up to two nesting levels deep.
 
     :method _and(): combine all filters in an `and` grouping.
     :method _or(): combine all filters in an `or` grouping.
 
+    Both return a new filter, like other filters a CompoundFilter can't be changed once built.
+
     Create a separate CompoundFilter object to nest an `and` operator inside another `and` or `or`.
 
     https://developers.notion.com/reference/post-database-query-filter#compound-filter-object
@@ -44,18 +47,32 @@ class CompoundFilter(build.NotionObject):
 
     __slots__: Sequence[str] = ()
 
-    def __init__(self) -> None:
+    def __init__(
+        self, operator: Optional[str] = None, *filters: FilterTypeObjects
+    ) -> None:
         super().__init__()
+        if operator is not None:
+            filters_ = [f["filter"] if "filter" in f else f for f in filters]
+            self.nest("filter", operator, filters_)
+        self._freeze()
 
     def _and(self, *filters: FilterTypeObjects) -> CompoundFilter:
-        filters_ = [f["filter"] if "filter" in f else f for f in filters]
-        self.nest("filter", "and", filters_)
-        return self
+        return self._combine("and", filters)
 
     def _or(self, *filters: FilterTypeObjects) -> CompoundFilter:
-        filters_ = [f["filter"] if "filter" in f else f for f in filters]
-        self.nest("filter", "or", filters_)
-        return self
+        return self._combine("or", filters)
+
+    def _combine(
+        self, operator: str, filters: tuple[FilterTypeObjects, ...]
+    ) -> CompoundFilter:
+        combined = CompoundFilter(operator, *filters)
+        if "filter" not in self:
+            return combined
+        # chaining `_and()` and `_or()` still puts both operators in the same `filter` object.
+        existing = CompoundFilter.__new__(CompoundFilter)
+        dict.update(existing, {"filter": self["filter"] | combined["filter"]})
+        existing._freeze()
+        return existing
 
 
 FilterTypeObjects = Union[PropertyFilter, CompoundFilter, TimestampFilter]
@@ -0,0 +1,458 @@
+# MIT License
+
+# Copyright (c) 2023 ayvi#0001
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+""" Evaluating database query filters and sorts locally.
+
+A `LocalQuery` takes the same filter/sort objects as `notion.build_payload`
+and runs them against pages already in memory, e.g. from a mirror of a database,
+instead of sending them to Notion.
+
+```py
+today = LocalQuery(PropertyFilter.text("name", "title", "equals", date.today()))
+rollup_page = today(pages, limit=1)
+```
+
+Supported filters:
+    text (title, rich_text, url, email, phone_number), number, checkbox,
+    select, multi_select, status, date (incl. relative dates), created_time, last_edited_time,
+    people, files, relation, formula, rollup, timestamp, and `and`/`or` compound filters.
+
+Differences from Notion:
+    - text conditions are case-insensitive.
+    - `this_week` starts on Sunday, relative dates are in UTC.
+    - archived pages never match.
+"""
+from __future__ import annotations
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import Mapping
+from typing import Optional
+from typing import Sequence
+from typing import Union
+from datetime import date
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from functools import lru_cache
+
+import orjson
+
+from notion.core.build import build_payload
+from notion.core.typedefs import JSONPayload
+from notion.query.rows import _DECODERS
+from notion.query.rows import _date
+
+__all__: Sequence[str] = ["LocalQuery"]
+
+Page = Mapping[str, Any]
+Predicate = Callable[[Page, datetime], bool]
+Test = Callable[[Any, datetime], bool]
+
+_MS = timedelta(milliseconds=1)
+_DAY = timedelta(days=1)
+_WEEK = timedelta(days=7)
+
+_RELATIVE_CONDITIONS = (
+    "past_week",
+    "past_month",
+    "past_year",
+    "this_week",
+    "next_week",
+    "next_month",
+    "next_year",
+)
+_TEXT_TYPES = ("title", "rich_text", "url", "email", "phone_number")
+_MULTI_TYPES = ("multi_select", "relation", "people", "created_by", "last_edited_by")
+_DATE_TYPES = ("date", "created_time", "last_edited_time")
+
+
+def _utc(value: datetime) -> datetime:
+    # dates and times without a timezone are in UTC, same as in Notion.
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def _user(value: Mapping[str, Any], key: str) -> tuple[str, ...]:
+    user = value.get(key)
+    return (user["id"],) if user else ()
+
+
+_LOCAL_DECODERS = _DECODERS | {"created_by": _user, "last_edited_by": _user}
+
+
+def _decode(prop: Optional[Mapping[str, Any]], type: str) -> Any:
+    if prop is None:
+        return None
+    decoder = _LOCAL_DECODERS.get(type)
+    value = decoder(prop, type) if decoder else prop.get(type)
+    return _utc(value) if isinstance(value, datetime) else value
+
+
+def _text(condition: str, target: Any) -> Test:
+    target = str(target).casefold() if target is not None else ""
+    tests: dict[str, Test] = {
+        "equals": lambda v, _: v is not None and v.casefold() == target,
+        "does_not_equal": lambda v, _: v is None or v.casefold() != target,
+        "contains": lambda v, _: v is not None and target in v.casefold(),
+        "does_not_contain": lambda v, _: v is None or target not in v.casefold(),
+        "starts_with": lambda v, _: v is not None and v.casefold().startswith(target),
+        "ends_with": lambda v, _: v is not None and v.casefold().endswith(target),
+        "is_empty": lambda v, _: not v,
+        "is_not_empty": lambda v, _: bool(v),
+    }
+    return tests[condition]
+
+
+def _number(condition: str, target: Any) -> Test:
+    tests: dict[str, Test] = {
+        "equals": lambda v, _: v is not None and v == target,
+        "does_not_equal": lambda v, _: v is None or v != target,
+        "greater_than": lambda v, _: v is not None and v > target,
+        "less_than": lambda v, _: v is not None and v < target,
+        "greater_than_or_equal_to": lambda v, _: v is not None and v >= target,
+        "less_than_or_equal_to": lambda v, _: v is not None and v <= target,
+        "is_empty": lambda v, _: v is None,
+        "is_not_empty": lambda v, _: v is not None,
+    }
+    return tests[condition]
+
+
+def _checkbox(condition: str, target: Any) -> Test:
+    tests: dict[str, Test] = {
+        "equals": lambda v, _: bool(v) is bool(target),
+        "does_not_equal": lambda v, _: bool(v) is not bool(target),
+    }
+    return tests[condition]
+
+
+def _option(condition: str, target: Any) -> Test:
+    # select & status, option names are compared exactly.
+    tests: dict[str, Test] = {
+        "equals": lambda v, _: v == target,
+        "does_not_equal": lambda v, _: v != target,
+        "is_empty": lambda v, _: v is None,
+        "is_not_empty": lambda v, _: v is not None,
+    }
+    return tests[condition]
+
+
+def _multi(condition: str, target: Any) -> Test:
+    # multi_select names, relation page ids, people user ids.
+    tests: dict[str, Test] = {
+        "contains": lambda v, _: target in (v or ()),
+        "does_not_contain": lambda v, _: target not in (v or ()),
+        "is_empty": lambda v, _: not v,
+        "is_not_empty": lambda v, _: bool(v),
+    }
+    return tests[condition]
+
+
+def _files(condition: str, target: Any) -> Test:
+    tests: dict[str, Test] = {
+        "is_empty": lambda v, _: not v,
+        "is_not_empty": lambda v, _: bool(v),
+    }
+    return tests[condition]
+
+
+def _shift_months(value: datetime, months: int) -> datetime:
+    month = value.month - 1 + months
+    year, month = value.year + month // 12, month % 12 + 1
+    day = min(value.day, 31)
+    while True:
+        try:
+            return value.replace(year=year, month=month, day=day)
+        except ValueError:
+            day -= 1
+
+
+@lru_cache(maxsize=64)
+def _relative_range(condition: str, now: datetime) -> tuple[datetime, datetime]:
+    """`[start, end)` of a relative date condition, `now` included in past ranges."""
+    if condition == "this_week":
+        midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        sunday = midnight - timedelta(days=(now.weekday() + 1) % 7)
+        return sunday, sunday + _WEEK
+    ranges = {
+        "past_week": (now - _WEEK, now + _MS),
+        "past_month": (_shift_months(now, -1), now + _MS),
+        "past_year": (_shift_months(now, -12), now + _MS),
+        "next_week": (now, now + _WEEK),
+        "next_month": (now, _shift_months(now, 1)),
+        "next_year": (now, _shift_months(now, 12)),
+    }
+    return ranges[condition]
+
+
+def _date_range(target: Any) -> tuple[datetime, datetime]:
+    """
+    `[start, end)` of a date filter value.
+    A date covers the whole UTC day, a date with a time is compared with millisecond precision.
+    """
+    if isinstance(target, str) and len(target) == 10:
+        start = _utc(datetime.fromisoformat(target))
+        return start, start + _DAY
+    if isinstance(target, date) and not isinstance(target, datetime):
+        start = datetime(target.year, target.month, target.day, tzinfo=timezone.utc)
+        return start, start + _DAY
+    instant = _utc(
+        target if isinstance(target, datetime) else datetime.fromisoformat(target)
+    )
+    return instant, instant + _MS
+
+
+def _date_condition(condition: str, target: Any) -> Test:
+    if condition == "is_empty":
+        return lambda v, _: v is None
+    if condition == "is_not_empty":
+        return lambda v, _: v is not None
+    if condition in ("equals", "before", "after", "on_or_before", "on_or_after"):
+        start, end = _date_range(target)
+        tests: dict[str, Test] = {
+            "equals": lambda v, _: v is not None and start <= v < end,
+            "before": lambda v, _: v is not None and v < start,
+            "after": lambda v, _: v is not None and v >= end,
+            "on_or_before": lambda v, _: v is not None and v < end,
+            "on_or_after": lambda v, _: v is not None and v >= start,
+        }
+        return tests[condition]
+
+    if condition not in _RELATIVE_CONDITIONS:
+        raise KeyError(condition)
+
+    def relative(v: Optional[datetime], now: datetime) -> bool:
+        if v is None:
+            return False
+        start, end = _relative_range(condition, now)
+        return start <= v < end
+
+    return relative
+
+
+_CONDITIONS: dict[str, Callable[[str, Any], Test]] = {
+    **{t: _text for t in _TEXT_TYPES},
+    **{t: _multi for t in _MULTI_TYPES},
+    **{t: _date_condition for t in _DATE_TYPES},
+    "number": _number,
+    "checkbox": _checkbox,
+    "select": _option,
+    "status": _option,
+    "files": _files,
+}
+
+# formula & rollup filters name the type of their result instead of the property type.
+_RESULT_TYPES: dict[str, str] = {
+    "string": "rich_text",
+    "number": "number",
+    "checkbox": "checkbox",
+    "date": "date",
+}
+
+
+def _condition(type: str, conditions: Mapping[str, Any]) -> Test:
+    if len(conditions) != 1:
+        raise ValueError(f"Expected one condition for `{type}`, got {conditions}.")
+    ((condition, target),) = conditions.items()
+    try:
+        return _CONDITIONS[type](condition, target)
+    except KeyError:
+        raise ValueError(
+            f"Condition `{condition}` is not supported for `{type}` filters."
+        ) from None
+
+
+def _formula_test(conditions: Mapping[str, Any]) -> Test:
+    ((result_type, result_conditions),) = conditions.items()
+    return _condition(_RESULT_TYPES.get(result_type, result_type), result_conditions)
+
+
+def _rollup_test(conditions: Mapping[str, Any]) -> Test:
+    ((aggregate, inner),) = conditions.items()
+    if aggregate in ("number", "date"):
+        return _condition(aggregate, inner)
+
+    ((item_type, item_conditions),) = inner.items()
+    item_test = _condition(_RESULT_TYPES.get(item_type, item_type), item_conditions)
+    quantifiers: dict[str, Callable[[Iterable[bool]], bool]] = {
+        "any": any,
+        "every": all,
+        "none": lambda results: not any(results),
+    }
+    quantifier = quantifiers[aggregate]
+
+    def test(items: Any, now: datetime) -> bool:
+        return quantifier(item_test(item, now) for item in items or ())
+
+    return test
+
+
+def _rollup_value(prop: Optional[Mapping[str, Any]], type: str) -> Any:
+    # array rollups are decoded item by item, each item has its own `type`.
+    rollup = prop.get("rollup") if prop else None
+    if not rollup or rollup.get("type") != "array":
+        return _decode(prop, type)
+    return [_decode(item, item["type"]) for item in rollup["array"]]
+
+
+def _compile_filter(filter: Mapping[str, Any]) -> Predicate:
+    if "and" in filter or "or" in filter:
+        combine = all if "and" in filter else any
+        predicates = tuple(
+            _compile_filter(f) for f in filter.get("and", filter.get("or"))
+        )
+        return lambda page, now: combine(p(page, now) for p in predicates)
+
+    if "timestamp" in filter:
+        timestamp = filter["timestamp"]
+        test = _condition("date", filter[timestamp])
+
+        def timestamp_predicate(page: Page, now: datetime) -> bool:
+            value = page.get(timestamp)
+            return test(_utc(datetime.fromisoformat(value)) if value else None, now)
+
+        return timestamp_predicate
+
+    name = filter["property"]
+    ((type, conditions),) = ((k, v) for k, v in filter.items() if k != "property")
+    if type == "formula":
+        test, decode = _formula_test(conditions), _decode
+    elif type == "rollup":
+        test, decode = _rollup_test(conditions), _rollup_value
+    else:
+        test, decode = _condition(type, conditions), _decode
+
+    def property_predicate(page: Page, now: datetime) -> bool:
+        return test(decode(page["properties"].get(name), type), now)
+
+    return property_predicate
+
+
+def _sort_value(sort: Mapping[str, Any]) -> Callable[[Page], Any]:
+    if "timestamp" in sort:
+        timestamp = sort["timestamp"]
+        return lambda page: _date(page, timestamp)
+
+    name = sort["property"]
+
+    def value(page: Page) -> Any:
+        prop = page["properties"].get(name)
+        value = _decode(prop, prop["type"]) if prop else None
+        return value.casefold() if isinstance(value, str) else value
+
+    return value
+
+
+def _sort_key(sort: Mapping[str, Any]) -> Callable[[Page], tuple[bool, Any]]:
+    # empty values are last in either direction, like in Notion.
+    value = _sort_value(sort)
+    if sort.get("direction") == "descending":
+
+        def descending(page: Page) -> tuple[bool, Any]:
+            v = value(page)
+            return v is not None, v
+
+        return descending
+
+    def ascending(page: Page) -> tuple[bool, Any]:
+        v = value(page)
+        return v is None, v
+
+    return ascending
+
+
+class LocalQuery:
+    """
+    Filters and sorts pages in memory, the same way a database query with the same payload would.
+
+    ---
+    :param objects: (optional) filter and sort objects, as passed to `notion.build_payload`.
+        no filter matches every page, no sort keeps the order pages are given in.
+
+    :raises `ValueError`: if a filter uses a condition that can't be evaluated locally.
+    """
+
+    __slots__: Sequence[str] = ("payload", "_predicate", "_sorts")
+
+    def __init__(self, *objects: Mapping[str, Any]) -> None:
+        self._compile(orjson.loads(build_payload(*objects)))
+
+    @classmethod
+    def from_payload(
+        cls, payload: Union[JSONPayload, Mapping[str, Any]], /
+    ) -> LocalQuery:
+        """Creates a local query from a payload built for `Database.query`."""
+        query = cls.__new__(cls)
+        query._compile(
+            payload if isinstance(payload, Mapping) else orjson.loads(payload)
+        )
+        return query
+
+    def _compile(self, payload: Mapping[str, Any]) -> None:
+        self.payload = payload
+        self._predicate: Optional[Predicate] = (
+            _compile_filter(payload["filter"]) if payload.get("filter") else None
+        )
+        self._sorts: tuple[tuple[Callable[[Page], Any], bool], ...] = tuple(
+            (_sort_key(s), s.get("direction") == "descending")
+            for s in payload.get("sorts") or ()
+        )
+
+    def matches(self, page: Page, /, *, now: Optional[datetime] = None) -> bool:
+        """
+        :param now: (optional) reference time for relative date conditions, defaults to the current time.
+        """
+        if page.get("archived") or page.get("in_trash"):
+            return False
+        if self._predicate is None:
+            return True
+        return self._predicate(page, _utc(now) if now else datetime.now(timezone.utc))
+
+    def __call__(
+        self,
+        pages: Iterable[Page],
+        /,
+        *,
+        limit: Optional[int] = None,
+        now: Optional[datetime] = None,
+    ) -> list[Page]:
+        """
+        Returns the pages that match the filter, in sorted order.
+
+        ---
+        :param pages: (required) pages in the shape returned by a database query.
+        :param limit: (optional) maximum number of pages returned.
+        :param now: (optional) reference time for relative date conditions, defaults to the current time.
+        """
+        now = _utc(now) if now else datetime.now(timezone.utc)
+        predicate = self._predicate
+        results = [
+            page
+            for page in pages
+            if not (page.get("archived") or page.get("in_trash"))
+            and (predicate is None or predicate(page, now))
+        ]
+        # sorted from the last sort to the first, the first sort takes precedence.
+        for key, descending in reversed(self._sorts):
+            results.sort(key=key, reverse=descending)
+        return results[:limit] if limit is not None else results
+
+    def __repr__(self) -> str:
+        return f"LocalQuery({orjson.dumps(self.payload).decode()})"
@@ -30,7 +30,7 @@ from notion.query.conditions import *
 __all__: Sequence[str] = ["PropertyFilter"]
 
 
-class PropertyFilter(build.NotionObject):
+class PropertyFilter(build.FrozenNotionObject):
     """A filter is a single condition used to specify and limit the entries returned from a database query.
     Database queries can be filtered by page property values.
     The API supports filtering by the following property types:
@@ -39,6 +39,8 @@ class PropertyFilter(build.NotionObject):
 
     You may also filter a database by created_time or last_edited_time, even if these aren't present as properties on the database.
 
+    Filters are immutable and hashable once built, see `notion.core.build.FrozenNotionObject`.
+
     https://developers.notion.com/reference/post-database-query-filter
 
     Each database property filter object must contain a property key
@@ -59,12 +61,15 @@ class PropertyFilter(build.NotionObject):
         filter_condition: FilterConditions,
         filter_value: Any,
         /,
+        *,
+        property_type: str,
     ) -> None:
         super().__init__()
-        self._property_type: str
+        self._property_type: str = property_type
         self._property_name: str = property_name
         self.nest("filter", "property", property_name)
-        self.nest("filter", self._property_type, {filter_condition: filter_value})
+        self.nest("filter", property_type, {filter_condition: filter_value})
+        self._freeze()
 
     @classmethod
     def text(
@@ -75,8 +80,9 @@ class PropertyFilter(build.NotionObject):
         filter_value: Any,
         /,
     ) -> PropertyFilter:
-        cls._property_type = property_type
-        return cls(property_name, filter_condition, filter_value)
+        return cls(
+            property_name, filter_condition, filter_value, property_type=property_type
+        )
 
     @classmethod
     def checkbox(
@@ -86,8 +92,9 @@ class PropertyFilter(build.NotionObject):
         filter_value: bool,
         /,
     ) -> PropertyFilter:
-        cls._property_type = "checkbox"
-        return cls(property_name, filter_condition, filter_value)
+        return cls(
+            property_name, filter_condition, filter_value, property_type="checkbox"
+        )
 
     @classmethod
     def number(
@@ -97,8 +104,9 @@ class PropertyFilter(build.NotionObject):
         filter_value: Any,
         /,
     ) -> PropertyFilter:
-        cls._property_type = "number"
-        return cls(property_name, filter_condition, filter_value)
+        return cls(
+            property_name, filter_condition, filter_value, property_type="number"
+        )
 
     @classmethod
     def select(
@@ -108,8 +116,9 @@ class PropertyFilter(build.NotionObject):
         filter_value: Any,
         /,
     ) -> PropertyFilter:
-        cls._property_type = "select"
-        return cls(property_name, filter_condition, filter_value)
+        return cls(
+            property_name, filter_condition, filter_value, property_type="select"
+        )
 
     @classmethod
     def multi_select(
@@ -119,8 +128,9 @@ class PropertyFilter(build.NotionObject):
         filter_value: Any,
         /,
     ) -> PropertyFilter:
-        cls._property_type = "multi_select"
-        return cls(property_name, filter_condition, filter_value)
+        return cls(
+            property_name, filter_condition, filter_value, property_type="multi_select"
+        )
 
     @classmethod
     def status(
@@ -130,8 +140,9 @@ class PropertyFilter(build.NotionObject):
         filter_value: Any,
         /,
     ) -> PropertyFilter:
-        cls._property_type = "status"
-        return cls(property_name, filter_condition, filter_value)
+        return cls(
+            property_name, filter_condition, filter_value, property_type="status"
+        )
 
     @classmethod
     def date(
@@ -143,8 +154,9 @@ class PropertyFilter(build.NotionObject):
         /,
     ) -> PropertyFilter:
         """When selecting any DateCondition containing `past`, `this`, or `next`, set filter value to `{}`"""
-        cls._property_type = property_type
-        return cls(property_name, filter_condition, filter_value)
+        return cls(
+            property_name, filter_condition, filter_value, property_type=property_type
+        )
 
     @classmethod
     def people(
@@ -155,8 +167,9 @@ class PropertyFilter(build.NotionObject):
         filter_value: Any,
         /,
     ) -> PropertyFilter:
-        cls._property_type = property_type
-        return cls(property_name, filter_condition, filter_value)
+        return cls(
+            property_name, filter_condition, filter_value, property_type=property_type
+        )
 
     @classmethod
     def files(
@@ -167,8 +180,7 @@ class PropertyFilter(build.NotionObject):
 
         https://developers.notion.com/reference/post-database-query-filter#files-filter-condition
         """
-        cls._property_type = "files"
-        return cls(property_name, filter_condition, filter_value)
+        return cls(property_name, filter_condition, filter_value, property_type="files")
 
     @classmethod
     def relation(
@@ -178,5 +190,6 @@ class PropertyFilter(build.NotionObject):
         filter_value: Any,
         /,
     ) -> PropertyFilter:
-        cls._property_type = "relation"
-        return cls(property_name, filter_condition, filter_value)
+        return cls(
+            property_name, filter_condition, filter_value, property_type="relation"
+        )
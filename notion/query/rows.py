@@ -0,0 +1,196 @@
+# MIT License
+
+# Copyright (c) 2023 ayvi#0001
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+""" Typed rows for database query results.
+
+A `RowProjection` decodes only the selected properties of each page into a `Row`,
+a `__slots__` class with one attribute per property, converted to python types:
+
+    title, rich_text, url, email, phone_number, select, status -> str
+    number -> float
+    checkbox -> bool
+    date, created_time, last_edited_time -> datetime
+    multi_select, relation, people -> tuple[str, ...]
+    formula, rollup -> decoded by the type of the result
+
+Empty values are `None`.
+"""
+from __future__ import annotations
+from typing import Any
+from typing import Callable
+from typing import Optional
+from typing import Sequence
+from typing import Mapping
+from datetime import datetime
+from functools import lru_cache
+
+__all__: Sequence[str] = ["Row", "RowProjection"]
+
+
+def _text(value: Mapping[str, Any], key: str) -> Optional[str]:
+    if not (rich_text := value.get(key)):
+        return None
+    if len(rich_text) == 1:
+        return rich_text[0]["plain_text"]
+    return "".join(t["plain_text"] for t in rich_text)
+
+
+def _number(value: Mapping[str, Any], key: str) -> Optional[float]:
+    number = value.get(key)
+    return float(number) if number is not None else None
+
+
+def _checkbox(value: Mapping[str, Any], key: str) -> Optional[bool]:
+    checkbox = value.get(key)
+    return bool(checkbox) if checkbox is not None else None
+
+
+def _date(value: Mapping[str, Any], key: str) -> Optional[datetime]:
+    date = value.get(key)
+    if isinstance(date, dict):
+        date = date.get("start")
+    return datetime.fromisoformat(date) if date else None
+
+
+def _string(value: Mapping[str, Any], key: str) -> Optional[str]:
+    return value.get(key)
+
+
+def _name(value: Mapping[str, Any], key: str) -> Optional[str]:
+    option = value.get(key)
+    return option["name"] if option else None
+
+
+def _names(value: Mapping[str, Any], key: str) -> tuple[str, ...]:
+    return tuple(o["name"] for o in value.get(key) or ())
+
+
+def _ids(value: Mapping[str, Any], key: str) -> tuple[str, ...]:
+    return tuple(o["id"] for o in value.get(key) or ())
+
+
+def _result(value: Mapping[str, Any], key: str) -> Any:
+    # formula and rollup values contain their own `type` key for the result.
+    result = value.get(key)
+    if not result:
+        return None
+    decoder = _DECODERS.get(result["type"])
+    return decoder(result, result["type"]) if decoder else result.get(result["type"])
+
+
+_DECODERS: dict[str, Callable[[Mapping[str, Any], str], Any]] = {
+    "title": _text,
+    "rich_text": _text,
+    "number": _number,
+    "checkbox": _checkbox,
+    "boolean": _checkbox,
+    "date": _date,
+    "created_time": _date,
+    "last_edited_time": _date,
+    "string": _string,
+    "url": _string,
+    "email": _string,
+    "phone_number": _string,
+    "select": _name,
+    "status": _name,
+    "multi_select": _names,
+    "relation": _ids,
+    "people": _ids,
+    "formula": _result,
+    "rollup": _result,
+}
+
+
+class Row:
+    """
+    Base class for rows created by `notion.query.rows.RowProjection`.
+    Every row has the page `id`, and one attribute per projected property.
+    """
+
+    __slots__: Sequence[str] = ("id",)
+
+    def __init__(self, id: str, *values: Any) -> None:
+        self.id = id
+        for attr, value in zip(self.__slots__, values):
+            setattr(self, attr, value)
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{a}={getattr(self, a)!r}" for a in self._fields())
+        return f"{self.__class__.__name__}(id={self.id!r}, {values})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Row) or type(self) is not type(other):
+            return NotImplemented
+        return all(
+            getattr(self, a) == getattr(other, a) for a in ("id", *self._fields())
+        )
+
+    @classmethod
+    def _fields(cls) -> Sequence[str]:
+        return cls.__slots__
+
+    def _asdict(self) -> dict[str, Any]:
+        return {a: getattr(self, a) for a in ("id", *self._fields())}
+
+
+def _attribute(property_name: str) -> str:
+    attr = "".join(c if c.isalnum() else "_" for c in property_name).lower()
+    return f"_{attr}" if not attr or attr[0].isdigit() or attr == "id" else attr
+
+
+@lru_cache(maxsize=None)
+def _row_class(attributes: tuple[str, ...]) -> type[Row]:
+    return type("Row", (Row,), {"__slots__": attributes})
+
+
+class RowProjection:
+    """
+    Decodes pages from a database query into `notion.query.rows.Row` objects,
+    reading only `properties`. Attribute names are the property names,
+    lowercase with non-alphanumeric characters replaced with `_`.
+
+    Usually created through `notion.api.notiondatabase.Database.query_rows()`.
+
+    ---
+    :param schema: (required) the database property schema, `Database._property_schema`.
+    :param properties: (required) names of the properties to decode.
+
+    :raises `KeyError`: if a property is not in the schema.
+    """
+
+    __slots__: Sequence[str] = ("properties", "row_class", "_fields")
+
+    def __init__(self, schema: Mapping[str, Any], properties: Sequence[str], /) -> None:
+        self.properties = tuple(properties)
+        self.row_class = _row_class(tuple(_attribute(p) for p in self.properties))
+        self._fields = tuple(
+            (name, schema[name]["type"], _DECODERS.get(schema[name]["type"], _string))
+            for name in self.properties
+        )
+
+    def __call__(self, page: Mapping[str, Any], /) -> Row:
+        properties = page["properties"]
+        values = []
+        for name, type, decoder in self._fields:
+            value = properties.get(name)
+            values.append(decoder(value, type) if value is not None else None)
+        return self.row_class(page["id"], *values)
@@ -30,7 +30,7 @@ from notion.core import build
 __all__: Sequence[str] = ("SortFilter", "PropertyValueSort", "EntryTimestampSort")
 
 
-class SortFilter(build.NotionObject):
+class SortFilter(build.FrozenNotionObject):
     """ 
     A sort is a condition used to order the entries returned from a database query.
     A database query can be sorted by a property and/or timestamp and in a given direction. 
@@ -52,9 +52,10 @@ class SortFilter(build.NotionObject):
     ) -> None:
         super().__init__()
         self.set("sorts", sort_object)
+        self._freeze()
 
 
-class PropertyValueSort(build.NotionObject):
+class PropertyValueSort(build.FrozenNotionObject):
     """
     This sort orders the database query by a particular property.
     https://developers.notion.com/reference/post-database-query-sort#sort-object
@@ -68,6 +69,7 @@ class PropertyValueSort(build.NotionObject):
         super().__init__()
         self.set("property", property_name)
         self.set("direction", direction)
+        self._freeze()
 
     @classmethod
     def ascending(
@@ -82,7 +84,7 @@ class PropertyValueSort(build.NotionObject):
         return cls(property_name, direction=direction)
 
 
-class EntryTimestampSort(build.NotionObject):
+class EntryTimestampSort(build.FrozenNotionObject):
     """
     This sort orders the database query by the timestamp associated with a database entry.
 
@@ -95,34 +97,27 @@ class EntryTimestampSort(build.NotionObject):
 
     __slots__: Sequence[str] = ("_timestamp", "_direction")
 
-    def __init__(self) -> None:
+    def __init__(self, timestamp: str, direction: str, /) -> None:
         super().__init__()
 
-        self._timestamp: str
-        self._direction: str
-        self.set("timestamp", self._timestamp)
-        self.set("direction", self._direction)
+        self._timestamp: str = timestamp
+        self._direction: str = direction
+        self.set("timestamp", timestamp)
+        self.set("direction", direction)
+        self._freeze()
 
     @classmethod
     def created_time_ascending(cls) -> EntryTimestampSort:
-        cls._timestamp = "created_time"
-        cls._direction = "ascending"
-        return cls()
+        return cls("created_time", "ascending")
 
     @classmethod
     def created_time_descending(cls) -> EntryTimestampSort:
-        cls._timestamp = "created_time"
-        cls._direction = "descending"
-        return cls()
+        return cls("created_time", "descending")
 
     @classmethod
     def last_edited_time_ascending(cls) -> EntryTimestampSort:
-        cls._timestamp = "last_edited_time"
-        cls._direction = "ascending"
-        return cls()
+        return cls("last_edited_time", "ascending")
 
     @classmethod
     def last_edited_time_descending(cls) -> EntryTimestampSort:
-        cls._timestamp = "last_edited_time"
-        cls._direction = "descending"
-        return cls()
+        return cls("last_edited_time", "descending")
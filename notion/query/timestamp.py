@@ -31,7 +31,7 @@ from notion.query.conditions import DateConditions
 __all__: Sequence[str] = ["TimestampFilter"]
 
 
-class TimestampFilter(build.NotionObject):
+class TimestampFilter(build.FrozenNotionObject):
     """ 
     A timestamp filter object must contain a timestamp key corresponding to the type of timestamp 
     and a key matching that timestamp type which contains a date filter condition.
@@ -64,6 +64,7 @@ class TimestampFilter(build.NotionObject):
         super().__init__()
         self.nest("filter", "timestamp", _type)
         self.nest("filter", _type, {filter_condition: filter_value})
+        self._freeze()
 
     @classmethod
     def created_time(